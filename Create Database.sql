@@ -1,2 +0,0 @@
-CREATE DATABASE ngo_dbms;
-USE ngo_dbms;
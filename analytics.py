@@ -0,0 +1,263 @@
+"""Donor and stock analytics over the daily rollups.
+
+Nothing here reads ``Donation`` itself:
+
+* donor retention cohorts and repeat-donor rates come from
+  ``DonationDailyDonor``, read once as two integer arrays (donor, day) in
+  donor order and reduced with NumPy (``bincount`` over cohort/offset cells);
+* per-resource inflow and per-item outflow rates come from ``DonationDaily``
+  and ``DisbursementDaily`` over the last ``NGO_FORECAST_WINDOW_DAYS`` days;
+* the depletion forecast divides each item's stock by its net outflow rate.
+
+Results are memoized in the shared query cache, keyed by day and tied to the
+tables they were computed from, so every render until the next write to those
+tables reuses them.
+"""
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from db_config import read_connection
+from query_cache import get_query_cache
+
+COHORT_MONTHS = 12
+TREND_MONTHS = 24
+FORECAST_WINDOW = int(os.environ.get("NGO_FORECAST_WINDOW_DAYS", "90"))
+INFLOW_SHORT_WINDOW = 30
+FETCH_BATCH = 50000
+
+DONOR_TABLES = ("DonationDailyDonor",)
+STOCK_TABLES = ("DonationDaily", "DisbursementDaily", "Inventory")
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _epoch_days(values):
+    # date objects (MySQL) and ISO strings (SQLite) both parse to day precision
+    return np.array(values, dtype="datetime64[D]").astype(np.int32)
+
+
+def _months(days):
+    """Months since 1970-01 for days since 1970-01-01."""
+    return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int32)
+
+
+def _month_label(month):
+    return str(np.datetime64(int(month), "M"))
+
+
+class DonorActivity:
+    """Every (donor, day) a donation was made, as parallel arrays sorted by donor then day."""
+
+    def __init__(self, donors, days, donor_count):
+        self.donors = donors
+        self.days = days
+        self.donor_count = donor_count
+
+    def __len__(self):
+        return len(self.donors)
+
+    @classmethod
+    def load(cls, cursor):
+        # Read in index order (idx_donationdailydonor_donor). Dates come back as
+        # text, which NumPy parses far faster than the driver builds date
+        # objects. A donor giving several resource types on one day has several
+        # rows; they are folded below, which is cheaper than DISTINCT
+        cursor.execute("""
+            SELECT DonorName, CAST(DonationDate AS CHAR) FROM DonationDailyDonor
+            ORDER BY DonorName, DonationDate
+        """)
+        donor_chunks, day_chunks = [], []
+        previous, donor_count = None, 0
+        while True:
+            rows = cursor.fetchmany(FETCH_BATCH)
+            if not rows:
+                break
+            names, days = zip(*rows)
+            names = np.array(names, dtype=object)
+            # Rows arrive grouped by donor, so a new code starts wherever the name changes
+            starts = np.empty(len(names), dtype=bool)
+            starts[0] = names[0] != previous
+            starts[1:] = names[1:] != names[:-1]
+            codes = donor_count - 1 + np.cumsum(starts, dtype=np.int64)
+            donor_chunks.append(codes.astype(np.int32))
+            day_chunks.append(_epoch_days(days))
+            donor_count = int(codes[-1]) + 1
+            previous = names[-1]
+        if not donor_chunks:
+            return cls(np.zeros(0, np.int32), np.zeros(0, np.int32), 0)
+        donors, days = np.concatenate(donor_chunks), np.concatenate(day_chunks)
+        distinct = np.ones(len(donors), dtype=bool)
+        distinct[1:] = (donors[1:] != donors[:-1]) | (days[1:] != days[:-1])
+        return cls(donors[distinct], days[distinct], donor_count)
+
+
+class DonorAnalytics:
+    """Retention by first-donation month and repeat-donor rates."""
+
+    def __init__(self, donor_count, repeat_rate, retention, monthly):
+        self.donor_count = donor_count
+        # Share of donors who gave on more than one day
+        self.repeat_rate = repeat_rate
+        # Cohort, Donors, then the share still giving 0..COHORT_MONTHS months later
+        self.retention = retention
+        # Month, ActiveDonors, NewDonors, ReturningDonors, ReturningShare
+        self.monthly = monthly
+
+    @classmethod
+    def compute(cls, activity, today, cohorts=COHORT_MONTHS, trend_months=TREND_MONTHS):
+        donors, n = activity.donors, activity.donor_count
+        current = int(_months(np.array([today.toordinal() - _EPOCH_ORDINAL], dtype=np.int32))[0])
+        if n == 0:
+            return cls(0, 0.0, pd.DataFrame(columns=["Cohort", "Donors"]),
+                       pd.DataFrame(columns=["Month", "ActiveDonors", "NewDonors", "ReturningDonors",
+                                             "ReturningShare"]))
+        months = _months(activity.days)
+        repeat_rate = float(np.count_nonzero(np.bincount(donors, minlength=n) > 1)) / n
+
+        # Rows are sorted by donor then day, so each donor's first row holds their first month
+        first_rows = np.flatnonzero(np.diff(donors, prepend=-1))
+        cohort_of = months[first_rows]
+        # One row per (donor, active month)
+        keep = np.ones(len(donors), dtype=bool)
+        keep[1:] = (donors[1:] != donors[:-1]) | (months[1:] != months[:-1])
+        active_donors, active_months = donors[keep], months[keep]
+        cohort = cohort_of[active_donors]
+        offset = active_months - cohort
+
+        # Retention: donors of cohort c active k months after joining, over cohort size
+        first_cohort = current - cohorts + 1
+        # Offsets 0..cohorts-1: the oldest cohort in the window can be followed that far
+        width = cohorts
+        in_window = (cohort >= first_cohort) & (cohort <= current) & (offset < width)
+        cells = np.bincount((cohort[in_window] - first_cohort) * width + offset[in_window],
+                            minlength=cohorts * width).reshape(cohorts, width).astype(np.float64)
+        sizes = cells[:, 0].copy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shares = cells / sizes[:, None]
+        # Months that have not happened yet for a cohort are unknown, not zero
+        unobserved = np.arange(cohorts)[:, None] + np.arange(width)[None, :] > cohorts - 1
+        shares[unobserved | (sizes[:, None] == 0)] = np.nan
+        retention = pd.DataFrame(np.round(shares, 3), columns=list(range(width)))
+        retention.insert(0, "Donors", sizes.astype(np.int64))
+        retention.insert(0, "Cohort", [_month_label(month) for month in range(first_cohort, current + 1)])
+
+        # Monthly active donors split into first-timers and returning donors
+        first_month = current - trend_months + 1
+        recent = active_months >= first_month
+        index = active_months[recent] - first_month
+        active = np.bincount(index, minlength=trend_months)[:trend_months]
+        new = np.bincount(index[offset[recent] == 0], minlength=trend_months)[:trend_months]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returning_share = np.where(active > 0, (active - new) / np.maximum(active, 1), np.nan)
+        monthly = pd.DataFrame({
+            "Month": [_month_label(month) for month in range(first_month, current + 1)],
+            "ActiveDonors": active,
+            "NewDonors": new,
+            "ReturningDonors": active - new,
+            "ReturningShare": np.round(returning_share, 3),
+        })
+        return cls(n, repeat_rate, retention, monthly)
+
+
+def _flow_rates(rows, today, window):
+    """Per-name quantity per day over the last ``window`` days and the last 30, from ``(name, day, qty)``."""
+    if not rows:
+        return pd.DataFrame({"Name": pd.Series(dtype=object), "PerDay": [], "PerDay30": []})
+    names, index = np.unique(np.array([row[0] for row in rows], dtype=object), return_inverse=True)
+    age = (today.toordinal() - _EPOCH_ORDINAL) - _epoch_days([row[1] for row in rows])
+    quantity = np.array([row[2] for row in rows], dtype=np.float64)
+    short = age < INFLOW_SHORT_WINDOW
+    return pd.DataFrame({
+        "Name": names,
+        "PerDay": np.bincount(index, weights=quantity, minlength=len(names)) / window,
+        "PerDay30": np.bincount(index[short], weights=quantity[short], minlength=len(names)) / INFLOW_SHORT_WINDOW,
+    })
+
+
+class StockOutlook:
+    """Per-resource inflow rates and a depletion forecast per inventory item."""
+
+    def __init__(self, inflow, forecast):
+        # ResourceType, PerDay, PerDay30, Trend
+        self.inflow = inflow
+        # ItemName, QuantityAvailable, ReorderLevel, InPerDay, OutPerDay, NetPerDay,
+        # DaysToReorder, DaysLeft, DepletionDate
+        self.forecast = forecast
+
+    @classmethod
+    def load(cls, cursor, today, window=FORECAST_WINDOW):
+        since = today - timedelta(days=window - 1)
+        cursor.execute("""
+            SELECT ResourceType, DonationDate, Quantity FROM DonationDaily
+            WHERE DonationDate >= %s AND DonationDate <= %s
+        """, (since, today))
+        inflow = _flow_rates(cursor.fetchall(), today, window)
+        cursor.execute("""
+            SELECT ItemName, DisbursementDate, Quantity FROM DisbursementDaily
+            WHERE DisbursementDate >= %s AND DisbursementDate <= %s
+        """, (since, today))
+        outflow = _flow_rates(cursor.fetchall(), today, window)
+        cursor.execute("SELECT ItemName, QuantityAvailable, ReorderLevel FROM Inventory")
+        inventory = pd.DataFrame(cursor.fetchall(), columns=["ItemName", "QuantityAvailable", "ReorderLevel"])
+        return cls.compute(inventory, inflow, outflow, today)
+
+    @classmethod
+    def compute(cls, inventory, inflow, outflow, today):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            trend = np.where(inflow["PerDay"] > 0, inflow["PerDay30"] / inflow["PerDay"] - 1, np.nan)
+        inflow_rates = inflow.rename(columns={"Name": "ResourceType"}).assign(Trend=np.round(trend, 3))
+        inflow_rates = inflow_rates.sort_values("PerDay", ascending=False, ignore_index=True)
+
+        # Donations of a resource type restock the inventory item of the same name
+        forecast = inventory.merge(inflow[["Name", "PerDay"]].rename(columns={"Name": "ItemName", "PerDay": "InPerDay"}),
+                                   on="ItemName", how="left")
+        forecast = forecast.merge(outflow[["Name", "PerDay"]].rename(columns={"Name": "ItemName",
+                                                                              "PerDay": "OutPerDay"}),
+                                  on="ItemName", how="left")
+        stock = forecast["QuantityAvailable"].fillna(0).to_numpy(dtype=np.float64)
+        reorder = forecast["ReorderLevel"].fillna(0).to_numpy(dtype=np.float64)
+        in_rate = forecast["InPerDay"].fillna(0).to_numpy(dtype=np.float64)
+        out_rate = forecast["OutPerDay"].fillna(0).to_numpy(dtype=np.float64)
+        net = in_rate - out_rate
+        draining = net < 0
+        # Items that are not draining never run out: their days stay NaN
+        days_left = np.full(len(stock), np.nan)
+        days_to_reorder = np.full(len(stock), np.nan)
+        days_left[draining] = stock[draining] / -net[draining]
+        days_to_reorder[draining] = np.maximum(stock[draining] - reorder[draining], 0) / -net[draining]
+        depletion = np.full(len(stock), np.datetime64("NaT"), dtype="datetime64[D]")
+        depletion[draining] = np.datetime64(today, "D") + np.floor(days_left[draining]).astype(np.int64)
+        forecast = forecast.assign(InPerDay=np.round(in_rate, 2), OutPerDay=np.round(out_rate, 2),
+                                   NetPerDay=np.round(net, 2), DaysToReorder=np.floor(days_to_reorder),
+                                   DaysLeft=np.floor(days_left), DepletionDate=depletion)
+        forecast = forecast.sort_values(["DaysLeft", "ItemName"], na_position="last", ignore_index=True)
+        return cls(inflow_rates.round({"PerDay": 2, "PerDay30": 2}), forecast)
+
+
+def _with_cursor(tables, loader, *args):
+    def load():
+        with read_connection(tables) as conn:
+            cursor = conn.cursor()
+            try:
+                return loader(cursor, *args)
+            finally:
+                cursor.close()
+    return load
+
+
+def get_donor_analytics(today=None):
+    """Cohorts and repeat rates, computed once per day and donor-table version."""
+    today = today or date.today()
+    load = _with_cursor(DONOR_TABLES, DonorActivity.load)
+    return get_query_cache().get_or_load(("donor_analytics", today), DONOR_TABLES,
+                                         lambda: DonorAnalytics.compute(load(), today))
+
+
+def get_stock_outlook(today=None, window=FORECAST_WINDOW):
+    """Inflow rates and the depletion forecast, computed once per day and table version."""
+    today = today or date.today()
+    return get_query_cache().get_or_load(("stock_outlook", today, window), STOCK_TABLES,
+                                         _with_cursor(STOCK_TABLES, StockOutlook.load, today, window))
@@ -0,0 +1,323 @@
+"""Headless JSON API for kiosks and partner systems.
+
+A small threaded HTTP server (standard library only) in front of the same
+data-access code as the Streamlit pages: lists go through ``repository.py``
+and the shared query cache, batched intake through the bulk importer's
+validation and multi-row inserts, and every request borrows a pooled
+connection for just as long as it needs one. No page is rendered, so a
+request costs its SQL plus a little JSON.
+
+Endpoints (``POST`` bodies are one object, a list of objects, or
+``{"records": [...]}``; keys follow the bulk-import headers)::
+
+    GET  /health
+    GET  /volunteers?availability=Available Only&search=teach&after_name=...&after_id=...
+    POST /volunteers                [{"name", "email", "phone", "skills", "available"}]
+    GET  /donations?start=2024-01-01&end=...&resource=Books&donor=...&archive=1&after_date=...&after_id=...
+    POST /donations                 [{"donor", "resource", "quantity", "date"}]
+    GET  /inventory
+    POST /inventory                 [{"item", "quantity"}]  adds stock
+    POST /inventory/disbursements   [{"item", "quantity"}]  all or nothing
+    GET  /metrics                   Prometheus text
+
+Writes invalidate the query cache of the process they run in. Run the API
+inside the Streamlit process (``NGO_API_EMBED=1``) for the UI to see them
+at once; a separate ``python api.py`` process is picked up by the UI within
+``NGO_QUERY_CACHE_TTL`` seconds.
+
+Usage:
+    python api.py [--host 127.0.0.1] [--port 8502]
+"""
+import argparse
+import json
+import logging
+import os
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import repository
+from db_config import PoolTimeout, get_pool, read_connection
+from instrumentation import get_instrumentation, start_page
+from inventory import InsufficientStock
+from query_cache import get_query_cache
+from schema import primary_key
+
+API_HOST = os.environ.get("NGO_API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("NGO_API_PORT", "8502"))
+API_EMBED = os.environ.get("NGO_API_EMBED", "0") not in ("0", "false", "no")
+MAX_BODY_BYTES = int(os.environ.get("NGO_API_MAX_BODY", str(10 * 1024 * 1024)))
+MAX_PAGE_SIZE = 500
+
+log = logging.getLogger("ngo.api")
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _param(query, name, default=None, convert=str):
+    values = query.get(name)
+    if not values or values[0] == "":
+        return default
+    try:
+        return convert(values[0])
+    except ValueError:
+        raise ApiError(400, f"Invalid value for {name!r}: {values[0]!r}")
+
+
+def _page_size(query, default):
+    """Extra page-size argument for ``limit``; none for the default, so cache keys match the pages'."""
+    size = _param(query, "limit", default, int)
+    if not 1 <= size <= MAX_PAGE_SIZE:
+        raise ApiError(400, f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return () if size == default else (size,)
+
+
+def _records(body):
+    if isinstance(body, dict):
+        body = body.get("records", [body])
+    if not isinstance(body, list) or not all(isinstance(record, dict) for record in body):
+        raise ApiError(400, "Expected an object, a list of objects or {\"records\": [...]}")
+    if not body:
+        raise ApiError(400, "No records in request")
+    return body
+
+
+def _quantities(records):
+    """Sum ``{"item": ..., "quantity": ...}`` records per item."""
+    quantities = {}
+    for index, record in enumerate(records, start=1):
+        item = record.get("item", record.get("ItemName"))
+        quantity = record.get("quantity", record.get("QuantityAvailable"))
+        if not isinstance(item, str) or not item.strip():
+            raise ApiError(422, f"Record {index}: missing item")
+        if isinstance(quantity, bool) or not isinstance(quantity, int) or quantity < 1:
+            raise ApiError(422, f"Record {index}: quantity must be a positive whole number")
+        quantities[item.strip()] = quantities.get(item.strip(), 0) + quantity
+    return quantities
+
+
+def _cached(tables, query, *args):
+    # Same keys as the Streamlit pages, so an embedded API shares their entries
+    def load():
+        with read_connection(tables) as conn:
+            return query(conn, *args)
+    return get_query_cache().get_or_load((query.__name__,) + args, tables, load)
+
+
+def _frame_json(frame):
+    return frame.to_json(orient="records", date_format="iso", date_unit="s")
+
+
+def _import_response(kind, records, tables):
+    # The importer needs pandas, which the app's form pages otherwise never load
+    from bulk_import import import_records
+
+    with get_pool().connection() as conn:
+        report = import_records(conn, kind, records)
+    if report.inserted:
+        get_query_cache().invalidate(*tables)
+    rejected = [{"row": int(row["Row"]), "reason": row["Reason"]}
+                for row in report.rejected_frame()[["Row", "Reason"]].to_dict("records")]
+    status = 201 if report.inserted else 422
+    return status, {"inserted": report.inserted, "rejected": rejected}
+
+
+# Handlers return (status, payload); a str payload is already-encoded JSON
+
+def list_volunteers(query):
+    availability = _param(query, "availability", "All")
+    if availability not in ("All", "Available Only", "Unavailable Only"):
+        raise ApiError(400, "availability must be All, Available Only or Unavailable Only")
+    search = _param(query, "search")
+    after_name, after_id = _param(query, "after_name"), _param(query, "after_id", convert=int)
+    after = (after_name, after_id) if after_name is not None and after_id is not None else None
+    key_column = primary_key("Volunteer")
+    frame, has_next = _cached(["Volunteer"], repository.fetch_volunteer_page, key_column, availability, search,
+                              after, *_page_size(query, repository.VOLUNTEER_PAGE_SIZE))
+    next_page = None
+    if has_next:
+        last = frame.iloc[-1]
+        next_page = json.dumps({"after_name": last["Name"], "after_id": int(last[key_column])})
+    return 200, f'{{"items": {_frame_json(frame)}, "next": {next_page or "null"}}}'
+
+
+def list_donations(query):
+    start = _param(query, "start", convert=date.fromisoformat)
+    end = _param(query, "end", convert=date.fromisoformat)
+    after_date = _param(query, "after_date", convert=date.fromisoformat)
+    after_id = _param(query, "after_id", convert=int)
+    after = (after_date, after_id) if after_date is not None and after_id is not None else None
+    # Archived years are only read when asked for, as on the Donation History page
+    include_archive = _param(query, "archive", "0") not in ("0", "false", "no")
+    tables = ["Donation", "DonationArchive"] if include_archive else ["Donation"]
+    frame, has_next = _cached(tables, repository.fetch_donation_page, start, end,
+                              _param(query, "resource"), _param(query, "donor"), after, include_archive,
+                              *_page_size(query, repository.DONATION_PAGE_SIZE))
+    next_page = None
+    if has_next:
+        last = frame.iloc[-1]
+        next_page = json.dumps({"after_date": last["DonationDate"].date().isoformat(),
+                                "after_id": int(last["DonationID"])})
+    return 200, f'{{"items": {_frame_json(frame)}, "next": {next_page or "null"}}}'
+
+
+def list_inventory(query):
+    return 200, f'{{"items": {_frame_json(_cached(["Inventory"], repository.list_inventory))}}}'
+
+
+def create_volunteers(body):
+    return _import_response("volunteers", _records(body), repository.VOLUNTEER_TABLES)
+
+
+def create_donations(body):
+    return _import_response("donations", _records(body), repository.DONATION_TABLES)
+
+
+def restock(body):
+    quantities = _quantities(_records(body))
+    with get_pool().connection() as conn:
+        repository.restock_items(conn, quantities)
+    get_query_cache().invalidate(*repository.INVENTORY_TABLES)
+    return 201, {"items": len(quantities), "quantity": sum(quantities.values())}
+
+
+def disburse(body):
+    quantities = _quantities(_records(body))
+    try:
+        with get_pool().connection() as conn:
+            repository.disburse_items(conn, quantities)
+    except InsufficientStock as e:
+        raise ApiError(409, str(e))
+    get_query_cache().invalidate(*repository.DISBURSEMENT_TABLES)
+    return 201, {"items": len(quantities), "quantity": sum(quantities.values())}
+
+
+ROUTES = {
+    ("GET", "/health"): lambda query: (200, {"status": "ok"}),
+    ("GET", "/volunteers"): list_volunteers,
+    ("POST", "/volunteers"): create_volunteers,
+    ("GET", "/donations"): list_donations,
+    ("POST", "/donations"): create_donations,
+    ("GET", "/inventory"): list_inventory,
+    ("POST", "/inventory"): restock,
+    ("POST", "/inventory/disbursements"): disburse,
+}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    # Keep-alive lets a client reuse one TCP connection for many requests
+    protocol_version = "HTTP/1.1"
+    server_version = "NGO-API/1.0"
+    # Headers and body go out as separate writes; without TCP_NODELAY the body
+    # waits on the client's delayed ACK, capping a connection at ~25 requests/s
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        timer = start_page(f"API {method} {path}")
+        try:
+            if method == "GET" and path == "/metrics":
+                self._send(200, get_instrumentation().prometheus(), "text/plain; version=0.0.4")
+                return
+            handler = ROUTES.get((method, path))
+            if handler is None:
+                # Any body is left unread, so the connection cannot carry another request
+                self.close_connection = True
+                allowed = any(route_path == path for _, route_path in ROUTES)
+                raise ApiError(405 if allowed else 404, f"No route for {method} {path}")
+            if method == "POST":
+                status, payload = handler(self._read_json())
+            else:
+                status, payload = handler(parse_qs(url.query))
+        except ApiError as e:
+            status, payload = e.status, {"error": str(e)}
+        except PoolTimeout as e:
+            status, payload = 503, {"error": str(e)}
+        except Exception as e:
+            log.exception("%s %s failed", method, path)
+            status, payload = 500, {"error": str(e)}
+        finally:
+            timer.finish()
+        self._send(status, payload if isinstance(payload, str) else json.dumps(payload, default=str))
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        # The body is not read on these errors; on a keep-alive connection its
+        # bytes would be parsed as the next request, so close it instead
+        if length < 0:
+            self.close_connection = True
+            raise ApiError(400, "Invalid Content-Length header")
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ApiError(413, f"Request body larger than {MAX_BODY_BYTES} bytes")
+        try:
+            return json.loads(self.rfile.read(length) or b"null")
+        except ValueError as e:
+            raise ApiError(400, f"Invalid JSON: {e}")
+
+    def _send(self, status, text, content_type="application/json"):
+        body = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug("%s - %s", self.address_string(), format % args)
+
+
+def make_server(host=API_HOST, port=API_PORT):
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    return server
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve_in_background(host=API_HOST, port=API_PORT):
+    """Start the API on a daemon thread once per process; returns the server."""
+    global _server
+    if _server is None:
+        with _server_lock:
+            if _server is None:
+                server = make_server(host, port)
+                threading.Thread(target=server.serve_forever, name="ngo-api", daemon=True).start()
+                _server = server
+    return _server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the NGO JSON API.")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = make_server(args.host, args.port)
+    print(f"🌐 NGO API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,267 @@
+"""Page-level benchmark suite.
+
+Runs ``app.py`` headlessly with Streamlit's ``AppTest``, once per scenario
+(page plus filter settings), and records per-rerun latency (p50/p95), SQL
+statements issued, rows fetched and peak Python memory. "Cold" reruns clear
+the query cache first so every query hits the database; "warm" reruns show
+what a user pays on an ordinary interaction. Results are written as JSON so a
+run can be kept as a baseline and compared with later runs.
+
+Usage:
+    python benchmark.py --generate --scale 100000 --output bench_baseline.json
+    python benchmark.py --compare bench_baseline.json
+    python benchmark.py --backend mysql --iterations 20
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+import datagen
+import db_config
+from query_cache import get_query_cache
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+@dataclass
+class Scenario:
+    name: str
+    # Page script, relative to app.py
+    page: str
+    # (widget type, label, value) applied after opening the page
+    actions: list = field(default_factory=list)
+
+
+def default_scenarios():
+    today = date.today()
+    return [
+        Scenario("dashboard", "views/dashboard.py"),
+        Scenario("volunteers_all", "views/view_volunteers.py"),
+        Scenario("volunteers_available", "views/view_volunteers.py",
+                 [("selectbox", "Filter by Availability", "Available Only")]),
+        Scenario("volunteers_search", "views/view_volunteers.py",
+                 [("text_input", "Search by name or skills", "Teach")]),
+        Scenario("donations_all", "views/view_donations.py"),
+        Scenario("donations_resource", "views/view_donations.py",
+                 [("selectbox", "Filter by Resource Type", "Books")]),
+        Scenario("donations_last_90_days", "views/view_donations.py",
+                 [("date_input", "Filter by Date Range", (today - timedelta(days=90), today))]),
+        Scenario("donations_donor_search", "views/view_donations.py",
+                 [("text_input", "Search by Donor", "Donor 12 ")]),
+        Scenario("analytics", "views/analytics.py"),
+        Scenario("inventory", "views/inventory.py"),
+        Scenario("events", "views/events.py"),
+    ]
+
+
+class QueryCounter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.queries = 0
+            self.rows = 0
+
+    def add(self, queries=0, rows=0):
+        with self._lock:
+            self.queries += queries
+            self.rows += rows
+
+
+class CountingCursor:
+    def __init__(self, cursor, counter):
+        self._cursor = cursor
+        self._counter = counter
+
+    def execute(self, *args, **kwargs):
+        self._counter.add(queries=1)
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self._counter.add(queries=1)
+        return self._cursor.executemany(*args, **kwargs)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._counter.add(rows=1 if row is not None else 0)
+        return row
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._counter.add(rows=len(rows))
+        return rows
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._counter.add(rows=len(rows))
+        return rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class CountingConnection:
+    def __init__(self, conn, counter):
+        self._conn = conn
+        self._counter = counter
+
+    def cursor(self, *args, **kwargs):
+        return CountingCursor(self._conn.cursor(*args, **kwargs), self._counter)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def _widget(at, kind, label):
+    for widget in getattr(at, kind):
+        if widget.label == label:
+            return widget
+    raise LookupError(f"No {kind} labelled {label!r} on the page")
+
+
+def _check(at, scenario):
+    if at.exception:
+        raise RuntimeError(f"{scenario.name}: {at.exception[0].value}")
+    errors = [element.value for element in at.error]
+    if errors:
+        raise RuntimeError(f"{scenario.name}: {errors[0]}")
+
+
+def _percentiles(samples):
+    values = np.array(samples) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(values, 50)), 2),
+        "p95_ms": round(float(np.percentile(values, 95)), 2),
+        "mean_ms": round(float(values.mean()), 2),
+    }
+
+
+def run_scenario(scenario, counter, iterations):
+    from streamlit.testing.v1 import AppTest
+
+    cache = get_query_cache()
+    at = AppTest.from_file(APP_FILE, default_timeout=300)
+    at.run()
+    at.switch_page(scenario.page).run()
+    for kind, label, value in scenario.actions:
+        widget = _widget(at, kind, label)
+        if kind == "selectbox":
+            widget.select(value)
+        else:
+            widget.set_value(value)
+        at.run()
+    _check(at, scenario)
+
+    def rerun(clear_cache):
+        if clear_cache:
+            cache.clear()
+        counter.reset()
+        start = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - start
+        _check(at, scenario)
+        return elapsed
+
+    cold = [rerun(True) for _ in range(iterations)]
+    cold_queries, cold_rows = counter.queries, counter.rows
+    warm = [rerun(False) for _ in range(iterations)]
+    warm_queries, warm_rows = counter.queries, counter.rows
+
+    # Memory is measured on a separate cold rerun; tracing slows everything down
+    cache.clear()
+    tracemalloc.start()
+    try:
+        at.run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "cold": dict(_percentiles(cold), queries=cold_queries, rows_fetched=cold_rows),
+        "warm": dict(_percentiles(warm), queries=warm_queries, rows_fetched=warm_rows),
+        "peak_memory_mb": round(peak / 2**20, 2),
+    }
+
+
+def run_benchmarks(iterations=10, scenarios=None, log=print):
+    counter = QueryCounter()
+    db_config.configure_pool(factory=lambda: CountingConnection(db_config.get_instrumented_connection(), counter))
+    results = {}
+    for scenario in scenarios or default_scenarios():
+        results[scenario.name] = run_scenario(scenario, counter, iterations)
+        cold, warm = results[scenario.name]["cold"], results[scenario.name]["warm"]
+        log(f"{scenario.name:<26} cold p50 {cold['p50_ms']:>8.1f} ms  p95 {cold['p95_ms']:>8.1f} ms  "
+            f"rows {cold['rows_fetched']:>8}  warm p50 {warm['p50_ms']:>8.1f} ms  "
+            f"peak {results[scenario.name]['peak_memory_mb']:>7.1f} MB")
+    return results
+
+
+def compare(results, baseline):
+    print(f"\n{'scenario':<26} {'baseline p50':>13} {'now p50':>10} {'change':>8}")
+    for name, result in results.items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        before, after = old["cold"]["p50_ms"], result["cold"]["p50_ms"]
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"{name:<26} {before:>10.1f} ms {after:>7.1f} ms {change:>+7.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark each page's data path headlessly.")
+    datagen.add_arguments(parser)
+    parser.add_argument("--generate", action="store_true", help="(re)generate the dataset first")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--scenario", action="append", help="only run the named scenario(s)")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against a previous JSON result")
+    args = parser.parse_args()
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    db_config.DB_BACKEND = args.backend
+    db_config.SQLITE_PATH = args.sqlite_path
+
+    counts = datagen.counts_from_args(args)
+    if args.generate:
+        conn = datagen.open_connection(args.backend, args.sqlite_path)
+        try:
+            datagen.reset(conn)
+            elapsed = datagen.generate(conn, counts, seed=args.seed, years=args.years)
+        finally:
+            conn.close()
+        print(f"✅ Generated data in {elapsed:.1f}s\n")
+
+    scenarios = default_scenarios()
+    if args.scenario:
+        scenarios = [scenario for scenario in scenarios if scenario.name in args.scenario]
+    results = run_benchmarks(args.iterations, scenarios)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "backend": args.backend,
+            "counts": counts if args.generate else None,
+            "iterations": args.iterations,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "scenarios": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Results written to {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f))
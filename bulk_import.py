@@ -0,0 +1,331 @@
+"""Bulk CSV/Excel import of donations and volunteers.
+
+Files are streamed in chunks. Each chunk is validated with vectorized pandas
+operations, written with one multi-row INSERT, and committed on its own, so a
+bad row never aborts the rows around it. Inventory and dashboard rollups are
+pre-aggregated per chunk: one stock update per resource type rather than one
+per donation.
+
+Usage:
+    python bulk_import.py donations drive.csv [--chunk-size 5000] [--rejects rejected.csv]
+    python bulk_import.py volunteers signups.xlsx
+"""
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date
+
+import pandas as pd
+
+from inventory import add_inventory_deltas
+from rollups import apply_daily_deltas, apply_donation_deltas, apply_volunteer_delta
+from skill_search import tokenize_skills
+
+DEFAULT_CHUNK_SIZE = 5000
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+# Accepted header spellings for each target column
+DONATION_COLUMNS = {
+    "DonorName": ["donorname", "donor", "donor name", "name"],
+    "ResourceType": ["resourcetype", "resource type", "resource", "item", "itemname"],
+    "Quantity": ["quantity", "qty", "amount"],
+    "DonationDate": ["donationdate", "donation date", "date"],
+}
+VOLUNTEER_COLUMNS = {
+    "Name": ["name", "full name", "volunteer"],
+    "Email": ["email", "email address"],
+    "Phone": ["phone", "phone number", "mobile"],
+    "Skills": ["skills", "skills & expertise"],
+    "Availability": ["availability", "available"],
+}
+TRUE_VALUES = {"1", "true", "yes", "y", "available", "✅ yes"}
+
+
+@dataclass
+class ImportReport:
+    kind: str
+    inserted: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+    rejected: list = field(default_factory=list)
+
+    @property
+    def rejected_count(self):
+        return sum(len(chunk) for chunk in self.rejected)
+
+    def rejected_frame(self):
+        if not self.rejected:
+            return pd.DataFrame(columns=["Row", "Reason"])
+        return pd.concat(self.rejected, ignore_index=True)
+
+
+def read_chunks(source, filename, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield DataFrame chunks from a CSV or Excel file path or file object."""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in (".xlsx", ".xlsm"):
+        # openpyxl's read-only mode streams rows instead of loading the sheet
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(source, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(value) if value is not None else "" for value in next(rows, [])]
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == chunk_size:
+                    yield pd.DataFrame(batch, columns=header, dtype=object)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch, columns=header, dtype=object)
+        finally:
+            workbook.close()
+    elif extension == ".xls":
+        frame = pd.read_excel(source, dtype=object)
+        for start in range(0, len(frame), chunk_size):
+            yield frame.iloc[start:start + chunk_size]
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_size, dtype=str, keep_default_na=False)
+
+
+def normalize_columns(chunk, column_map):
+    """Map recognized headers onto table columns; missing columns become None.
+
+    When several headers map to one column (``donor`` in some JSON records and
+    ``DonorName`` in others, say), the first non-null value wins.
+    """
+    lookup = {alias: target for target, aliases in column_map.items() for alias in aliases}
+    sources = {}
+    for column in chunk.columns:
+        target = lookup.get(str(column).strip().lower())
+        if target:
+            sources.setdefault(target, []).append(column)
+    result = pd.DataFrame(index=chunk.index)
+    for target in column_map:
+        columns = sources.get(target)
+        if not columns:
+            result[target] = None
+        elif len(columns) == 1:
+            result[target] = chunk[columns[0]]
+        else:
+            result[target] = chunk[columns].bfill(axis=1).iloc[:, 0]
+    return result
+
+
+def _clean_text(series):
+    return series.astype("string").str.strip().replace("", pd.NA)
+
+
+def _flag(reasons, mask, message):
+    # Comparisons on nullable columns yield <NA>; those rows are not flagged
+    reasons[mask.fillna(False).astype(bool)] = message
+
+
+def _split(chunk, reasons):
+    """Return (valid rows, rejected rows) given a Series of reasons (NA = valid)."""
+    bad = reasons.notna()
+    rejected = chunk[bad].copy()
+    rejected.insert(0, "Row", rejected.index + 1)
+    rejected["Reason"] = reasons[bad]
+    return chunk[~bad], rejected
+
+
+def validate_donations(chunk):
+    chunk = normalize_columns(chunk, DONATION_COLUMNS)
+    chunk["DonorName"] = _clean_text(chunk["DonorName"])
+    chunk["ResourceType"] = _clean_text(chunk["ResourceType"])
+    quantity = pd.to_numeric(chunk["Quantity"], errors="coerce")
+    raw_date = _clean_text(chunk["DonationDate"])
+    parsed_date = pd.to_datetime(raw_date, errors="coerce")
+    today = date.today()
+
+    # Later checks overwrite earlier ones, so list them from least to most basic
+    reasons = pd.Series(pd.NA, index=chunk.index, dtype="string")
+    _flag(reasons, parsed_date.dt.normalize() > pd.Timestamp(today), "Donation date is in the future")
+    _flag(reasons, raw_date.notna() & parsed_date.isna(), "Invalid donation date")
+    _flag(reasons, chunk["ResourceType"].str.len() > 50, "Resource type longer than 50 characters")
+    _flag(reasons, chunk["DonorName"].str.len() > 100, "Donor name longer than 100 characters")
+    _flag(reasons, (quantity < 1) | (quantity % 1 != 0), "Quantity must be a positive whole number")
+    _flag(reasons, quantity.isna(), "Missing or non-numeric quantity")
+    _flag(reasons, chunk["ResourceType"].isna(), "Missing resource type")
+    _flag(reasons, chunk["DonorName"].isna(), "Missing donor name")
+
+    chunk["Quantity"] = quantity
+    chunk["DonationDate"] = parsed_date.dt.date.where(parsed_date.notna(), today)
+    return _split(chunk, reasons)
+
+
+def validate_volunteers(chunk):
+    chunk = normalize_columns(chunk, VOLUNTEER_COLUMNS)
+    for column in ("Name", "Email", "Phone", "Skills"):
+        chunk[column] = _clean_text(chunk[column])
+    chunk["Email"] = chunk["Email"].str.lower()
+    availability = chunk["Availability"].astype("string").str.strip().str.lower()
+    chunk["Availability"] = availability.isin(TRUE_VALUES) | availability.isna()
+
+    reasons = pd.Series(pd.NA, index=chunk.index, dtype="string")
+    _flag(reasons, chunk["Email"].duplicated(keep="first") & chunk["Email"].notna(), "Duplicate email in file")
+    _flag(reasons, chunk["Phone"].str.len() > 15, "Phone number longer than 15 characters")
+    _flag(reasons, chunk["Name"].str.len() > 100, "Name longer than 100 characters")
+    _flag(reasons, chunk["Email"].notna() & ~chunk["Email"].str.match(EMAIL_PATTERN, na=False),
+          "Invalid email address")
+    _flag(reasons, chunk["Email"].isna(), "Missing email")
+    _flag(reasons, chunk["Name"].isna(), "Missing name")
+    return _split(chunk, reasons)
+
+
+def _python_rows(frame, columns):
+    """Convert DataFrame rows to plain Python values the MySQL driver accepts."""
+    frame = frame[columns].astype(object).where(frame[columns].notna(), None)
+    return list(frame.itertuples(index=False, name=None))
+
+
+def load_donations(cursor, valid):
+    rows = [(donor, resource, int(quantity), donation_date)
+            for donor, resource, quantity, donation_date in _python_rows(valid, list(DONATION_COLUMNS))]
+    cursor.executemany("""
+        INSERT INTO Donation (DonorName, ResourceType, Quantity, DonationDate)
+        VALUES (%s, %s, %s, %s)
+    """, rows)
+
+    per_resource = valid.groupby("ResourceType")["Quantity"].agg(["count", "sum"])
+    add_inventory_deltas(cursor, {resource: int(total) for resource, total in per_resource["sum"].items()})
+    apply_donation_deltas(cursor, {resource: (int(row["count"]), int(row["sum"]))
+                                   for resource, row in per_resource.iterrows()})
+    apply_daily_deltas(cursor, [(donation_date, resource, donor, quantity)
+                                for donor, resource, quantity, donation_date in rows])
+    return len(rows)
+
+
+def _existing_emails(cursor, emails):
+    if not emails:
+        return set()
+    cursor.execute(
+        f"SELECT Email FROM Volunteer WHERE Email IN ({', '.join(['%s'] * len(emails))})",
+        emails
+    )
+    return {row[0].lower() for row in cursor.fetchall() if row[0]}
+
+
+def load_volunteers(cursor, valid):
+    rows = _python_rows(valid, list(VOLUNTEER_COLUMNS))
+    rows = [(name, email, phone, skills, bool(available)) for name, email, phone, skills, available in rows]
+    cursor.executemany("""
+        INSERT INTO Volunteer (Name, Email, Phone, Skills, Availability)
+        VALUES (%s, %s, %s, %s, %s)
+    """, rows)
+
+    # Email is UNIQUE, so it maps the new rows back to their generated ids
+    emails = [row[1] for row in rows]
+    cursor.execute(
+        f"SELECT VolunteerID, Email FROM Volunteer WHERE Email IN ({', '.join(['%s'] * len(emails))})",
+        emails
+    )
+    ids = {email.lower(): volunteer_id for volunteer_id, email in cursor.fetchall()}
+    skill_rows = [(token, ids[email]) for _, email, _, skills, _ in rows
+                  for token in tokenize_skills(skills)]
+    if skill_rows:
+        cursor.executemany("INSERT INTO VolunteerSkill (Token, VolunteerID) VALUES (%s, %s)", skill_rows)
+
+    apply_volunteer_delta(cursor, len(rows), sum(1 for row in rows if row[4]))
+    return len(rows)
+
+
+def import_chunks(conn, kind, chunks, progress=None):
+    """Validate and load DataFrame chunks of raw rows, committing once per chunk.
+
+    ``progress`` is called with the report after every chunk.
+    """
+    if kind not in ("donations", "volunteers"):
+        raise ValueError(f"Unknown import kind: {kind}")
+    report = ImportReport(kind)
+    start = time.perf_counter()
+    row_offset = 0
+    cursor = conn.cursor()
+    try:
+        for chunk in chunks:
+            chunk.index = range(row_offset, row_offset + len(chunk))
+            row_offset += len(chunk)
+
+            if kind == "donations":
+                valid, rejected = validate_donations(chunk)
+            else:
+                valid, rejected = validate_volunteers(chunk)
+                existing = _existing_emails(cursor, valid["Email"].tolist())
+                if existing:
+                    duplicate = valid["Email"].isin(existing)
+                    reasons = pd.Series(pd.NA, index=valid.index, dtype="string")
+                    _flag(reasons, duplicate, "Email already registered")
+                    valid, already = _split(valid, reasons)
+                    rejected = pd.concat([rejected, already])
+
+            if not valid.empty:
+                try:
+                    if kind == "donations":
+                        report.inserted += load_donations(cursor, valid)
+                    else:
+                        report.inserted += load_volunteers(cursor, valid)
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    failed = valid.copy()
+                    failed.insert(0, "Row", failed.index + 1)
+                    failed["Reason"] = f"Batch failed: {e}"
+                    rejected = pd.concat([rejected, failed])
+
+            if not rejected.empty:
+                report.rejected.append(rejected)
+            report.batches += 1
+            report.elapsed = time.perf_counter() - start
+            if progress:
+                progress(report)
+    finally:
+        cursor.close()
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def run_import(conn, kind, source, filename, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Import a donations or volunteers file, committing once per chunk."""
+    return import_chunks(conn, kind, read_chunks(source, filename, chunk_size), progress)
+
+
+def import_records(conn, kind, records, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Import a list of dicts (e.g. a JSON payload) with the same validation as a file.
+
+    Keys follow the file headers, so ``{"donor": ..., "qty": ...}`` works too.
+    """
+    chunks = (pd.DataFrame(records[start:start + chunk_size], dtype=object)
+              for start in range(0, len(records), chunk_size))
+    return import_chunks(conn, kind, chunks)
+
+
+if __name__ == "__main__":
+    from db_config import pooled_connection
+
+    parser = argparse.ArgumentParser(description="Bulk import donations or volunteers from CSV/Excel.")
+    parser.add_argument("kind", choices=["donations", "volunteers"])
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--rejects", help="write rejected rows with reasons to this CSV file")
+    args = parser.parse_args()
+
+    def print_progress(report):
+        print(f"  batch {report.batches}: {report.inserted} inserted, "
+              f"{report.rejected_count} rejected ({report.elapsed:.1f}s)")
+
+    with pooled_connection() as conn:
+        result = run_import(conn, args.kind, args.path, args.path, args.chunk_size, print_progress)
+
+    rate = result.inserted / result.elapsed if result.elapsed else 0
+    print(f"✅ Imported {result.inserted} {args.kind} in {result.elapsed:.1f}s ({rate:,.0f} rows/s)")
+    if result.rejected_count:
+        print(f"⚠️ {result.rejected_count} rows rejected")
+        if args.rejects:
+            result.rejected_frame().to_csv(args.rejects, index=False)
+            print(f"   details written to {args.rejects}")
+        else:
+            print(result.rejected_frame()[["Row", "Reason"]].to_string(index=False))
+        sys.exit(2)
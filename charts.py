@@ -0,0 +1,121 @@
+"""Bounded chart data for the Plotly charts.
+
+Plotly sends every point of a figure to the browser as JSON on each rerun, so
+the charts are fed a fixed budget of points however much history there is:
+
+* time series are summed into day, week or month buckets, the finest that
+  fits ``NGO_CHART_MAX_POINTS`` over the visible range, and thinned further
+  with LTTB (Largest-Triangle-Three-Buckets) if they still do not fit, which
+  keeps the peaks and dips a plain stride would drop;
+* bar charts keep the ``NGO_CHART_MAX_BARS`` - 1 largest categories and fold
+  the rest into one "Other" bar.
+
+Everything is vectorized with NumPy apart from LTTB's walk over its buckets,
+which is bounded by the point budget rather than the data.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+MAX_LINE_POINTS = int(os.environ.get("NGO_CHART_MAX_POINTS", "400"))
+MAX_BARS = int(os.environ.get("NGO_CHART_MAX_BARS", "30"))
+OTHER_LABEL = "Other"
+
+BUCKETS = ("day", "week", "month")
+# 1970-01-01 was a Thursday; shifting by 3 days puts Monday at 0
+_MONDAY_OFFSET = 3
+
+
+def _days(dates):
+    # ISO strings (SQLite), dates and datetimes all parse to day precision
+    return np.asarray([str(value)[:10] for value in dates], dtype="datetime64[D]")
+
+
+def pick_bucket(first, last, max_points=MAX_LINE_POINTS):
+    """The finest of day/week/month giving at most ``max_points`` buckets between two days."""
+    span = int((np.datetime64(last, "D") - np.datetime64(first, "D")).astype(np.int64)) + 1
+    if span <= max_points:
+        return "day"
+    if -(-span // 7) <= max_points:
+        return "week"
+    return "month"
+
+
+def bucket_series(days, values, bucket):
+    """Sum ``values`` per bucket; returns the bucket start days and totals, in order."""
+    if bucket == "week":
+        ordinal = days.astype(np.int64)
+        days = (ordinal - (ordinal + _MONDAY_OFFSET) % 7).astype("datetime64[D]")
+    elif bucket == "month":
+        days = days.astype("datetime64[M]").astype("datetime64[D]")
+    starts, inverse = np.unique(days, return_inverse=True)
+    return starts, np.bincount(inverse, weights=values, minlength=len(starts))
+
+
+def lttb(x, y, threshold):
+    """Indices of the ``threshold`` points that best keep the shape of ``y`` over ``x``.
+
+    ``x`` must be increasing. The first and last points are always kept; each
+    bucket in between keeps the point forming the largest triangle with the
+    point kept before it and the average of the next bucket.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # threshold - 2 buckets over the interior points; spacing >= 1, so none is empty
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    sizes = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x, edges[:-1]) / sizes, x[-1])
+    mean_y = np.append(np.add.reduceat(y, edges[:-1]) / sizes, y[-1])
+
+    kept = np.empty(threshold, dtype=np.intp)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        ax, ay = x[previous], y[previous]
+        cx, cy = mean_x[bucket + 1], mean_y[bucket + 1]
+        # Twice the triangle's area; the constant factor does not change the argmax
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        previous = lo + int(np.argmax(area))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def time_series(rows, start_date=None, end_date=None, max_points=MAX_LINE_POINTS):
+    """Chart-ready ``(frame, bucket)`` for ``(date, quantity)`` rows sorted by date.
+
+    The bucket is picked from the visible range: the date filter where one is
+    set, otherwise the span of the data. The frame has ``Date`` and
+    ``Quantity`` columns and at most ``max_points`` rows.
+    """
+    if not rows:
+        return pd.DataFrame({"Date": pd.Series(dtype="datetime64[ns]"), "Quantity": []}), "day"
+    days = _days([row[0] for row in rows])
+    values = np.asarray([row[1] for row in rows], dtype=np.float64)
+    first = np.datetime64(start_date, "D") if start_date else days[0]
+    last = np.datetime64(end_date, "D") if end_date else days[-1]
+    bucket = pick_bucket(first, last, max_points)
+    if bucket != "day":
+        days, values = bucket_series(days, values, bucket)
+    kept = lttb(days.astype(np.int64), values, max_points)
+    return pd.DataFrame({"Date": days[kept].astype("datetime64[ns]"), "Quantity": values[kept]}), bucket
+
+
+def top_categories(frame, label, value, limit=MAX_BARS):
+    """At most ``limit`` bars: the largest ``limit - 1`` by ``value`` plus an "Other" bar.
+
+    Frames that already fit are returned unchanged, in their own order.
+    """
+    if len(frame) <= limit:
+        return frame
+    values = frame[value].to_numpy(dtype=np.float64, na_value=0)
+    keep = np.argpartition(-values, limit - 2)[:limit - 1]
+    # Largest first; ties keep their original order
+    keep = keep[np.lexsort((keep, -values[keep]))]
+    other = values.sum() - values[keep].sum()
+    labels = np.append(frame[label].to_numpy(dtype=object)[keep], OTHER_LABEL)
+    return pd.DataFrame({label: labels, value: np.append(values[keep], other)})
@@ -0,0 +1,177 @@
+"""Layout and data helpers shared by the app's pages.
+
+``app.py`` is the entrypoint: it sets up the page, draws the shared header and
+sidebar and runs the selected page from ``views/``. This module is imported
+once per process, so its state (the query cache, the ingest queue, the
+embedded API) is created once rather than on every rerun.
+
+Only light modules are imported here. pandas, Plotly and NumPy are imported by
+the pages that draw frames and charts, so the form pages start without them.
+"""
+import streamlit as st
+
+import repository
+from api import API_EMBED, serve_in_background
+from db_config import read_connection
+from export import EXPORT_UI_MAX_ROWS, MIME_TYPES, export_filename, export_to_tempfile
+from ingest import get_ingest_queue
+from query_cache import get_query_cache
+from rollups import read_summary
+
+# Custom CSS for better styling
+STYLES = """
+<style>
+    .main-header {
+        background: linear-gradient(90deg, #1f77b4, #17a2b8);
+        padding: 2rem;
+        border-radius: 10px;
+        margin-bottom: 2rem;
+        color: white;
+        text-align: center;
+    }
+    .info-box {
+        background-color: #f8f9fa;
+        border: 1px solid #dee2e6;
+        padding: 1rem;
+        border-radius: 5px;
+        margin: 1rem 0;
+    }
+    .stButton > button {
+        background: linear-gradient(90deg, #28a745, #20c997);
+        color: white;
+        border: none;
+        padding: 0.5rem 2rem;
+        border-radius: 25px;
+        font-weight: bold;
+        transition: all 0.3s;
+    }
+    .stButton > button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+    }
+</style>
+"""
+
+HEADER = """
+<div class="main-header">
+    <h1>🤝 NGO Volunteer & Donation Management Hub</h1>
+    <p>Empowering communities through organized volunteer coordination and resource management</p>
+</div>
+"""
+
+FOOTER = """
+<div style='text-align: center; color: #666; padding: 2rem;'>
+    <p>🤝 NGO Management Hub | Making a difference, one volunteer and donation at a time</p>
+    <p>Need help? Contact your system administrator</p>
+</div>
+"""
+
+# Query-result cache
+# Reads are served from the shared cache until a write path invalidates one of
+# the tables they depend on, so plain reruns cost no database round trips.
+query_cache = get_query_cache()
+
+# Donation intake goes through the write-behind queue when this process owns it
+ingest_queue = get_ingest_queue()
+
+# With NGO_API_EMBED the JSON API runs in this process, sharing the pool and
+# the cache, so records posted to it show up on the next rerun
+if API_EMBED:
+    serve_in_background()
+
+# Display labels shared by the Inventory and Analytics pages
+INVENTORY_LABELS = {'ItemName': 'Item Name', 'QuantityAvailable': 'Quantity Available',
+                    'ReorderLevel': 'Reorder Level'}
+
+
+def render_header():
+    st.markdown(STYLES, unsafe_allow_html=True)
+    st.markdown(HEADER, unsafe_allow_html=True)
+
+
+def render_footer():
+    st.markdown("---")
+    st.markdown(FOOTER, unsafe_allow_html=True)
+
+
+# Cached reads may be served by a read replica (NGO_DB_REPLICAS) within the
+# session's staleness bound; writes always go to the primary pool
+def cached_read(key, tables, loader):
+    def load():
+        with read_connection(tables) as conn:
+            cursor = conn.cursor()
+            try:
+                return loader(cursor)
+            finally:
+                cursor.close()
+    return query_cache.get_or_load(key, tables, load)
+
+
+def cached_query(tables, query, *args):
+    """Serve ``query(conn, *args)`` (a repository function) from the cache."""
+    def load():
+        with read_connection(tables) as conn:
+            return query(conn, *args)
+    return query_cache.get_or_load((query.__name__,) + args, tables, load)
+
+
+# Headline counts come from the DashboardSummary rollup row, not table scans
+def get_summary():
+    return cached_read(("summary",), ["DashboardSummary"], read_summary)
+
+
+def get_volunteer_stats():
+    total, available, _, _ = get_summary()
+    return total, available
+
+
+def get_donation_stats():
+    _, _, total, total_items = get_summary()
+    return total, total_items
+
+
+def notify_stock_alerts():
+    """Toast each new stock alert once per session.
+
+    A new session starts from the latest alert, so only crossings that happen
+    while it is open are announced; the full history is on the Inventory page.
+    """
+    if "stock_alert_seen" not in st.session_state:
+        st.session_state.stock_alert_seen = cached_query(["StockAlert"], repository.latest_stock_alert_id)
+        return
+    new_alerts = cached_query(["StockAlert"], repository.stock_alerts_after, st.session_state.stock_alert_seen)
+    for _, item_name, alert_type, quantity, level in new_alerts:
+        if alert_type == "low":
+            st.toast(f"🔻 {item_name} is low: {quantity} left (reorder level {level})")
+        else:
+            st.toast(f"✅ {item_name} restocked: {quantity} available")
+    if new_alerts:
+        st.session_state.stock_alert_seen = new_alerts[-1][0]
+
+
+def export_download(kind, tables, filters):
+    """Download button that streams the filtered rows into a file only when clicked.
+
+    The rows are written to a temporary file batch by batch, but Streamlit
+    serves a download from memory, so the finished file is read back whole.
+    The button therefore exports at most ``EXPORT_UI_MAX_ROWS`` rows; larger
+    exports go through ``python export.py``, which writes straight to disk.
+    """
+    # frames imports pandas, which only the list pages calling this load
+    from frames import HAVE_ARROW
+
+    # Parquet needs pyarrow; CSV is always available
+    formats = ["csv", "parquet"] if HAVE_ARROW else ["csv"]
+    st.caption(f"Exports every row matching the filters above, not just the current page, up to "
+               f"{EXPORT_UI_MAX_ROWS:,} rows. Use `python export.py {kind}` for more.")
+    fmt = st.radio("Format", formats, horizontal=True, key=f"export_{kind}_format")
+
+    def generate():
+        with read_connection(tables) as conn:
+            tmp = export_to_tempfile(conn, kind, fmt, filters, max_rows=EXPORT_UI_MAX_ROWS)
+        # Streamlit keeps the bytes, not the file, so close it straight away
+        with tmp:
+            return tmp.read()
+
+    st.download_button(f"⬇️ Download {fmt.upper()}", generate, file_name=export_filename(kind, fmt),
+                       mime=MIME_TYPES[fmt], key=f"export_{kind}_download")
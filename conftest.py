@@ -0,0 +1,34 @@
+"""Shared pytest fixtures: every test gets a fresh SQLite stand-in database.
+
+Run with ``python -m pytest -q``; no MySQL server is needed.
+"""
+import os
+
+# Settings are read when the modules are first imported, so set them before
+# anything from the app is: no donation queue or API thread, no replicas
+os.environ["NGO_DB_BACKEND"] = "sqlite"
+os.environ["NGO_DONATION_QUEUE"] = "0"
+os.environ["NGO_API_EMBED"] = "0"
+os.environ.pop("NGO_DB_REPLICAS", None)
+
+import pytest
+
+from db_config import configure_pool, pooled_connection
+from query_cache import get_query_cache
+from sqlite_backend import connect_sqlite, create_schema
+
+# A connectivity script for a configured MySQL server, not a test
+collect_ignore = ["test_connection.py"]
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A pooled connection to an empty database with the full schema."""
+    path = str(tmp_path / "ngo.sqlite3")
+    conn = connect_sqlite(path)
+    create_schema(conn)
+    conn.close()
+    configure_pool(factory=lambda: connect_sqlite(path))
+    get_query_cache().clear()
+    with pooled_connection() as conn:
+        yield conn
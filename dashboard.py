@@ -0,0 +1,108 @@
+"""Concurrent data loading for the Dashboard page.
+
+The dashboard's panels are independent reads, so they are fetched in parallel
+on a small shared thread pool. Each panel uses its own pooled connection and
+goes through the query cache as usual, which puts the page's latency at
+roughly its slowest panel rather than the sum of all of them.
+
+``load_dashboard()`` waits at most ``timeout`` seconds in total. Panels that
+have not finished by then come back as pending and the page renders without
+them. Their loads keep running in the background and land in the query
+cache, so the next rerun picks them up.
+"""
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import repository
+from db_config import POOL_SIZE, read_connection
+from query_cache import get_query_cache
+from rollups import read_summary, read_top_resources
+
+PANEL_TIMEOUT = float(os.environ.get("NGO_DASHBOARD_TIMEOUT", "3"))
+TOP_RESOURCES = 5
+RECENT_DONATIONS = 5
+
+
+@dataclass
+class Panel:
+    name: str
+    value: Any = None
+    error: Optional[str] = None
+    pending: bool = False
+    elapsed_ms: float = 0.0
+
+    @property
+    def ready(self):
+        return not self.pending and self.error is None
+
+
+def _with_cursor(read, *args):
+    def load(conn):
+        cursor = conn.cursor()
+        try:
+            return read(cursor, *args)
+        finally:
+            cursor.close()
+    return load
+
+
+# name -> (cache key, tables read, loader taking a connection). The keys match
+# the ones common.py's get_summary and cached_query build, so other pages
+# share these cache entries.
+PANELS = {
+    "summary": (("summary",), ["DashboardSummary"], _with_cursor(read_summary)),
+    "recent_donations": (("recent_donations", RECENT_DONATIONS), ["Donation"],
+                         lambda conn: repository.recent_donations(conn, RECENT_DONATIONS)),
+    "top_resources": (("top_resources", TOP_RESOURCES), ["ResourceTotals"],
+                      _with_cursor(read_top_resources, TOP_RESOURCES)),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # More workers than pooled connections would only queue on the pool
+                _executor = ThreadPoolExecutor(max_workers=max(1, min(len(PANELS), POOL_SIZE)),
+                                               thread_name_prefix="dashboard")
+    return _executor
+
+
+def _load_panel(name):
+    key, tables, loader = PANELS[name]
+
+    def load():
+        with read_connection(tables) as conn:
+            return loader(conn)
+    start = time.perf_counter()
+    value = get_query_cache().get_or_load(key, tables, load)
+    return value, (time.perf_counter() - start) * 1000
+
+
+def load_dashboard(timeout=PANEL_TIMEOUT):
+    """Fetch every panel concurrently; returns ``{name: Panel}``."""
+    executor = _get_executor()
+    # Each task runs in a copy of this context so its queries are attributed
+    # to the calling page in the instrumentation
+    futures = {executor.submit(contextvars.copy_context().run, _load_panel, name): name for name in PANELS}
+    done, _ = wait(futures, timeout=timeout)
+    panels = {}
+    for future, name in futures.items():
+        if future not in done:
+            panels[name] = Panel(name, pending=True)
+            continue
+        try:
+            value, elapsed_ms = future.result()
+            panels[name] = Panel(name, value=value, elapsed_ms=elapsed_ms)
+        except Exception as e:
+            panels[name] = Panel(name, error=str(e))
+    return panels
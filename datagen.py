@@ -0,0 +1,240 @@
+"""Seeded synthetic data generator for all six base tables.
+
+Row counts scale from a single ``--scale`` (number of donations) unless set
+per table. Values are drawn with NumPy from a fixed seed, so the same
+arguments always produce the same database. After loading, the skill index
+and every rollup are rebuilt so the app sees a consistent database.
+
+Usage:
+    python datagen.py --backend sqlite --sqlite-path bench.sqlite3 --scale 100000
+    python datagen.py --backend mysql --scale 1000000 --reset
+"""
+import argparse
+import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from inventory import rebuild_low_stock
+from rollups import rebuild
+from skill_search import rebuild_skill_index
+
+FIRST_NAMES = ["Aarav", "Riya", "Kabir", "Ananya", "Vihaan", "Isha", "Arjun", "Meera", "Rohan", "Saanvi",
+               "Dev", "Priya", "Kiran", "Neha", "Aditya", "Zara", "Ishaan", "Tara", "Nikhil", "Pooja",
+               "Sam", "Maria", "Chen", "Fatima", "Lucas", "Amara", "Omar", "Elena", "Yusuf", "Grace"]
+LAST_NAMES = ["Sharma", "Patel", "Singh", "Gupta", "Khan", "Iyer", "Reddy", "Das", "Mehta", "Nair",
+              "Joshi", "Kapoor", "Bose", "Rao", "Verma", "Smith", "Garcia", "Wang", "Okafor", "Silva"]
+SKILLS = ["Teaching", "Medical", "First Aid", "IT", "Event Management", "Cooking", "Driving",
+          "Counselling", "Fundraising", "Photography", "Translation", "Accounting", "Carpentry",
+          "Nursing", "Social Media", "Music", "Sports Coaching", "Legal Aid", "Gardening", "Logistics"]
+RESOURCE_TYPES = ["Food Items", "Clothing", "Medical Supplies", "Books", "Electronics", "Furniture", "Toys"]
+SUPPORT_TYPES = ["Education", "Healthcare", "Nutrition", "Shelter", "Counselling"]
+DONOR_KINDS = ["Foundation", "Trust", "Ltd", "Family", "Club"]
+
+
+def default_counts(scale):
+    """Per-table row counts for a given number of donations."""
+    return {
+        "donations": scale,
+        "volunteers": max(10, scale // 10),
+        "inventory": max(len(RESOURCE_TYPES), min(5000, scale // 200)),
+        "children": max(10, scale // 100),
+        "events": max(5, scale // 1000),
+        "participation": max(10, scale // 5),
+        "disbursements": max(10, scale // 10),
+    }
+
+
+def _insert(conn, sql, rows, batch_size):
+    cursor = conn.cursor()
+    try:
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(sql, rows[start:start + batch_size])
+            conn.commit()
+    finally:
+        cursor.close()
+
+
+def _ids(conn, table, column):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT {column} FROM {table}")
+        return np.array([row[0] for row in cursor.fetchall()], dtype=np.int64)
+    finally:
+        cursor.close()
+
+
+def reset(conn):
+    cursor = conn.cursor()
+    try:
+        for table in ("Participation", "VolunteerSkill", "Event", "ChildProfile", "StockAlert", "DisbursementDaily",
+                      "DonationDailyDonor", "DonationDaily", "ResourceTotals", "DonationArchive", "Donation", "Inventory",
+                      "Volunteer"):
+            cursor.execute(f"DELETE FROM {table}")
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def item_names(count):
+    extra = count - len(RESOURCE_TYPES)
+    return RESOURCE_TYPES + [f"SKU {i:05d}" for i in range(1, extra + 1)]
+
+
+def generate(conn, counts, seed=42, years=5, batch_size=10000, log=print):
+    """Fill the database with ``counts`` rows per table; returns elapsed seconds."""
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    today = date.today()
+    day_span = 365 * years
+
+    # Volunteers: unique emails, 1-4 skills each, ~70% available
+    n = counts["volunteers"]
+    log(f"→ {n:,} volunteers")
+    first = rng.choice(FIRST_NAMES, n)
+    last = rng.choice(LAST_NAMES, n)
+    skill_counts = rng.integers(1, 5, n)
+    skill_picks = rng.integers(0, len(SKILLS), (n, 4))
+    available = rng.random(n) < 0.7
+    phones = rng.integers(10**8, 10**9, n)
+    volunteers = [
+        (f"{first[i]} {last[i]}", f"volunteer{i}@example.org", f"9{phones[i]}",
+         ", ".join(dict.fromkeys(SKILLS[j] for j in skill_picks[i, :skill_counts[i]])), bool(available[i]))
+        for i in range(n)
+    ]
+    _insert(conn, "INSERT INTO Volunteer (Name, Email, Phone, Skills, Availability) VALUES (%s, %s, %s, %s, %s)",
+            volunteers, batch_size)
+    del volunteers
+
+    # Inventory: the form's resource types plus synthetic SKUs; some run low
+    n = counts["inventory"]
+    log(f"→ {n:,} inventory items")
+    quantities = np.where(rng.random(n) < 0.1, rng.integers(0, 10, n), rng.integers(10, 5000, n))
+    names = item_names(n)
+    _insert(conn, "INSERT INTO Inventory (ItemName, QuantityAvailable) VALUES (%s, %s)",
+            [(names[i], int(quantities[i])) for i in range(n)], batch_size)
+    cursor = conn.cursor()
+    try:
+        rebuild_low_stock(cursor)
+        conn.commit()
+    finally:
+        cursor.close()
+
+    # Donations: repeat donors and a skewed item mix, spread over ``years``
+    n = counts["donations"]
+    log(f"→ {n:,} donations")
+    donor_pool = max(10, n // 5)
+    resource_weights = 1.0 / np.arange(1, len(names) + 1)
+    resource_weights /= resource_weights.sum()
+    cursor = conn.cursor()
+    try:
+        for chunk_start in range(0, n, batch_size):
+            size = min(batch_size, n - chunk_start)
+            donors = rng.integers(0, donor_pool, size)
+            kinds = rng.integers(0, len(DONOR_KINDS), size)
+            resources = rng.choice(len(names), size, p=resource_weights)
+            amounts = rng.integers(1, 51, size)
+            days_ago = rng.integers(0, day_span, size)
+            cursor.executemany(
+                "INSERT INTO Donation (DonorName, ResourceType, Quantity, DonationDate) VALUES (%s, %s, %s, %s)",
+                [(f"Donor {donors[i]} {DONOR_KINDS[kinds[i]]}", names[resources[i]], int(amounts[i]),
+                  today - timedelta(days=int(days_ago[i]))) for i in range(size)]
+            )
+            conn.commit()
+    finally:
+        cursor.close()
+
+    # Disbursements over the last 180 days, recorded straight into their daily rollup
+    n = counts["disbursements"]
+    log(f"→ {n:,} disbursements")
+    picks = np.column_stack([rng.integers(0, 180, n), rng.choice(len(names), n, p=resource_weights)])
+    amounts = rng.integers(1, 31, n)
+    cells, inverse = np.unique(picks, axis=0, return_inverse=True)
+    totals = np.bincount(inverse.ravel(), weights=amounts, minlength=len(cells))
+    _insert(conn, "INSERT INTO DisbursementDaily (DisbursementDate, ItemName, Quantity) VALUES (%s, %s, %s)",
+            [(today - timedelta(days=int(days_ago)), names[item], int(total))
+             for (days_ago, item), total in zip(cells, totals)], batch_size)
+
+    n = counts["children"]
+    log(f"→ {n:,} child profiles")
+    ages = rng.integers(3, 18, n)
+    genders = rng.choice(["Female", "Male", "Other"], n, p=[0.49, 0.49, 0.02])
+    supports = rng.choice(SUPPORT_TYPES, n)
+    _insert(conn, "INSERT INTO ChildProfile (Age, Gender, SupportType, Comments) VALUES (%s, %s, %s, %s)",
+            [(int(ages[i]), str(genders[i]), str(supports[i]), None) for i in range(n)], batch_size)
+
+    # Events: past and upcoming, each asking for a couple of skills
+    n = counts["events"]
+    log(f"→ {n:,} events")
+    event_days = rng.integers(-day_span, 90, n)
+    event_skills = rng.integers(0, len(SKILLS), (n, 2))
+    event_sizes = rng.integers(2, 30, n)
+    event_rows = []
+    for i in range(n):
+        required = f"{SKILLS[event_skills[i, 0]]}, {SKILLS[event_skills[i, 1]]}"
+        event_rows.append((f"Community Event {i + 1}", today + timedelta(days=int(event_days[i])),
+                           f"Skills needed: {required}", required, int(event_sizes[i])))
+    _insert(conn, """
+        INSERT INTO Event (EventName, EventDate, Description, RequiredSkills, VolunteersNeeded)
+        VALUES (%s, %s, %s, %s, %s)
+    """, event_rows, batch_size)
+
+    n = counts["participation"]
+    log(f"→ {n:,} participation records")
+    event_ids = _ids(conn, "Event", "EventID")
+    volunteer_ids = _ids(conn, "Volunteer", "VolunteerID")
+    pairs = np.unique(np.column_stack([rng.choice(event_ids, n), rng.choice(volunteer_ids, n)]), axis=0)
+    _insert(conn, "INSERT INTO Participation (EventID, VolunteerID) VALUES (%s, %s)",
+            [(int(event_id), int(volunteer_id)) for event_id, volunteer_id in pairs], batch_size)
+
+    log("→ rebuilding skill index and rollups")
+    rebuild_skill_index(conn)
+    rebuild(conn)
+    return time.perf_counter() - start
+
+
+def open_connection(backend, sqlite_path):
+    if backend == "sqlite":
+        from sqlite_backend import connect_sqlite, create_schema
+        conn = connect_sqlite(sqlite_path)
+        create_schema(conn)
+        return conn
+    from db_config import DB_SETTINGS
+    import mysql.connector
+    return mysql.connector.connect(**DB_SETTINGS)
+
+
+def add_arguments(parser):
+    # Same defaults as the app (db_config), so generating and benchmarking hit the same database
+    parser.add_argument("--backend", choices=["mysql", "sqlite"], default=os.environ.get("NGO_DB_BACKEND", "mysql"))
+    parser.add_argument("--sqlite-path", default=os.environ.get("NGO_SQLITE_PATH", "bench.sqlite3"))
+    parser.add_argument("--scale", type=int, default=10000, help="number of donations (1k to 10M)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--years", type=int, default=5, help="span of donation history")
+    for table in default_counts(1):
+        parser.add_argument(f"--{table}", type=int, help=f"override the number of {table} rows")
+
+
+def counts_from_args(args):
+    counts = default_counts(args.scale)
+    for table in counts:
+        if getattr(args, table) is not None:
+            counts[table] = getattr(args, table)
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill the database with synthetic data.")
+    add_arguments(parser)
+    parser.add_argument("--reset", action="store_true", help="delete existing rows first")
+    args = parser.parse_args()
+
+    conn = open_connection(args.backend, args.sqlite_path)
+    try:
+        if args.reset:
+            reset(conn)
+        elapsed = generate(conn, counts_from_args(args), seed=args.seed, years=args.years)
+    finally:
+        conn.close()
+    print(f"✅ Generated data in {elapsed:.1f}s")
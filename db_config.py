@@ -1,9 +1,520 @@
-import mysql.connector
+"""Database connections, the connection pool and read/write routing.
+
+Writes, and any read that is part of a write, use the primary pool
+(``get_pool()``). Cached report and list reads use ``read_connection()``,
+which sends them to a replica listed in ``NGO_DB_REPLICAS`` when one is fresh
+enough and to the primary otherwise; see :class:`ReadRouter`.
+"""
+import argparse
+import contextvars
+import itertools
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from instrumentation import instrument_connection
+from query_cache import get_query_cache
+
+# Pool settings can be overridden per deployment without touching the code
+POOL_SIZE = int(os.environ.get("NGO_DB_POOL_SIZE", "5"))
+POOL_TIMEOUT = float(os.environ.get("NGO_DB_POOL_TIMEOUT", "10"))
+# Connections idle for less than this many seconds are handed out without a ping
+POOL_PING_AFTER = float(os.environ.get("NGO_DB_POOL_PING_AFTER", "1.0"))
+
+# "mysql" for the real database, "sqlite" for the file-based stand-in used by
+# benchmarks and local experiments (see sqlite_backend.py)
+DB_BACKEND = os.environ.get("NGO_DB_BACKEND", "mysql")
+SQLITE_PATH = os.environ.get("NGO_SQLITE_PATH", "ngo_dbms.sqlite3")
+
+# Read replicas: MySQL "host" or "host:port" entries (other settings as for
+# the primary), or SQLite file paths, separated by commas
+DB_REPLICAS = [target.strip() for target in os.environ.get("NGO_DB_REPLICAS", "").split(",") if target.strip()]
+# Default staleness bound for replica reads; sessions may set a tighter one
+REPLICA_MAX_LAG = float(os.environ.get("NGO_REPLICA_MAX_LAG", "5"))
+# How often the primary's heartbeat is written and each replica's is read back
+REPLICA_HEARTBEAT = float(os.environ.get("NGO_REPLICA_HEARTBEAT", "1.0"))
+# A replica that failed is left alone for this many seconds
+REPLICA_RETRY_AFTER = float(os.environ.get("NGO_REPLICA_RETRY_AFTER", "10"))
+# Wait at most this long for a replica connection before reading from the primary
+REPLICA_POOL_TIMEOUT = float(os.environ.get("NGO_REPLICA_POOL_TIMEOUT", "1.0"))
+HEARTBEAT_ID = 1
+
+DB_SETTINGS = {
+    "host": "localhost",
+    "user": "root",
+    "password": "rmp26521**",
+    "database": "ngo_dbms",
+}
+
 
 def get_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="rmp26521**",
-        database="ngo_dbms"
-    )
+    if DB_BACKEND == "sqlite":
+        from sqlite_backend import connect_sqlite
+        return connect_sqlite(SQLITE_PATH)
+    # Imported here so the SQLite backend works without the MySQL driver installed
+    import mysql.connector
+    return mysql.connector.connect(**DB_SETTINGS)
+
+
+def get_instrumented_connection():
+    """A new connection whose statements are recorded by ``instrumentation``."""
+    return instrument_connection(get_connection())
+
+
+def get_replica_connection(target):
+    """A new instrumented connection to one ``NGO_DB_REPLICAS`` entry."""
+    if DB_BACKEND == "sqlite":
+        from sqlite_backend import connect_sqlite
+        # sqlite3 would quietly create an empty database for a mistyped path
+        if not os.path.exists(target):
+            raise FileNotFoundError(f"SQLite replica {target} does not exist")
+        return instrument_connection(connect_sqlite(target))
+    import mysql.connector
+    host, _, port = target.partition(":")
+    settings = dict(DB_SETTINGS, host=host)
+    if port:
+        settings["port"] = int(port)
+    return instrument_connection(mysql.connector.connect(**settings))
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes free within the pool timeout."""
+
+
+class ConnectionPool:
+    """A fixed-size, thread-safe pool of database connections.
+
+    Connections are created lazily up to ``size``. Each checkout health-checks
+    the connection (ping, then reconnect) and every checkin rolls back any
+    transaction the caller left open, so the next user always gets a clean
+    connection.
+    """
+
+    def __init__(self, factory=get_connection, size=POOL_SIZE, timeout=POOL_TIMEOUT,
+                 ping_after=POOL_PING_AFTER):
+        if size < 1:
+            raise ValueError("pool size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.ping_after = ping_after
+        # LIFO keeps the most recently used (warmest) connections in rotation
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._reconnects = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _new_connection(self):
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+        try:
+            return self.factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    def _validate(self, conn, idle_since):
+        if time.monotonic() - idle_since < self.ping_after:
+            return conn
+        ping = getattr(conn, "ping", None)
+        if ping is None:
+            return conn
+        try:
+            ping(reconnect=False)
+            return conn
+        except Exception:
+            pass
+        # The server dropped us (timeout, restart); try to revive the same handle
+        try:
+            conn.reconnect(attempts=2, delay=0)
+        except Exception:
+            self._discard(conn)
+            conn = self._new_connection()
+            if conn is None:
+                raise PoolTimeout("Could not replace a broken database connection")
+        with self._lock:
+            self._reconnects += 1
+        return conn
+
+    def acquire(self):
+        start = time.perf_counter()
+        try:
+            conn, idle_since = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._new_connection()
+            idle_since = time.monotonic()
+            if conn is None:
+                try:
+                    conn, idle_since = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self._timeouts += 1
+                    raise PoolTimeout(
+                        f"No database connection available after {self.timeout:.1f}s "
+                        f"(pool size {self.size})"
+                    )
+        waited = time.perf_counter() - start
+        conn = self._validate(conn, idle_since)
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return conn
+
+    def release(self, conn):
+        with self._lock:
+            self._in_use -= 1
+        try:
+            if getattr(conn, "in_transaction", True):
+                conn.rollback()
+        except Exception:
+            # A connection that cannot even roll back is not worth keeping
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def metrics(self):
+        with self._lock:
+            checkouts = self._checkouts
+            return {
+                "size": self.size,
+                "open": self._created,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "peak_in_use": self._peak_in_use,
+                "checkouts": checkouts,
+                "timeouts": self._timeouts,
+                "reconnects": self._reconnects,
+                "avg_wait_ms": (self._wait_total / checkouts * 1000) if checkouts else 0.0,
+                "max_wait_ms": self._wait_max * 1000,
+            }
+
+    def close(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(factory=get_instrumented_connection)
+    return _pool
+
+
+def configure_pool(**kwargs):
+    """Replace the process-wide pool, e.g. with a different factory or size.
+
+    The old pool's idle connections are closed; connections still checked out
+    are closed by their holders as usual.
+    """
+    global _pool
+    kwargs.setdefault("factory", get_instrumented_connection)
+    with _pool_lock:
+        old, _pool = _pool, ConnectionPool(**kwargs)
+        # Reads that fall back to the primary must use the new pool too
+        if _router is not None:
+            _router.primary = _pool
+    if old is not None:
+        old.close()
+    return _pool
+
+
+@contextmanager
+def pooled_connection():
+    with get_pool().connection() as conn:
+        yield conn
+
+
+class Replica:
+    """One read replica: its pool and what its heartbeat last said."""
+
+    def __init__(self, target, pool):
+        self.target = target
+        self.pool = pool
+        # Primary wall-clock time of the newest heartbeat seen on the replica
+        self.beat = None
+        self.checked_at = 0.0
+        self.down_until = 0.0
+        self.error = None
+        self.reads = 0
+        self.failures = 0
+        self._check_lock = threading.Lock()
+
+    def lag(self, now=None):
+        if self.beat is None:
+            return None
+        return max(0.0, (now or time.time()) - self.beat)
+
+
+class ReadRouter:
+    """Sends cached reads to replicas within a staleness bound, else to the primary.
+
+    Staleness is measured with a heartbeat: while replicas are configured a
+    background thread writes the current time to ``ReplicaHeartbeat`` on the
+    primary every ``NGO_REPLICA_HEARTBEAT`` seconds (migration 0012), and the
+    router reads it back from each replica at the same interval. A replica's
+    lag is how old the newest heartbeat it has is.
+
+    A read may go to a replica when
+    * its lag is within the caller's bound (``NGO_REPLICA_MAX_LAG`` by default), and
+    * its heartbeat is newer than the last local write to any table the read
+      depends on. Writes are learned from query-cache invalidations, so a
+      result loaded right after a form submit, and cached under the new
+      version, always includes that submit.
+    Replicas that fail a heartbeat read or a connection are skipped for
+    ``NGO_REPLICA_RETRY_AFTER`` seconds. With no eligible replica the read
+    runs on the primary.
+    """
+
+    def __init__(self, primary, replicas, max_lag=REPLICA_MAX_LAG, heartbeat=REPLICA_HEARTBEAT,
+                 retry_after=REPLICA_RETRY_AFTER):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.heartbeat = heartbeat
+        self.retry_after = retry_after
+        self._write_fences = {}
+        self._rotation = itertools.count()
+        self._lock = threading.Lock()
+        self._primary_reads = 0
+        self._fallbacks = 0
+        self._heartbeat_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Begin writing heartbeats to the primary (daemon thread)."""
+        if self.replicas and self._thread is None:
+            self._thread = threading.Thread(target=self._beat_forever, name="ngo-heartbeat", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def write_heartbeat(self):
+        with self.primary.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("UPDATE ReplicaHeartbeat SET BeatAt = %s WHERE HeartbeatID = %s",
+                               (time.time(), HEARTBEAT_ID))
+                conn.commit()
+            finally:
+                cursor.close()
+
+    def _beat_forever(self):
+        while not self._stop.is_set():
+            try:
+                self.write_heartbeat()
+                self._heartbeat_error = None
+            except Exception as e:
+                self._heartbeat_error = str(e)
+            self._stop.wait(self.heartbeat)
+
+    def note_write(self, tables):
+        """Record that ``tables`` changed now; subscribed to the query cache."""
+        now = time.time()
+        with self._lock:
+            for table in tables:
+                self._write_fences[table] = now
+
+    def _check(self, replica, now):
+        # One thread refreshes a replica's heartbeat; the others use the last value
+        if now - replica.checked_at < self.heartbeat or not replica._check_lock.acquire(blocking=False):
+            return
+        try:
+            with replica.pool.connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute("SELECT BeatAt FROM ReplicaHeartbeat WHERE HeartbeatID = %s", (HEARTBEAT_ID,))
+                    row = cursor.fetchone()
+                finally:
+                    cursor.close()
+            # 0 is the seed value: the primary has not written a heartbeat yet
+            replica.beat = float(row[0]) if row and row[0] else None
+            replica.error = None
+        except Exception as e:
+            self._mark_down(replica, e)
+        finally:
+            replica.checked_at = now
+            replica._check_lock.release()
+
+    def _mark_down(self, replica, error):
+        replica.down_until = time.time() + self.retry_after
+        replica.error = str(error)
+        replica.failures += 1
+
+    def choose(self, tables=(), max_lag=None):
+        """The replica to read ``tables`` from, or None for the primary."""
+        if not self.replicas:
+            return None
+        max_lag = self.max_lag if max_lag is None else max_lag
+        if max_lag <= 0:
+            return None
+        with self._lock:
+            fence = max((self._write_fences.get(table, 0.0) for table in tables), default=0.0)
+        now = time.time()
+        start = next(self._rotation)
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(start + i) % len(self.replicas)]
+            if now < replica.down_until:
+                continue
+            self._check(replica, now)
+            if now < replica.down_until or replica.beat is None:
+                continue
+            if replica.lag(now) <= max_lag and replica.beat >= fence:
+                return replica
+        return None
+
+    @contextmanager
+    def connection(self, tables=(), max_lag=None):
+        replica = self.choose(tables, max_lag)
+        conn = None
+        if replica is not None:
+            try:
+                conn = replica.pool.acquire()
+            except Exception as e:
+                self._mark_down(replica, e)
+                with self._lock:
+                    self._fallbacks += 1
+        if conn is None:
+            with self._lock:
+                self._primary_reads += 1
+            with self.primary.connection() as conn:
+                yield conn
+            return
+        replica.reads += 1
+        try:
+            yield conn
+        finally:
+            replica.pool.release(conn)
+
+    def metrics(self):
+        now = time.time()
+        replicas = []
+        for replica in self.replicas:
+            lag = replica.lag(now)
+            if now < replica.down_until:
+                state = "down"
+            elif lag is None:
+                state = "unknown"
+            elif lag > self.max_lag:
+                state = "lagging"
+            else:
+                state = "ok"
+            replicas.append({"target": replica.target, "state": state, "lag_seconds": lag,
+                             "reads": replica.reads, "failures": replica.failures, "error": replica.error})
+        return {"replicas": replicas, "primary_reads": self._primary_reads, "fallbacks": self._fallbacks,
+                "max_lag": self.max_lag, "heartbeat_error": self._heartbeat_error}
+
+
+_router = None
+_router_lock = threading.Lock()
+# Staleness bound of the page being served, for reads that do not pass one
+_read_max_lag = contextvars.ContextVar("ngo_read_max_lag", default=None)
+
+
+def set_read_max_lag(seconds):
+    """Bound replica staleness for the reads made from now on in this context (None: default)."""
+    _read_max_lag.set(seconds)
+
+
+def get_router():
+    """Return the process-wide read router, creating it (and its heartbeat) on first use."""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                replicas = [
+                    Replica(target, ConnectionPool(factory=lambda target=target: get_replica_connection(target),
+                                                   timeout=REPLICA_POOL_TIMEOUT))
+                    for target in DB_REPLICAS
+                ]
+                router = ReadRouter(get_pool(), replicas)
+                get_query_cache().subscribe(router.note_write)
+                _router = router.start()
+    return _router
+
+
+@contextmanager
+def read_connection(tables=(), max_lag=None):
+    """A connection for a report or list read over ``tables``: a fresh replica or the primary.
+
+    ``max_lag`` is the staleness bound in seconds; it defaults to the one set
+    with :func:`set_read_max_lag`, then ``NGO_REPLICA_MAX_LAG``. 0 always reads
+    from the primary.
+    """
+    if max_lag is None:
+        max_lag = _read_max_lag.get()
+    with get_router().connection(tables, max_lag) as conn:
+        yield conn
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect read replicas or refresh a SQLite replica copy.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("replicas", help="show each replica's heartbeat lag")
+    copy = commands.add_parser("copy-sqlite", help="copy the SQLite primary to a replica file")
+    copy.add_argument("path")
+    copy.add_argument("--every", type=float, help="keep copying every this many seconds")
+    args = parser.parse_args()
+
+    if args.command == "replicas":
+        router = ReadRouter(get_pool(), [Replica(target, ConnectionPool(
+            factory=lambda target=target: get_replica_connection(target), timeout=REPLICA_POOL_TIMEOUT))
+            for target in DB_REPLICAS])
+        if not router.replicas:
+            print("ℹ️ No replicas configured (NGO_DB_REPLICAS)")
+        for replica in router.replicas:
+            router._check(replica, time.time())
+            lag = replica.lag()
+            status = f"❌ {replica.error}" if replica.error else f"lag {lag:.1f}s" if lag is not None else "no heartbeat"
+            print(f"{replica.target}: {status}")
+    else:
+        from sqlite_backend import copy_database
+        while True:
+            copy_database(SQLITE_PATH, args.path)
+            print(f"✅ Copied {SQLITE_PATH} to {args.path}")
+            if not args.every:
+                break
+            time.sleep(args.every)
@@ -0,0 +1,185 @@
+"""Streaming export of donation and volunteer history to CSV or Parquet.
+
+Rows are read through an unbuffered cursor in fixed-size batches and written
+out batch by batch, so memory stays flat however many years of donations are
+exported, and the first rows reach the file as soon as the query starts
+returning them. Filters match the Donation History and Volunteer Directory
+pages.
+
+Usage:
+    python export.py donations donations.csv [--start 2024-01-01] [--end 2024-12-31]
+                                             [--resource Books] [--donor smith] [--archive]
+    python export.py volunteers volunteers.parquet [--availability "Available Only"] [--search teach]
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+from repository import donation_filter_clause, donation_source, volunteer_filter_clause
+from schema import primary_key
+
+EXPORT_BATCH_SIZE = int(os.environ.get("NGO_EXPORT_BATCH_SIZE", "5000"))
+# Streamlit holds a download in memory, so exports from the pages stop here;
+# the command line below has no limit
+EXPORT_UI_MAX_ROWS = int(os.environ.get("NGO_EXPORT_UI_MAX_ROWS", "200000"))
+FORMATS = ("csv", "parquet")
+MIME_TYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+def donation_query(start_date=None, end_date=None, resource_type=None, donor_search=None, include_archive=False):
+    columns = "DonationID, DonorName, ResourceType, Quantity, DonationDate"
+    source, params = donation_source(*donation_filter_clause(start_date, end_date, resource_type, donor_search),
+                                     include_archive, columns)
+    return f"SELECT {columns} FROM {source} ORDER BY DonationDate, DonationID", params
+
+
+def volunteer_query(availability_filter="All", search_term=None):
+    where, params = volunteer_filter_clause(availability_filter, search_term)
+    key_column = primary_key("Volunteer")
+    return (f"SELECT {key_column}, Name, Email, Phone, Skills, Availability FROM Volunteer {where} "
+            f"ORDER BY Name, {key_column}", params)
+
+
+QUERIES = {"donations": donation_query, "volunteers": volunteer_query}
+
+
+def _batches(cursor, batch_size):
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+def write_csv(cursor, out, batch_size=EXPORT_BATCH_SIZE, progress=None):
+    """Write the cursor's rows to a text stream; returns the number of rows."""
+    writer = csv.writer(out)
+    writer.writerow([column[0] for column in cursor.description])
+    written = 0
+    for rows in _batches(cursor, batch_size):
+        writer.writerows(rows)
+        written += len(rows)
+        if progress:
+            progress(written)
+    return written
+
+
+def write_parquet(cursor, out, batch_size=EXPORT_BATCH_SIZE, progress=None):
+    """Write the cursor's rows as Parquet row groups; returns the number of rows."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    names = [column[0] for column in cursor.description]
+    schema = None
+    writer = None
+    written = 0
+    try:
+        for rows in _batches(cursor, batch_size):
+            columns = list(zip(*rows))
+            if schema is None:
+                # Types come from the first batch; an all-NULL column is taken to be text
+                fields = []
+                for name, values in zip(names, columns):
+                    field_type = pa.array(values).type
+                    fields.append(pa.field(name, pa.string() if pa.types.is_null(field_type) else field_type))
+                schema = pa.schema(fields)
+                writer = pq.ParquetWriter(out, schema)
+            arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            written += len(rows)
+            if progress:
+                progress(written)
+        if writer is None:
+            pq.write_table(pa.table({name: pa.array([], pa.string()) for name in names}), out)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def export(conn, kind, fmt, out, filters=None, batch_size=EXPORT_BATCH_SIZE, progress=None, max_rows=None):
+    """Stream ``kind`` rows matching ``filters`` into ``out``; returns the row count.
+
+    ``out`` is a text stream for CSV and a path or binary stream for Parquet.
+    ``max_rows`` keeps only the first rows in export order.
+    """
+    if kind not in QUERIES:
+        raise ValueError(f"Unknown export kind: {kind}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    sql, params = QUERIES[kind](**(filters or {}))
+    if max_rows is not None:
+        sql, params = f"{sql} LIMIT %s", list(params) + [max_rows]
+    # A plain cursor is unbuffered in mysql.connector: rows are pulled from the
+    # server as each batch is fetched instead of all at once
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        writer = write_csv if fmt == "csv" else write_parquet
+        return writer(cursor, out, batch_size, progress)
+    finally:
+        cursor.close()
+
+
+def export_to_tempfile(conn, kind, fmt, filters=None, batch_size=EXPORT_BATCH_SIZE, max_rows=None):
+    """Export into an anonymous temporary file and return it rewound, opened in binary mode.
+
+    The caller owns the file and should close it once the bytes are read.
+    """
+    tmp = tempfile.TemporaryFile()
+    if fmt == "csv":
+        out = io.TextIOWrapper(tmp, encoding="utf-8", newline="")
+        export(conn, kind, fmt, out, filters, batch_size, max_rows=max_rows)
+        out.flush()
+        out.detach()
+    else:
+        export(conn, kind, fmt, tmp, filters, batch_size, max_rows=max_rows)
+    tmp.seek(0)
+    return tmp
+
+
+def export_filename(kind, fmt):
+    return f"{kind}_{date.today().isoformat()}.{fmt}"
+
+
+if __name__ == "__main__":
+    from db_config import pooled_connection
+
+    parser = argparse.ArgumentParser(description="Export donations or volunteers to CSV or Parquet.")
+    parser.add_argument("kind", choices=sorted(QUERIES))
+    parser.add_argument("path", help="output file; the format follows the extension (.csv or .parquet)")
+    parser.add_argument("--start", type=date.fromisoformat, help="donations on or after this date")
+    parser.add_argument("--end", type=date.fromisoformat, help="donations on or before this date")
+    parser.add_argument("--resource", help="donations of this resource type")
+    parser.add_argument("--donor", help="donor name contains this text")
+    parser.add_argument("--archive", action="store_true", help="include donations moved to DonationArchive")
+    parser.add_argument("--availability", default="All", choices=["All", "Available Only", "Unavailable Only"])
+    parser.add_argument("--search", help="volunteer name or skills contain this text")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    fmt = os.path.splitext(args.path)[1].lstrip(".").lower()
+    if fmt not in FORMATS:
+        sys.exit(f"❌ Unsupported file type {args.path!r}; use .csv or .parquet")
+    if args.kind == "donations":
+        filters = {"start_date": args.start, "end_date": args.end, "resource_type": args.resource,
+                   "donor_search": args.donor, "include_archive": args.archive}
+    else:
+        filters = {"availability_filter": args.availability, "search_term": args.search}
+
+    def print_progress(rows):
+        print(f"  {rows:,} rows", end="\r", flush=True)
+
+    start = time.perf_counter()
+    with pooled_connection() as conn:
+        if fmt == "csv":
+            with open(args.path, "w", encoding="utf-8", newline="") as out:
+                total = export(conn, args.kind, fmt, out, filters, args.batch_size, print_progress)
+        else:
+            total = export(conn, args.kind, fmt, args.path, filters, args.batch_size, print_progress)
+    print(f"✅ Exported {total:,} {args.kind} to {args.path} in {time.perf_counter() - start:.1f}s")
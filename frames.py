@@ -0,0 +1,130 @@
+"""Compact, column-wise DataFrame construction from query results.
+
+``fetch_frame()`` reads a result set in chunks with ``fetchmany()`` and turns
+each chunk into typed column arrays straight away. The full list of row tuples
+never exists alongside the DataFrame, so peak memory is about one chunk plus
+the final frame. Columns come out in their smallest sensible form:
+
+* integers are downcast to the narrowest type that fits (nullable ``Int*``
+  when NULLs are present);
+* DATE/DATETIME values become native ``datetime64`` columns;
+* strings named in ``categorical``, or with few distinct values, become
+  ``category``;
+* other strings are Arrow-backed when pyarrow is installed and
+  ``NGO_ARROW_FRAMES`` is on (the default), and plain Python objects otherwise.
+"""
+import os
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+FETCH_CHUNK_SIZE = int(os.environ.get("NGO_FETCH_CHUNK_SIZE", "10000"))
+ARROW_FRAMES = os.environ.get("NGO_ARROW_FRAMES", "1") not in ("0", "false", "no")
+# Strings repeating at least this often on average are stored as categories
+CATEGORY_MAX_RATIO = 0.5
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+try:
+    import pyarrow  # noqa: F401
+    HAVE_ARROW = True
+except ImportError:
+    HAVE_ARROW = False
+
+
+def _column_kind(values):
+    sample = next((value for value in values if value is not None), None)
+    if sample is None:
+        return None
+    if isinstance(sample, (bool, np.bool_)):
+        return "int"
+    if isinstance(sample, (int, np.integer)):
+        return "int"
+    if isinstance(sample, (float, Decimal, np.floating)):
+        return "float"
+    if isinstance(sample, datetime):
+        return "datetime"
+    if isinstance(sample, date):
+        return "date"
+    if isinstance(sample, (bytes, bytearray)):
+        return "bytes"
+    return "str"
+
+
+def _convert_chunk(values, kind, categorical):
+    """One chunk of one column as a compact array."""
+    has_null = None in values
+    if kind == "int":
+        if has_null:
+            return pd.array(values, dtype="Int64")
+        return np.fromiter(values, dtype=np.int64, count=len(values))
+    if kind == "float":
+        return np.array([np.nan if value is None else float(value) for value in values], dtype=np.float64)
+    if kind == "datetime":
+        return np.array(values, dtype="datetime64[us]")
+    if kind == "date":
+        if has_null:
+            return np.array(values, dtype="datetime64[s]")
+        # Day ordinals are much cheaper to convert than date objects
+        days = np.fromiter((value.toordinal() for value in values), dtype=np.int64, count=len(values))
+        return (days - _EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[s]")
+    if kind == "bytes":
+        values = [None if value is None else bytes(value).decode() for value in values]
+    if categorical:
+        return pd.Categorical(values)
+    return np.array(values, dtype=object)
+
+
+def _combine(parts):
+    if len(parts) == 1:
+        return parts[0]
+    if all(isinstance(part, pd.Categorical) for part in parts):
+        return union_categoricals(parts)
+    if all(isinstance(part, np.ndarray) for part in parts) and len({part.dtype for part in parts}) == 1:
+        return np.concatenate(parts)
+    # Mixed chunk types (e.g. a chunk that was all NULL); let pandas reconcile them
+    return pd.concat([pd.Series(part) for part in parts], ignore_index=True).array
+
+
+def _finish(column, arrow):
+    """Final downcasting once the whole column is known."""
+    series = pd.Series(column, copy=False)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.remove_unused_categories()
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return pd.to_numeric(series, downcast="integer")
+    if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        non_null = series.count()
+        if non_null and series.nunique(dropna=True) <= non_null * CATEGORY_MAX_RATIO:
+            return series.astype("category")
+        if arrow and HAVE_ARROW:
+            return series.astype("string[pyarrow]")
+    return series
+
+
+def frame_from_cursor(cursor, columns=None, categorical=(), chunk_size=FETCH_CHUNK_SIZE, arrow=ARROW_FRAMES):
+    """Build a compact DataFrame from an executed cursor's remaining rows.
+
+    ``columns`` renames the result columns (default: the cursor's own names);
+    ``categorical`` lists columns to build as categories chunk by chunk.
+    """
+    names = list(columns) if columns is not None else [d[0] for d in cursor.description]
+    categorical = set(categorical)
+    parts = [[] for _ in names]
+    kinds = [None] * len(names)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for index, values in enumerate(zip(*rows)):
+            if kinds[index] is None:
+                kinds[index] = _column_kind(values)
+            parts[index].append(_convert_chunk(values, kinds[index], names[index] in categorical))
+        del rows
+    if not parts or not parts[0]:
+        return pd.DataFrame({name: pd.Series(dtype=object) for name in names})
+    return pd.DataFrame({name: _finish(_combine(column_parts), arrow)
+                         for name, column_parts in zip(names, parts)})
@@ -0,0 +1,406 @@
+"""Write-behind ingestion queue for donations.
+
+A donation is appended to a local journal (JSON lines under
+``NGO_INGEST_DIR``) and acknowledged straight away. A background worker
+drains the journal into the database in batches. Each batch is one
+transaction: a multi-row Donation insert plus one inventory upsert and one
+rollup delta per resource type. A busy drive therefore pays for one commit
+per batch rather than one per donation.
+
+Every record carries an idempotency key, stored with its Donation row
+(migration 0010). The worker checkpoints its journal position after each
+commit. After a crash it replays from the last checkpoint and skips keys
+already in the table, so nothing is lost or counted twice.
+
+``NGO_INGEST_SYNC`` decides when an append is on disk:
+
+* ``interval`` (default): the append is a plain ``write()``, and the worker
+  fsyncs the journal every ``NGO_INGEST_SYNC_MS`` milliseconds. An app crash
+  loses nothing; a power cut can lose the last interval.
+* ``always``: every append is fsynced before it returns.
+
+At most ``NGO_INGEST_MAX_PENDING`` records wait at a time. Past that,
+``append()`` raises ``QueueFull`` and the caller writes synchronously, which
+keeps the lag bounded. One process owns the journal at a time (an exclusive
+lock on ``journal.lock``); in any other process ``get_ingest_queue()``
+returns None.
+
+Usage:
+    python ingest.py status     # pending records, lag and checkpoint
+    python ingest.py drain      # apply everything in the journal and exit
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import date
+from itertools import islice
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import repository
+from db_config import get_pool
+from instrumentation import start_page
+from query_cache import get_query_cache
+
+INGEST_DIR = os.environ.get("NGO_INGEST_DIR", "ingest_journal")
+INGEST_SYNC = os.environ.get("NGO_INGEST_SYNC", "interval")
+SYNC_INTERVAL = float(os.environ.get("NGO_INGEST_SYNC_MS", "20")) / 1000
+BATCH_SIZE = int(os.environ.get("NGO_INGEST_BATCH", "500"))
+MAX_PENDING = int(os.environ.get("NGO_INGEST_MAX_PENDING", "100000"))
+SEGMENT_BYTES = int(os.environ.get("NGO_INGEST_SEGMENT_BYTES", str(16 * 1024 * 1024)))
+QUEUE_ENABLED = os.environ.get("NGO_DONATION_QUEUE", "1") not in ("0", "false", "no")
+MAX_RETRY_SECONDS = 30.0
+
+log = logging.getLogger("ngo.ingest")
+
+
+class QueueFull(Exception):
+    """Raised when the backlog is at ``MAX_PENDING``; write synchronously instead."""
+
+
+class JournalBusy(Exception):
+    """Raised when another process owns the journal directory."""
+
+
+def _lock_exclusive(file):
+    try:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        raise JournalBusy(f"{file.name} is locked by another process")
+
+
+def _segment_name(number):
+    return f"{number:08d}.log"
+
+
+class Entry:
+    __slots__ = ("row", "appended_at", "segment", "offset")
+
+    def __init__(self, row, appended_at, segment, offset):
+        self.row = row                  # (key, donor, resource, quantity, date)
+        self.appended_at = appended_at
+        self.segment = segment          # journal position just past this record
+        self.offset = offset
+
+
+def _validate(donor_name, resource_type, quantity, donation_date):
+    # The worker cannot ask anyone to fix a bad record, so reject it up front
+    if not isinstance(donor_name, str) or not donor_name.strip() or len(donor_name) > 100:
+        raise ValueError("Donor name must be 1-100 characters")
+    if not isinstance(resource_type, str) or not resource_type.strip() or len(resource_type) > 50:
+        raise ValueError("Resource type must be 1-50 characters")
+    if isinstance(quantity, bool) or int(quantity) != quantity or quantity < 1:
+        raise ValueError("Quantity must be a positive whole number")
+    if donation_date > date.today():
+        raise ValueError("Donation date is in the future")
+
+
+class IngestQueue:
+    def __init__(self, directory=INGEST_DIR, sync=INGEST_SYNC, batch_size=BATCH_SIZE,
+                 max_pending=MAX_PENDING, segment_bytes=SEGMENT_BYTES, start_worker=True):
+        if sync not in ("interval", "always"):
+            raise ValueError(f"NGO_INGEST_SYNC must be 'interval' or 'always', not {sync!r}")
+        self.directory = directory
+        self.sync = sync
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.segment_bytes = segment_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = open(os.path.join(directory, "journal.lock"), "a+")
+        try:
+            _lock_exclusive(self._lock_file)
+        except JournalBusy:
+            self._lock_file.close()
+            raise
+
+        self._lock = threading.Lock()
+        self._drained = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._pending = deque()
+        self._dirty = False
+        self.appended = 0
+        self.ingested = 0
+        self.duplicates = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.last_batch_ms = 0.0
+        self.last_error = None
+
+        self._checkpoint = self._read_checkpoint()
+        self._replay()
+        self._remove_empty_segments()
+        # Appends always start a fresh segment, so a torn final line left by
+        # a crash is never followed by new records. It is only created by the
+        # first append, so a process that never appends (``ingest.py status``,
+        # an idle app) leaves no empty segment behind
+        existing = self._segments()
+        self._segment = (existing[-1] if existing else self._checkpoint[0]) + 1
+        self._fd = None
+        self._offset = 0
+        self._worker = threading.Thread(target=self._run, name="ngo-ingest", daemon=True)
+        if start_worker:
+            self._worker.start()
+
+    # Journal files
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _segments(self):
+        return sorted(int(name[:-4]) for name in os.listdir(self.directory)
+                      if name.endswith(".log") and name[:-4].isdigit())
+
+    def _read_checkpoint(self):
+        try:
+            with open(self._path("checkpoint.json")) as f:
+                data = json.load(f)
+            return data["segment"], data["offset"]
+        except FileNotFoundError:
+            return 0, 0
+
+    def _write_checkpoint(self, segment, offset):
+        tmp = self._path("checkpoint.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"segment": segment, "offset": offset}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._path("checkpoint.json"))
+        self._checkpoint = (segment, offset)
+
+    def _replay(self):
+        """Queue every complete record after the checkpoint."""
+        done_segment, done_offset = self._checkpoint
+        for segment in self._segments():
+            if segment < done_segment:
+                continue
+            with open(self._path(_segment_name(segment)), "rb") as f:
+                offset = done_offset if segment == done_segment else 0
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        log.warning("ignoring torn record at the end of %s", _segment_name(segment))
+                        break
+                    offset += len(line)
+                    record = json.loads(line)
+                    self._pending.append(Entry(
+                        (record["key"], record["donor"], record["resource"], record["quantity"],
+                         date.fromisoformat(record["date"])),
+                        record["at"], segment, offset))
+        if self._pending:
+            log.info("replaying %d journaled donations", len(self._pending))
+
+    def _open_segment(self):
+        self._fd = os.open(self._path(_segment_name(self._segment)), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._offset = 0
+
+    def _remove_empty_segments(self):
+        # Left by earlier runs that opened a segment and appended nothing
+        for segment in self._segments():
+            path = self._path(_segment_name(segment))
+            if segment != self._checkpoint[0] and os.path.getsize(path) == 0:
+                os.remove(path)
+
+    def _remove_drained_segments(self):
+        for segment in self._segments():
+            if segment < self._checkpoint[0] and segment != self._segment:
+                try:
+                    os.remove(self._path(_segment_name(segment)))
+                except FileNotFoundError:
+                    pass
+
+    # Producer side
+
+    def append(self, donor_name, resource_type, quantity, donation_date=None, key=None):
+        """Journal one donation and return its idempotency key.
+
+        Pass ``key`` to make a retried submission a no-op (e.g. a client's
+        own request ID).
+        """
+        donation_date = donation_date or date.today()
+        _validate(donor_name, resource_type, quantity, donation_date)
+        key = key or uuid.uuid4().hex
+        now = time.time()
+        line = (json.dumps({"key": key, "donor": donor_name.strip(), "resource": resource_type.strip(),
+                            "quantity": int(quantity), "date": donation_date.isoformat(), "at": now},
+                           separators=(",", ":")) + "\n").encode()
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                raise QueueFull(f"{len(self._pending)} donations already waiting")
+            if self._fd is None:
+                self._open_segment()
+            elif self._offset >= self.segment_bytes:
+                os.fsync(self._fd)
+                os.close(self._fd)
+                self._segment += 1
+                self._open_segment()
+            # One write() per record, so only a power cut can tear a line
+            os.write(self._fd, line)
+            self._offset += len(line)
+            if self.sync == "always":
+                os.fsync(self._fd)
+            else:
+                self._dirty = True
+            self._pending.append(Entry((key, donor_name.strip(), resource_type.strip(), int(quantity),
+                                        donation_date), now, self._segment, self._offset))
+            self.appended += 1
+        self._wake.set()
+        return key
+
+    # Worker side
+
+    def _fsync(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            # A duplicate stays valid even if an append rotates the segment meanwhile
+            fd = os.dup(self._fd)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _apply(self, batch):
+        timer = start_page("ingest worker")
+        try:
+            with get_pool().connection() as conn:
+                return repository.add_queued_donations(conn, [entry.row for entry in batch])
+        finally:
+            timer.finish()
+
+    def _drain_once(self):
+        """Apply one batch; returns False when there was nothing to do."""
+        with self._lock:
+            batch = list(islice(self._pending, self.batch_size))
+        if not batch:
+            return False
+        start = time.perf_counter()
+        inserted, duplicates = self._apply(batch)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._write_checkpoint(batch[-1].segment, batch[-1].offset)
+        get_query_cache().invalidate(*repository.DONATION_TABLES)
+        with self._lock:
+            for _ in batch:
+                self._pending.popleft()
+            self.ingested += inserted
+            self.duplicates += duplicates
+            self.batches += 1
+            self.last_batch_size = len(batch)
+            self.last_batch_ms = elapsed_ms
+            self.last_error = None
+            self._drained.notify_all()
+        self._remove_drained_segments()
+        return True
+
+    def _run(self):
+        retry = 1.0
+        while not self._stop.is_set():
+            self._wake.wait(SYNC_INTERVAL)
+            self._wake.clear()
+            try:
+                self._fsync()
+                # Records that arrive while a batch commits form the next batch
+                while self._drain_once():
+                    pass
+                retry = 1.0
+            except Exception as e:
+                # The records stay queued and journaled; try again later
+                log.exception("ingest batch failed; retrying in %.0fs", retry)
+                with self._lock:
+                    self.last_error = str(e)
+                self._stop.wait(retry)
+                retry = min(retry * 2, MAX_RETRY_SECONDS)
+
+    def flush(self, timeout=None):
+        """Wait until everything appended so far is in the database; returns True if it is."""
+        self._wake.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._drained.wait(remaining)
+        return True
+
+    def close(self, timeout=10):
+        if self._worker.is_alive():
+            self.flush(timeout)
+            self._stop.set()
+            self._wake.set()
+            self._worker.join(timeout)
+        if self._fd is not None:
+            os.fsync(self._fd)
+            os.close(self._fd)
+        self._lock_file.close()
+
+    def stats(self):
+        with self._lock:
+            oldest = self._pending[0].appended_at if self._pending else None
+            return {
+                "pending": len(self._pending),
+                "max_pending": self.max_pending,
+                "lag_seconds": (time.time() - oldest) if oldest is not None else 0.0,
+                "appended": self.appended,
+                "ingested": self.ingested,
+                "duplicates": self.duplicates,
+                "batches": self.batches,
+                "last_batch_size": self.last_batch_size,
+                "last_batch_ms": round(self.last_batch_ms, 2),
+                "last_error": self.last_error,
+                "sync": self.sync,
+                "segment": self._segment,
+                "checkpoint": self._checkpoint,
+            }
+
+
+_queue = None
+_queue_checked = False
+_queue_lock = threading.Lock()
+
+
+def get_ingest_queue():
+    """Return the process-wide queue, or None if it is disabled or owned by another process."""
+    global _queue, _queue_checked
+    if not _queue_checked:
+        with _queue_lock:
+            if not _queue_checked:
+                if QUEUE_ENABLED:
+                    try:
+                        _queue = IngestQueue()
+                    except JournalBusy as e:
+                        log.info("donation queue unavailable in this process: %s", e)
+                _queue_checked = True
+    return _queue
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+    if command not in ("status", "drain"):
+        sys.exit("Usage: python ingest.py [status|drain]")
+    # status only replays the journal; no segment is opened without an append
+    try:
+        queue = IngestQueue(start_worker=command == "drain")
+    except JournalBusy as e:
+        sys.exit(f"❌ {e}; the app is draining this journal")
+    if command == "drain":
+        queue.flush()
+    stats = queue.stats()
+    queue.close()
+    print(f"{'✅' if not stats['pending'] else '⏳'} {stats['pending']} pending, "
+          f"{stats['ingested']} ingested in {stats['batches']} batches, "
+          f"{stats['duplicates']} duplicates skipped; checkpoint {stats['checkpoint']}")
@@ -0,0 +1,354 @@
+"""Query and page latency instrumentation.
+
+Every pooled connection is wrapped by :func:`instrument_connection`, so each
+statement executed on it is timed from ``execute`` until its rows have been
+fetched and recorded under its SQL fingerprint (literals and ``IN`` lists
+collapsed), together with the rows returned and the page that issued it.
+``app.py`` also times each page branch end to end, covering queries,
+DataFrame building and chart rendering.
+
+Durations are kept in rolling windows of the most recent samples for
+percentiles, alongside lifetime counts and sums. Statements slower than
+``NGO_SLOW_QUERY_MS`` are written to the ``ngo.slow_queries`` logger and kept
+in a short list for the Admin page. ``snapshot()`` and ``prometheus()`` export
+everything as JSON-ready data or Prometheus text.
+"""
+import contextvars
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+SLOW_QUERY_MS = float(os.environ.get("NGO_SLOW_QUERY_MS", "250"))
+# Samples kept per query fingerprint / page for percentiles
+WINDOW = int(os.environ.get("NGO_METRICS_WINDOW", "1000"))
+MAX_FINGERPRINTS = 500
+SLOW_LOG_SIZE = 100
+
+slow_log = logging.getLogger("ngo.slow_queries")
+
+_current_page = contextvars.ContextVar("ngo_page", default="-")
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%s|\?")
+_LIST_RE = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_ROW_LIST_RE = re.compile(r"\((?:\s*\(\.\.\.\)\s*,)+\s*\(\.\.\.\)\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """Normalise a statement so calls differing only in values group together."""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _PLACEHOLDER_RE.sub("?", sql)
+    sql = _LIST_RE.sub("(...)", sql)
+    sql = _ROW_LIST_RE.sub("(...)", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+class RollingStats:
+    """Lifetime count/sum/max plus a window of recent samples for percentiles."""
+
+    def __init__(self, window=WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentiles(self, *qs):
+        if not self.samples:
+            return [0.0] * len(qs)
+        # Only reports need NumPy; the statement hooks run on every page
+        import numpy as np
+        return [float(value) for value in np.percentile(np.fromiter(self.samples, float), qs)]
+
+
+class QueryStats:
+    def __init__(self):
+        self.latency = RollingStats()
+        self.rows = 0
+        self.pages = set()
+
+
+class PageStats:
+    def __init__(self):
+        self.latency = RollingStats()
+        self.db_ms = 0.0
+        self.queries = 0
+
+
+class Instrumentation:
+    def __init__(self, slow_query_ms=SLOW_QUERY_MS):
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._queries = {}
+            self._pages = {}
+            self._slow = deque(maxlen=SLOW_LOG_SIZE)
+            self._started = time.time()
+
+    def record_query(self, sql, duration_ms, rows, page=None):
+        page = page or _current_page.get()
+        key = fingerprint(sql)
+        with self._lock:
+            stats = self._queries.get(key)
+            if stats is None:
+                # Unbounded dynamic SQL must not grow the table forever
+                if len(self._queries) >= MAX_FINGERPRINTS:
+                    key = "<other>"
+                    stats = self._queries.get(key)
+                if stats is None:
+                    stats = self._queries[key] = QueryStats()
+            stats.latency.add(duration_ms)
+            stats.rows += rows
+            stats.pages.add(page)
+            page_stats = self._pages.get(page)
+            if page_stats is None:
+                page_stats = self._pages[page] = PageStats()
+            page_stats.db_ms += duration_ms
+            page_stats.queries += 1
+            if duration_ms >= self.slow_query_ms:
+                self._slow.append({"time": time.time(), "page": page, "duration_ms": round(duration_ms, 2),
+                                   "rows": rows, "fingerprint": key})
+        if duration_ms >= self.slow_query_ms:
+            slow_log.warning("slow query %.1f ms (%d rows) on %s: %s", duration_ms, rows, page, key)
+
+    def record_page(self, page, duration_ms):
+        with self._lock:
+            stats = self._pages.get(page)
+            if stats is None:
+                stats = self._pages[page] = PageStats()
+            stats.latency.add(duration_ms)
+
+    def top_queries(self, limit=20):
+        """Query rows sorted by total time spent, the costliest first."""
+        with self._lock:
+            items = list(self._queries.items())
+            result = []
+            for key, stats in items:
+                p50, p95 = stats.latency.percentiles(50, 95)
+                result.append({
+                    "fingerprint": key,
+                    "calls": stats.latency.count,
+                    "total_ms": round(stats.latency.total, 2),
+                    "avg_ms": round(stats.latency.total / stats.latency.count, 2),
+                    "p50_ms": round(p50, 2),
+                    "p95_ms": round(p95, 2),
+                    "max_ms": round(stats.latency.max, 2),
+                    "rows": stats.rows,
+                    "pages": sorted(stats.pages),
+                })
+        result.sort(key=lambda row: row["total_ms"], reverse=True)
+        return result[:limit] if limit else result
+
+    def page_latency(self):
+        with self._lock:
+            result = []
+            for page, stats in sorted(self._pages.items()):
+                if not stats.latency.count:
+                    continue
+                p50, p95 = stats.latency.percentiles(50, 95)
+                result.append({
+                    "page": page,
+                    "runs": stats.latency.count,
+                    "p50_ms": round(p50, 2),
+                    "p95_ms": round(p95, 2),
+                    "max_ms": round(stats.latency.max, 2),
+                    "avg_ms": round(stats.latency.total / stats.latency.count, 2),
+                    # Everything not spent in SQL is DataFrame building and rendering
+                    "avg_db_ms": round(stats.db_ms / stats.latency.count, 2),
+                    "queries_per_run": round(stats.queries / stats.latency.count, 2),
+                })
+        return result
+
+    def slow_queries(self):
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def snapshot(self):
+        return {
+            "since": self._started,
+            "slow_query_ms": self.slow_query_ms,
+            "pages": self.page_latency(),
+            "queries": self.top_queries(limit=None),
+            "slow_queries": self.slow_queries(),
+        }
+
+    def prometheus(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP ngo_page_render_seconds End-to-end time of one page run.",
+            "# TYPE ngo_page_render_seconds summary",
+        ]
+        # Percentiles are read under the lock; the sample windows keep changing
+        with self._lock:
+            pages = [(page, stats.latency.percentiles(50, 95), stats.latency.total, stats.latency.count)
+                     for page, stats in sorted(self._pages.items()) if stats.latency.count]
+            queries = [(key, stats.latency.percentiles(50, 95), stats.latency.total, stats.latency.count,
+                        stats.rows) for key, stats in self._queries.items()]
+        for page, quantiles, total, count in pages:
+            label = f'page="{_escape(page)}"'
+            for q, value in zip((0.5, 0.95), quantiles):
+                lines.append(f'ngo_page_render_seconds{{{label},quantile="{q}"}} {value / 1000:.6f}')
+            lines.append(f"ngo_page_render_seconds_sum{{{label}}} {total / 1000:.6f}")
+            lines.append(f"ngo_page_render_seconds_count{{{label}}} {count}")
+        lines += [
+            "# HELP ngo_query_seconds Time spent executing and fetching one statement.",
+            "# TYPE ngo_query_seconds summary",
+        ]
+        for key, quantiles, total, count, _ in queries:
+            label = f'query="{_escape(key)}"'
+            for q, value in zip((0.5, 0.95), quantiles):
+                lines.append(f'ngo_query_seconds{{{label},quantile="{q}"}} {value / 1000:.6f}')
+            lines.append(f"ngo_query_seconds_sum{{{label}}} {total / 1000:.6f}")
+            lines.append(f"ngo_query_seconds_count{{{label}}} {count}")
+        lines += [
+            "# HELP ngo_query_rows_total Rows returned per statement fingerprint.",
+            "# TYPE ngo_query_rows_total counter",
+        ]
+        for key, _, _, _, rows in queries:
+            lines.append(f'ngo_query_rows_total{{query="{_escape(key)}"}} {rows}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+_instrumentation = None
+_instrumentation_lock = threading.Lock()
+
+
+def get_instrumentation():
+    """Return the process-wide metrics registry, creating it on first use."""
+    global _instrumentation
+    if _instrumentation is None:
+        with _instrumentation_lock:
+            if _instrumentation is None:
+                _instrumentation = Instrumentation()
+    return _instrumentation
+
+
+class PageTimer:
+    def __init__(self, page):
+        self.page = page
+        self._token = _current_page.set(page)
+        self._start = time.perf_counter()
+
+    def finish(self):
+        get_instrumentation().record_page(self.page, (time.perf_counter() - self._start) * 1000)
+        _current_page.reset(self._token)
+
+
+def start_page(page):
+    """Attribute queries to ``page`` and start timing it; call ``finish()`` at the end.
+
+    Runs cut short by ``st.rerun()`` or ``st.stop()`` are not recorded.
+    """
+    return PageTimer(page)
+
+
+def current_page():
+    return _current_page.get()
+
+
+class InstrumentedCursor:
+    """Times each statement from execute until its rows are fetched."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._sql = None
+        self._elapsed = 0.0
+        self._rows = 0
+
+    def _flush(self):
+        if self._sql is not None:
+            get_instrumentation().record_query(self._sql, self._elapsed * 1000, self._rows)
+            self._sql = None
+
+    def _timed(self, sql, method, *args):
+        self._flush()
+        start = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            self._sql = sql
+            self._elapsed = time.perf_counter() - start
+            self._rows = 0
+
+    def execute(self, sql, params=()):
+        return self._timed(sql, self._cursor.execute, params)
+
+    def executemany(self, sql, seq_params):
+        return self._timed(sql, self._cursor.executemany, seq_params)
+
+    def _fetch(self, method, *args):
+        start = time.perf_counter()
+        result = method(*args)
+        self._elapsed += time.perf_counter() - start
+        return result
+
+    def fetchone(self):
+        row = self._fetch(self._cursor.fetchone)
+        if row is not None:
+            self._rows += 1
+        else:
+            self._flush()
+        return row
+
+    def fetchall(self):
+        rows = self._fetch(self._cursor.fetchall)
+        self._rows += len(rows)
+        self._flush()
+        return rows
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._fetch(self._cursor.fetchmany, *args, **kwargs)
+        self._rows += len(rows)
+        if not rows:
+            self._flush()
+        return rows
+
+    def close(self):
+        self._flush()
+        self._cursor.close()
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs))
+
+    def commit(self):
+        start = time.perf_counter()
+        self._conn.commit()
+        get_instrumentation().record_query("COMMIT", (time.perf_counter() - start) * 1000, 0)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def instrument_connection(conn):
+    return InstrumentedConnection(conn)
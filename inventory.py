@@ -0,0 +1,76 @@
+"""Inventory stock updates shared by the donation and disbursement write paths.
+
+Each item has a ``ReorderLevel`` and an ``IsLowStock`` flag (migration 0008).
+Every stock change ends with :func:`refresh_low_stock` for the items it
+touched. The flag is rewritten, and a ``StockAlert`` row added, only when an
+item actually crosses its level, so an alert fires once per crossing.
+"""
+
+
+def add_inventory_deltas(cursor, deltas):
+    """Add ``{item_name: quantity}`` to Inventory, creating missing items.
+
+    Relies on the unique key on ``ItemName`` (migration 0005): every item is an
+    atomic upsert, and the whole batch is a single multi-row statement, so
+    concurrent donors of a new item can neither race nor duplicate it. Items
+    are written in name order so concurrent batches lock rows in the same
+    order and cannot deadlock each other.
+    """
+    if not deltas:
+        return
+    cursor.executemany("""
+        INSERT INTO Inventory (ItemName, QuantityAvailable)
+        VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE QuantityAvailable = QuantityAvailable + VALUES(QuantityAvailable)
+    """, [(item_name, int(quantity)) for item_name, quantity in sorted(deltas.items())])
+    refresh_low_stock(cursor, deltas)
+
+
+class InsufficientStock(Exception):
+    """Raised when a disbursement asks for more than is in stock."""
+
+
+def remove_inventory(cursor, item_name, quantity):
+    """Take ``quantity`` of an item out of stock, refusing to go below zero."""
+    cursor.execute("""
+        UPDATE Inventory SET QuantityAvailable = QuantityAvailable - %s
+        WHERE ItemName = %s AND QuantityAvailable >= %s
+    """, (int(quantity), item_name, int(quantity)))
+    if cursor.rowcount != 1:
+        raise InsufficientStock(f"Not enough {item_name} in stock to disburse {quantity}")
+    refresh_low_stock(cursor, [item_name])
+
+
+def set_reorder_level(cursor, item_name, level):
+    cursor.execute("UPDATE Inventory SET ReorderLevel = %s WHERE ItemName = %s", (int(level), item_name))
+    refresh_low_stock(cursor, [item_name])
+
+
+def refresh_low_stock(cursor, item_names):
+    """Flip ``IsLowStock`` and record an alert for items that crossed their level.
+
+    Two statements however many items are passed. Both match only rows whose
+    flag disagrees with their stock, so an item that stays on the same side
+    of its level is never rewritten.
+    """
+    item_names = sorted(item_names)
+    if not item_names:
+        return
+    placeholders = ", ".join(["%s"] * len(item_names))
+    crossed = "IsLowStock <> (CASE WHEN QuantityAvailable < ReorderLevel THEN 1 ELSE 0 END)"
+    cursor.execute(f"""
+        INSERT INTO StockAlert (ItemID, ItemName, AlertType, QuantityAvailable, ReorderLevel)
+        SELECT ItemID, ItemName, CASE WHEN QuantityAvailable < ReorderLevel THEN 'low' ELSE 'restocked' END,
+               QuantityAvailable, ReorderLevel
+        FROM Inventory
+        WHERE ItemName IN ({placeholders}) AND {crossed}
+    """, item_names)
+    cursor.execute(f"""
+        UPDATE Inventory SET IsLowStock = CASE WHEN QuantityAvailable < ReorderLevel THEN 1 ELSE 0 END
+        WHERE ItemName IN ({placeholders}) AND {crossed}
+    """, item_names)
+
+
+def rebuild_low_stock(cursor):
+    """Recompute every item's flag without raising alerts (bulk loads, repairs)."""
+    cursor.execute("UPDATE Inventory SET IsLowStock = CASE WHEN QuantityAvailable < ReorderLevel THEN 1 ELSE 0 END")
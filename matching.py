@@ -0,0 +1,272 @@
+"""Volunteer-to-event matching.
+
+Candidates for an event are scored over every volunteer at once with NumPy:
+
+* skill overlap: the share of the event's required skill tokens a volunteer
+  has, counted from an in-memory inverted index (token -> volunteer positions)
+  built from the ``VolunteerSkill`` table;
+* experience: events attended in the past, log-scaled;
+* current load: assignments to other events within ``NGO_MATCH_LOAD_DAYS``
+  of the event's date, which counts against a volunteer.
+
+Only available volunteers are ranked, and anyone already on the event or on
+another event the same day is left out. The skill index and the participation
+arrays are shared by every session through the query cache and rebuilt only
+after a write to the tables they come from, so ranking one event costs a few
+array operations over its tokens' posting lists plus a top-k partition.
+"""
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from db_config import read_connection
+from query_cache import get_query_cache
+from skill_search import tokenize_skills
+
+LOAD_DAYS = int(os.environ.get("NGO_MATCH_LOAD_DAYS", "7"))
+SKILL_WEIGHT = 1.0
+EXPERIENCE_WEIGHT = 0.3
+LOAD_WEIGHT = 0.5
+# Assignments in the load window beyond this many count no further
+LOAD_CAP = 3
+FETCH_BATCH = 10000
+
+SKILL_TABLES = ("Volunteer", "VolunteerSkill")
+PARTICIPATION_TABLES = ("Event", "Participation")
+
+
+def _day(value):
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return value.toordinal()
+
+
+def _batches(cursor):
+    while True:
+        rows = cursor.fetchmany(FETCH_BATCH)
+        if not rows:
+            return
+        yield rows
+
+
+class SkillIndex:
+    """Volunteer IDs in ascending order, their availability, and token posting lists."""
+
+    def __init__(self, volunteer_ids, available, postings):
+        self.volunteer_ids = volunteer_ids
+        self.available = available
+        self.postings = postings
+
+    def __len__(self):
+        return len(self.volunteer_ids)
+
+    @classmethod
+    def load(cls, cursor):
+        cursor.execute("SELECT VolunteerID, Availability FROM Volunteer ORDER BY VolunteerID")
+        ids, available = [], []
+        for rows in _batches(cursor):
+            ids.extend(row[0] for row in rows)
+            available.extend(bool(row[1]) for row in rows)
+        volunteer_ids = np.array(ids, dtype=np.int64)
+
+        cursor.execute("SELECT Token, VolunteerID FROM VolunteerSkill ORDER BY Token, VolunteerID")
+        tokens, members = [], []
+        for rows in _batches(cursor):
+            tokens.extend(row[0] for row in rows)
+            members.extend(row[1] for row in rows)
+        positions = np.searchsorted(volunteer_ids, np.array(members, dtype=np.int64)).astype(np.int32)
+        postings = {}
+        start = 0
+        for end in range(1, len(tokens) + 1):
+            if end == len(tokens) or tokens[end] != tokens[start]:
+                postings[tokens[start]] = positions[start:end]
+                start = end
+        return cls(volunteer_ids, np.array(available, dtype=bool), postings)
+
+    def locate(self, volunteer_ids):
+        """Index positions of the ``volunteer_ids`` the index knows, plus the mask of those."""
+        volunteer_ids = np.asarray(volunteer_ids, dtype=np.int64)
+        positions = np.searchsorted(self.volunteer_ids, volunteer_ids)
+        known = positions < len(self.volunteer_ids)
+        known[known] = self.volunteer_ids[positions[known]] == volunteer_ids[known]
+        return positions[known], known
+
+    def overlap(self, tokens):
+        """How many of ``tokens`` each volunteer has."""
+        counts = np.zeros(len(self.volunteer_ids), dtype=np.int16)
+        for token in tokens:
+            positions = self.postings.get(token)
+            if positions is not None:
+                # A volunteer appears at most once per token, so plain fancy indexing is safe
+                counts[positions] += 1
+        return counts
+
+
+class ParticipationIndex:
+    """Past attendance per volunteer and every assignment to a current event."""
+
+    def __init__(self, today, history_ids, history_counts, volunteer_ids, event_ids, days):
+        self.today = today
+        self.history_ids = history_ids
+        self.history_counts = history_counts
+        # Assignments from LOAD_DAYS before today onwards, sorted by event day
+        self.volunteer_ids = volunteer_ids
+        self.event_ids = event_ids
+        self.days = days
+
+    @classmethod
+    def load(cls, cursor, today):
+        cursor.execute("""
+            SELECT p.VolunteerID, COUNT(*)
+            FROM Participation p
+            JOIN Event e ON e.EventID = p.EventID
+            WHERE e.EventDate < %s
+            GROUP BY p.VolunteerID
+        """, (today,))
+        history = cursor.fetchall()
+        cursor.execute("""
+            SELECT p.VolunteerID, p.EventID, e.EventDate
+            FROM Participation p
+            JOIN Event e ON e.EventID = p.EventID
+            WHERE e.EventDate >= %s
+        """, (date.fromordinal(today.toordinal() - LOAD_DAYS),))
+        current = cursor.fetchall()
+        days = np.array([_day(row[2]) for row in current], dtype=np.int32)
+        order = np.argsort(days, kind="stable")
+        return cls(
+            today,
+            np.array([row[0] for row in history], dtype=np.int64),
+            np.array([row[1] for row in history], dtype=np.int32),
+            np.array([row[0] for row in current], dtype=np.int64)[order],
+            np.array([row[1] for row in current], dtype=np.int64)[order],
+            days[order],
+        )
+
+
+class Matcher:
+    def __init__(self, skills, participation):
+        self.skills = skills
+        n = len(skills)
+        history_positions, known = skills.locate(participation.history_ids)
+        self.past = np.zeros(n, dtype=np.int32)
+        self.past[history_positions] = participation.history_counts[known]
+        self._experience = np.log1p(self.past) / max(np.log1p(self.past.max(initial=0)), 1.0)
+        # Current assignments keyed by index position rather than VolunteerID,
+        # still sorted by day so an event's load window is one slice
+        positions, known = skills.locate(participation.volunteer_ids)
+        self._positions = positions
+        self._event_ids = participation.event_ids[known]
+        self._days = participation.days[known]
+
+    def _score(self, tokens, event_day, event_id, extra_load=(), extra_blocked=()):
+        """Eligible index positions for an event with their score, overlap and load.
+
+        ``extra_load`` and ``extra_blocked`` are positions of picks not yet in
+        the database: load from nearby events and blocks from the same day.
+        """
+        skills = self.skills
+        n = len(skills)
+        eligible = skills.available.copy()
+        if tokens:
+            overlap = skills.overlap(tokens)
+            eligible &= overlap > 0
+
+        lo = np.searchsorted(self._days, event_day - LOAD_DAYS, side="left")
+        hi = np.searchsorted(self._days, event_day + LOAD_DAYS, side="right")
+        nearby = self._positions[lo:hi]
+        nearby_events = self._event_ids[lo:hi]
+        # Already on this event, or committed elsewhere that day
+        eligible[nearby[(nearby_events == event_id) | (self._days[lo:hi] == event_day)]] = False
+        eligible[np.asarray(extra_blocked, dtype=np.intp)] = False
+        candidates = np.flatnonzero(eligible)
+
+        load = np.bincount(np.concatenate([nearby[nearby_events != event_id],
+                                           np.asarray(extra_load, dtype=np.intp)]), minlength=n)[candidates]
+        overlap = overlap[candidates] if tokens else np.zeros(len(candidates), dtype=np.int16)
+        skill_score = overlap / len(tokens) if tokens else 0.0
+        # Score only the candidates, not every volunteer
+        score = (SKILL_WEIGHT * skill_score + EXPERIENCE_WEIGHT * self._experience[candidates]
+                 - LOAD_WEIGHT * np.minimum(load, LOAD_CAP) / LOAD_CAP)
+        return candidates, score, overlap, load
+
+    def _top(self, candidates, score, limit):
+        """Positions within ``candidates`` of the best ``limit``, best first."""
+        order = np.arange(len(candidates))
+        if limit and len(candidates) > limit:
+            order = np.argpartition(-score, limit - 1)[:limit]
+        # Ties go to the lower volunteer ID so results are stable
+        return order[np.lexsort((self.skills.volunteer_ids[candidates[order]], -score[order]))]
+
+    def rank(self, required_skills, event_date, event_id=None, limit=20):
+        """Best candidates for an event as a DataFrame, best first.
+
+        Columns: VolunteerID, Score, SkillsMatched, PastEvents, NearbyAssignments.
+        """
+        tokens = tokenize_skills(required_skills)
+        candidates, score, overlap, load = self._score(tokens, _day(event_date), event_id)
+        top = self._top(candidates, score, limit)
+        positions = candidates[top]
+        return pd.DataFrame({
+            "VolunteerID": self.skills.volunteer_ids[positions],
+            "Score": np.round(score[top], 3),
+            "SkillsMatched": overlap[top],
+            "PastEvents": self.past[positions],
+            "NearbyAssignments": load[top],
+        })
+
+    def plan(self, events):
+        """Greedy staffing for several events at once.
+
+        ``events`` holds ``(event_id, required_skills, event_date, open_slots)``
+        and is staffed in date order. Each pick counts as load for the other
+        events within ``LOAD_DAYS`` and blocks that volunteer for the rest of
+        the day, so the same people are not offered to every event. Returns
+        ``[(event_id, volunteer_id), ...]`` ready for one batch insert.
+        """
+        picks = []
+        assignments = []
+        for event_id, required_skills, event_date, open_slots in sorted(events, key=lambda e: _day(e[2])):
+            if open_slots <= 0:
+                continue
+            day = _day(event_date)
+            load = [positions for picked_day, positions in picks if abs(picked_day - day) <= LOAD_DAYS]
+            blocked = [positions for picked_day, positions in picks if picked_day == day]
+            candidates, score, _, _ = self._score(
+                tokenize_skills(required_skills), day, event_id,
+                np.concatenate(load) if load else (), np.concatenate(blocked) if blocked else ())
+            chosen = candidates[self._top(candidates, score, int(open_slots))]
+            picks.append((day, chosen))
+            assignments.extend((event_id, int(volunteer_id)) for volunteer_id in self.skills.volunteer_ids[chosen])
+        return assignments
+
+
+def _load(tables, loader, *args):
+    def load():
+        with read_connection(tables) as conn:
+            cursor = conn.cursor()
+            try:
+                return loader(cursor, *args)
+            finally:
+                cursor.close()
+    return load
+
+
+def _build_matcher(today):
+    cache = get_query_cache()
+    skills = cache.get_or_load(("match_skill_index",), SKILL_TABLES, _load(SKILL_TABLES, SkillIndex.load))
+    participation = cache.get_or_load(("match_participation", today), PARTICIPATION_TABLES,
+                                      _load(PARTICIPATION_TABLES, ParticipationIndex.load, today))
+    return Matcher(skills, participation)
+
+
+def get_matcher(today=None):
+    """A matcher over the current skill index and participation, from the shared cache.
+
+    The skill index and the participation arrays are cached separately, so an
+    assignment reloads only the participation side.
+    """
+    today = today or date.today()
+    return get_query_cache().get_or_load(("matcher", today), SKILL_TABLES + PARTICIPATION_TABLES,
+                                         lambda: _build_matcher(today))
@@ -0,0 +1,263 @@
+"""Versioned schema migrations.
+
+Migrations are the numbered ``migrations/NNNN_description.sql`` files, applied
+in order. Each applied version is recorded in the ``schema_version`` table
+along with a checksum of its file, so a migration that was edited after it
+was applied is reported by ``status``. Files may use the MySQL client's
+``DELIMITER`` directive to define stored procedures.
+
+MySQL commits DDL implicitly, so a migration that fails halfway is not rolled
+back. Fix the cause, undo any partial changes, and run ``up`` again.
+
+Usage:
+    python migrate.py status            # list applied and pending migrations
+    python migrate.py up [VERSION]      # apply pending migrations (up to VERSION)
+    python migrate.py baseline VERSION  # mark 1..VERSION as applied without running
+                                        # them (for databases built from the old scripts)
+    python migrate.py seed              # load the sample data
+"""
+import hashlib
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+SEED_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed_sample_data.sql")
+_FILENAME_RE = re.compile(r"^(\d+)_(\w+)\.sql$")
+_DELIMITER_RE = re.compile(r"^\s*DELIMITER\s+(\S+)\s*$", re.IGNORECASE)
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    path: str
+
+    @property
+    def sql(self):
+        with open(self.path, encoding="utf-8") as f:
+            return f.read()
+
+    @property
+    def checksum(self):
+        return hashlib.sha256(self.sql.encode("utf-8")).hexdigest()
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = _FILENAME_RE.match(filename)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2),
+                                        os.path.join(directory, filename)))
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+def split_statements(sql):
+    """Split a SQL script into statements, honouring ``DELIMITER`` directives.
+
+    Delimiters inside quotes and comments are ignored; comments are dropped.
+    """
+    statements = []
+    delimiter = ";"
+    current = []
+    quote = None
+    for line in sql.splitlines(keepends=True):
+        if quote is None and not "".join(current).strip():
+            match = _DELIMITER_RE.match(line)
+            if match:
+                delimiter = match.group(1)
+                current = []
+                continue
+        i = 0
+        while i < len(line):
+            char = line[i]
+            if quote:
+                current.append(char)
+                if char == "\\" and quote != "`" and i + 1 < len(line):
+                    current.append(line[i + 1])
+                    i += 1
+                elif char == quote:
+                    quote = None
+            elif char in ("'", '"', "`"):
+                quote = char
+                current.append(char)
+            elif line.startswith("--", i) and (i + 2 >= len(line) or line[i + 2].isspace()) or char == "#":
+                current.append("\n")
+                break
+            elif line.startswith("/*", i):
+                end = line.find("*/", i + 2)
+                if end == -1:
+                    # Multi-line block comments are not used in our migrations
+                    raise ValueError("Unterminated /* comment")
+                i = end + 2
+                continue
+            elif line.startswith(delimiter, i):
+                # A body's closing ``END;`` keeps its semicolon; the server doesn't need it
+                statement = "".join(current).strip().rstrip(";").rstrip()
+                if statement:
+                    statements.append(statement)
+                current = []
+                i += len(delimiter)
+                continue
+            else:
+                current.append(char)
+            i += 1
+    statement = "".join(current).strip().rstrip(";").rstrip()
+    if statement:
+        statements.append(statement)
+    return statements
+
+
+def ensure_version_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            Version INT PRIMARY KEY,
+            Name VARCHAR(255) NOT NULL,
+            Checksum CHAR(64) NOT NULL,
+            AppliedAt DATETIME NOT NULL,
+            DurationMs INT NOT NULL DEFAULT 0
+        )
+    """)
+
+
+def applied_versions(cursor):
+    ensure_version_table(cursor)
+    cursor.execute("SELECT Version, Name, Checksum, AppliedAt FROM schema_version ORDER BY Version")
+    return {row[0]: row for row in cursor.fetchall()}
+
+
+def _record(cursor, migration, duration_ms):
+    cursor.execute("""
+        INSERT INTO schema_version (Version, Name, Checksum, AppliedAt, DurationMs)
+        VALUES (%s, %s, %s, NOW(), %s)
+    """, (migration.version, migration.name, migration.checksum, duration_ms))
+
+
+def status(conn, migrations=None):
+    """Return ``(migration, state)`` pairs: applied, pending or modified."""
+    migrations = discover_migrations() if migrations is None else migrations
+    cursor = conn.cursor()
+    try:
+        applied = applied_versions(cursor)
+    finally:
+        cursor.close()
+    conn.commit()
+    result = []
+    for migration in migrations:
+        row = applied.get(migration.version)
+        if row is None:
+            result.append((migration, "pending"))
+        elif row[2] != migration.checksum:
+            result.append((migration, "modified"))
+        else:
+            result.append((migration, "applied"))
+    return result
+
+
+def upgrade(conn, target=None, migrations=None, log=print):
+    """Apply pending migrations in order, up to ``target`` if given.
+
+    Returns the list of migrations that were applied.
+    """
+    migrations = discover_migrations() if migrations is None else migrations
+    cursor = conn.cursor()
+    done = []
+    try:
+        applied = applied_versions(cursor)
+        for migration in migrations:
+            if migration.version in applied or (target is not None and migration.version > target):
+                continue
+            log(f"→ applying {migration.version:04d}_{migration.name}")
+            start = time.perf_counter()
+            for statement in split_statements(migration.sql):
+                cursor.execute(statement)
+                if cursor.with_rows:
+                    cursor.fetchall()
+            _record(cursor, migration, int((time.perf_counter() - start) * 1000))
+            conn.commit()
+            done.append(migration)
+    finally:
+        cursor.close()
+    if done:
+        # Anything cached in this process may describe the old schema
+        from schema import clear_schema_cache
+        clear_schema_cache()
+    return done
+
+
+def baseline(conn, version, migrations=None):
+    """Mark migrations up to ``version`` as applied without running them."""
+    migrations = discover_migrations() if migrations is None else migrations
+    cursor = conn.cursor()
+    try:
+        applied = applied_versions(cursor)
+        marked = [m for m in migrations if m.version <= version and m.version not in applied]
+        for migration in marked:
+            _record(cursor, migration, 0)
+        conn.commit()
+    finally:
+        cursor.close()
+    return marked
+
+
+def ensure_database():
+    """Create the configured database if it does not exist yet."""
+    import mysql.connector
+
+    from db_config import DB_SETTINGS
+
+    settings = dict(DB_SETTINGS)
+    database = settings.pop("database")
+    conn = mysql.connector.connect(**settings)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database}`")
+        cursor.close()
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    from db_config import get_connection
+
+    commands = ("status", "up", "baseline", "seed")
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print(__doc__)
+        sys.exit(1)
+    command = sys.argv[1]
+    argument = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    if command == "up":
+        ensure_database()
+    conn = get_connection()
+    try:
+        if command == "status":
+            for migration, state in status(conn):
+                marker = {"applied": "✅", "pending": "⏳", "modified": "⚠️"}[state]
+                print(f"{marker} {migration.version:04d}_{migration.name}  {state}")
+        elif command == "up":
+            applied = upgrade(conn, target=argument)
+            print(f"✅ Applied {len(applied)} migration(s)" if applied else "✅ Schema is up to date")
+        elif command == "baseline":
+            if argument is None:
+                print("baseline needs a VERSION")
+                sys.exit(1)
+            marked = baseline(conn, argument)
+            print(f"✅ Marked {len(marked)} migration(s) as applied")
+        else:
+            with open(SEED_FILE, encoding="utf-8") as f:
+                cursor = conn.cursor()
+                for statement in split_statements(f.read()):
+                    cursor.execute(statement)
+                cursor.close()
+            conn.commit()
+            print("✅ Sample data loaded (run 'python rollups.py rebuild' and "
+                  "'python skill_search.py rebuild' to refresh derived tables)")
+    finally:
+        conn.close()
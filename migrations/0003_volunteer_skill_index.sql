@@ -0,0 +1,12 @@
+-- Skill search index: one row per normalized skill token per volunteer.
+-- Kept in sync by the app on insert/update (see skill_search.py); deletes
+-- cascade from Volunteer. Backfill existing rows with:
+--     python skill_search.py rebuild
+
+CREATE TABLE VolunteerSkill (
+    Token VARCHAR(50) NOT NULL,
+    VolunteerID INT NOT NULL,
+    PRIMARY KEY (Token, VolunteerID),
+    INDEX idx_volunteerskill_volunteer (VolunteerID),
+    FOREIGN KEY (VolunteerID) REFERENCES Volunteer(VolunteerID) ON DELETE CASCADE
+);
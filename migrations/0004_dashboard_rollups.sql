@@ -0,0 +1,31 @@
+-- Dashboard rollups, maintained by the app in the same transaction as every
+-- volunteer/donation write (see rollups.py). The INSERTs below backfill them
+-- from the base tables; re-run the backfill at any time with:
+--     python rollups.py rebuild
+
+CREATE TABLE DashboardSummary (
+    SummaryID TINYINT PRIMARY KEY,
+    TotalVolunteers INT NOT NULL DEFAULT 0,
+    AvailableVolunteers INT NOT NULL DEFAULT 0,
+    TotalDonations INT NOT NULL DEFAULT 0,
+    TotalQuantity BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE ResourceTotals (
+    ResourceType VARCHAR(50) PRIMARY KEY,
+    DonationCount INT NOT NULL DEFAULT 0,
+    TotalQuantity BIGINT NOT NULL DEFAULT 0,
+    INDEX idx_resourcetotals_quantity (TotalQuantity)
+);
+
+INSERT INTO DashboardSummary (SummaryID, TotalVolunteers, AvailableVolunteers, TotalDonations, TotalQuantity)
+SELECT 1,
+       (SELECT COUNT(*) FROM Volunteer),
+       (SELECT COUNT(*) FROM Volunteer WHERE Availability = 1),
+       (SELECT COUNT(*) FROM Donation),
+       (SELECT COALESCE(SUM(Quantity), 0) FROM Donation);
+
+INSERT INTO ResourceTotals (ResourceType, DonationCount, TotalQuantity)
+SELECT ResourceType, COUNT(*), COALESCE(SUM(Quantity), 0)
+FROM Donation
+GROUP BY ResourceType;
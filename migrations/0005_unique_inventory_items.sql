@@ -0,0 +1,55 @@
+-- One inventory row per item: merge any duplicate ItemName rows created by
+-- concurrent donations, then enforce it with a unique key. The key doubles as
+-- the index behind every ItemName lookup and lets a donation update stock
+-- with a single INSERT ... ON DUPLICATE KEY UPDATE.
+
+CREATE TEMPORARY TABLE InventoryMerge AS
+SELECT ItemName, MIN(ItemID) AS KeepID, SUM(QuantityAvailable) AS Total
+FROM Inventory
+GROUP BY ItemName
+HAVING COUNT(*) > 1;
+
+UPDATE Inventory i
+JOIN InventoryMerge m ON i.ItemID = m.KeepID
+SET i.QuantityAvailable = m.Total;
+
+DELETE i FROM Inventory i
+JOIN InventoryMerge m ON i.ItemName = m.ItemName AND i.ItemID <> m.KeepID;
+
+DROP TEMPORARY TABLE InventoryMerge;
+
+ALTER TABLE Inventory ADD UNIQUE KEY uq_inventory_itemname (ItemName);
+
+-- AddDonation now creates missing inventory items and keeps the dashboard
+-- rollups from 0004_dashboard_rollups.sql in step, all inside the caller's transaction.
+DROP PROCEDURE IF EXISTS AddDonation;
+
+DELIMITER //
+
+CREATE PROCEDURE AddDonation(
+    IN donorName VARCHAR(100),
+    IN resourceType VARCHAR(50),
+    IN quantity INT
+)
+BEGIN
+    INSERT INTO Donation (DonorName, ResourceType, Quantity, DonationDate)
+    VALUES (donorName, resourceType, quantity, CURDATE());
+
+    INSERT INTO Inventory (ItemName, QuantityAvailable)
+    VALUES (resourceType, quantity)
+    ON DUPLICATE KEY UPDATE QuantityAvailable = QuantityAvailable + VALUES(QuantityAvailable);
+
+    UPDATE DashboardSummary
+    SET TotalDonations = TotalDonations + 1,
+        TotalQuantity = TotalQuantity + quantity
+    WHERE SummaryID = 1;
+
+    INSERT INTO ResourceTotals (ResourceType, DonationCount, TotalQuantity)
+    VALUES (resourceType, 1, quantity)
+    ON DUPLICATE KEY UPDATE
+        DonationCount = DonationCount + 1,
+        TotalQuantity = TotalQuantity + VALUES(TotalQuantity);
+END;
+//
+
+DELIMITER ;
@@ -0,0 +1,78 @@
+-- Daily donation rollup behind the Donation History page. DonationDaily has
+-- one row per (date, resource type); DonationDailyDonor records which donors
+-- gave on that day so UniqueDonors stays exact under incremental updates.
+-- Both are maintained by every donation write (see rollups.py) and can be
+-- rebuilt from Donation with:
+--     python rollups.py rebuild
+
+CREATE TABLE DonationDaily (
+    DonationDate DATE NOT NULL,
+    ResourceType VARCHAR(50) NOT NULL,
+    DonationCount INT NOT NULL DEFAULT 0,
+    Quantity BIGINT NOT NULL DEFAULT 0,
+    UniqueDonors INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (DonationDate, ResourceType),
+    INDEX idx_donationdaily_resource_date (ResourceType, DonationDate)
+);
+
+CREATE TABLE DonationDailyDonor (
+    DonationDate DATE NOT NULL,
+    ResourceType VARCHAR(50) NOT NULL,
+    DonorName VARCHAR(100) NOT NULL,
+    PRIMARY KEY (DonationDate, ResourceType, DonorName),
+    INDEX idx_donationdailydonor_donor (DonorName, DonationDate)
+);
+
+INSERT INTO DonationDailyDonor (DonationDate, ResourceType, DonorName)
+SELECT DISTINCT DonationDate, ResourceType, DonorName
+FROM Donation
+WHERE DonationDate IS NOT NULL AND ResourceType IS NOT NULL AND DonorName IS NOT NULL;
+
+INSERT INTO DonationDaily (DonationDate, ResourceType, DonationCount, Quantity, UniqueDonors)
+SELECT DonationDate, ResourceType, COUNT(*), COALESCE(SUM(Quantity), 0), COUNT(DISTINCT DonorName)
+FROM Donation
+WHERE DonationDate IS NOT NULL AND ResourceType IS NOT NULL
+GROUP BY DonationDate, ResourceType;
+
+-- Keep the stored procedure in step with the new rollup
+DROP PROCEDURE IF EXISTS AddDonation;
+
+DELIMITER //
+
+CREATE PROCEDURE AddDonation(
+    IN donorName VARCHAR(100),
+    IN resourceType VARCHAR(50),
+    IN quantity INT
+)
+BEGIN
+    INSERT INTO Donation (DonorName, ResourceType, Quantity, DonationDate)
+    VALUES (donorName, resourceType, quantity, CURDATE());
+
+    INSERT INTO Inventory (ItemName, QuantityAvailable)
+    VALUES (resourceType, quantity)
+    ON DUPLICATE KEY UPDATE QuantityAvailable = QuantityAvailable + VALUES(QuantityAvailable);
+
+    UPDATE DashboardSummary
+    SET TotalDonations = TotalDonations + 1,
+        TotalQuantity = TotalQuantity + quantity
+    WHERE SummaryID = 1;
+
+    INSERT INTO ResourceTotals (ResourceType, DonationCount, TotalQuantity)
+    VALUES (resourceType, 1, quantity)
+    ON DUPLICATE KEY UPDATE
+        DonationCount = DonationCount + 1,
+        TotalQuantity = TotalQuantity + VALUES(TotalQuantity);
+
+    INSERT IGNORE INTO DonationDailyDonor (DonationDate, ResourceType, DonorName)
+    VALUES (CURDATE(), resourceType, donorName);
+
+    INSERT INTO DonationDaily (DonationDate, ResourceType, DonationCount, Quantity, UniqueDonors)
+    VALUES (CURDATE(), resourceType, 1, quantity, ROW_COUNT())
+    ON DUPLICATE KEY UPDATE
+        DonationCount = DonationCount + 1,
+        Quantity = Quantity + VALUES(Quantity),
+        UniqueDonors = UniqueDonors + VALUES(UniqueDonors);
+END;
+//
+
+DELIMITER ;
@@ -0,0 +1,17 @@
+-- Secondary indexes for the app's hot queries.
+--  * Donation History pages raw rows newest-first and filters by date range,
+--    optionally within one resource type.
+--  * The Volunteer Directory pages by (Name, VolunteerID) and filters by
+--    availability; InnoDB appends the primary key to every secondary index,
+--    so these also serve the keyset ORDER BY.
+--  * The composite Participation indexes cover lookups from either side and
+--    replace the single-column ones InnoDB created for the foreign keys.
+
+CREATE INDEX idx_donation_date ON Donation (DonationDate);
+CREATE INDEX idx_donation_resource_date ON Donation (ResourceType, DonationDate);
+
+CREATE INDEX idx_volunteer_name ON Volunteer (Name);
+CREATE INDEX idx_volunteer_availability_name ON Volunteer (Availability, Name);
+
+CREATE INDEX idx_participation_event_volunteer ON Participation (EventID, VolunteerID);
+CREATE INDEX idx_participation_volunteer_event ON Participation (VolunteerID, EventID);
@@ -0,0 +1,84 @@
+-- Per-item reorder levels and a low-stock flag kept up to date on write.
+-- IsLowStock changes only when an item's stock crosses its ReorderLevel;
+-- every crossing also appends a row to StockAlert, which feeds the
+-- Inventory page's alert list and the in-app notifications. The index on
+-- (IsLowStock, ItemName) lets the low-stock panel read just the low items.
+
+ALTER TABLE Inventory
+    ADD COLUMN ReorderLevel INT NOT NULL DEFAULT 10,
+    ADD COLUMN IsLowStock BOOLEAN NOT NULL DEFAULT FALSE;
+
+UPDATE Inventory SET IsLowStock = (QuantityAvailable < ReorderLevel);
+
+CREATE INDEX idx_inventory_low_stock ON Inventory (IsLowStock, ItemName);
+
+CREATE TABLE StockAlert (
+    AlertID INT AUTO_INCREMENT PRIMARY KEY,
+    ItemID INT NOT NULL,
+    ItemName VARCHAR(100) NOT NULL,
+    AlertType VARCHAR(10) NOT NULL,  -- 'low' or 'restocked'
+    QuantityAvailable INT NOT NULL,
+    ReorderLevel INT NOT NULL,
+    CreatedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_stockalert_item (ItemID, AlertID)
+);
+
+-- Items that are already low start with an open alert
+INSERT INTO StockAlert (ItemID, ItemName, AlertType, QuantityAvailable, ReorderLevel)
+SELECT ItemID, ItemName, 'low', QuantityAvailable, ReorderLevel
+FROM Inventory
+WHERE IsLowStock;
+
+-- AddDonation also raises the restock alert when a donation lifts an item
+-- back over its reorder level
+DROP PROCEDURE IF EXISTS AddDonation;
+
+DELIMITER //
+
+CREATE PROCEDURE AddDonation(
+    IN donorName VARCHAR(100),
+    IN resourceType VARCHAR(50),
+    IN quantity INT
+)
+BEGIN
+    INSERT INTO Donation (DonorName, ResourceType, Quantity, DonationDate)
+    VALUES (donorName, resourceType, quantity, CURDATE());
+
+    INSERT INTO Inventory (ItemName, QuantityAvailable)
+    VALUES (resourceType, quantity)
+    ON DUPLICATE KEY UPDATE QuantityAvailable = QuantityAvailable + VALUES(QuantityAvailable);
+
+    INSERT INTO StockAlert (ItemID, ItemName, AlertType, QuantityAvailable, ReorderLevel)
+    SELECT ItemID, ItemName, CASE WHEN QuantityAvailable < ReorderLevel THEN 'low' ELSE 'restocked' END,
+           QuantityAvailable, ReorderLevel
+    FROM Inventory
+    WHERE ItemName = resourceType AND IsLowStock <> (QuantityAvailable < ReorderLevel);
+
+    UPDATE Inventory
+    SET IsLowStock = (QuantityAvailable < ReorderLevel)
+    WHERE ItemName = resourceType AND IsLowStock <> (QuantityAvailable < ReorderLevel);
+
+    UPDATE DashboardSummary
+    SET TotalDonations = TotalDonations + 1,
+        TotalQuantity = TotalQuantity + quantity
+    WHERE SummaryID = 1;
+
+    INSERT INTO ResourceTotals (ResourceType, DonationCount, TotalQuantity)
+    VALUES (resourceType, 1, quantity)
+    ON DUPLICATE KEY UPDATE
+        DonationCount = DonationCount + 1,
+        TotalQuantity = TotalQuantity + VALUES(TotalQuantity);
+
+    INSERT IGNORE INTO DonationDailyDonor (DonationDate, ResourceType, DonorName)
+    VALUES (CURDATE(), resourceType, donorName);
+
+    INSERT INTO DonationDaily (DonationDate, ResourceType, DonationCount, Quantity, UniqueDonors)
+    VALUES (CURDATE(), resourceType, 1, quantity, ROW_COUNT())
+    ON DUPLICATE KEY UPDATE
+        DonationCount = DonationCount + 1,
+        Quantity = Quantity + VALUES(Quantity),
+        UniqueDonors = UniqueDonors + VALUES(UniqueDonors);
+END;
+//
+
+DELIMITER ;
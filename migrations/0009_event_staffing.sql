@@ -0,0 +1,24 @@
+-- Event staffing for the volunteer matching engine (see matching.py).
+-- Events record the skills they need and how many volunteers they want;
+-- events seeded with a "Skills needed: ..." description get that list as
+-- their RequiredSkills. Participation becomes unique per (EventID,
+-- VolunteerID) so batch assignments can use INSERT IGNORE, and the unique
+-- key takes over from the plain composite index added in 0007. EventDate is
+-- indexed for the upcoming-events list and the matcher's load window.
+
+ALTER TABLE Event
+    ADD COLUMN RequiredSkills VARCHAR(255),
+    ADD COLUMN VolunteersNeeded INT NOT NULL DEFAULT 1;
+
+UPDATE Event
+SET RequiredSkills = TRIM(SUBSTRING(Description, 16))
+WHERE Description LIKE 'Skills needed:%';
+
+CREATE INDEX idx_event_date ON Event (EventDate);
+
+DELETE p FROM Participation p
+JOIN Participation q
+  ON q.EventID = p.EventID AND q.VolunteerID = p.VolunteerID AND q.ParticipationID < p.ParticipationID;
+
+ALTER TABLE Participation ADD UNIQUE KEY uq_participation_event_volunteer (EventID, VolunteerID);
+DROP INDEX idx_participation_event_volunteer ON Participation;
@@ -0,0 +1,9 @@
+-- Idempotency keys for donations drained from the ingestion journal
+-- (ingest.py). A batch replayed after a crash between its commit and the
+-- journal checkpoint skips the keys already present, so no donation is
+-- counted twice. Donations recorded directly leave the key NULL, which the
+-- unique index allows any number of times.
+
+ALTER TABLE Donation ADD COLUMN IdempotencyKey VARCHAR(64) NULL;
+
+CREATE UNIQUE INDEX uq_donation_idempotency ON Donation (IdempotencyKey);
@@ -0,0 +1,13 @@
+-- Daily disbursed quantity per inventory item. The disbursement write path
+-- adds to it in the same transaction as the stock change; together with
+-- DonationDaily it gives each item's inflow and outflow rates for the
+-- depletion forecast on the Analytics page. Disbursements have no base
+-- table, so this is their only history and `rollups.py rebuild` leaves it
+-- alone.
+
+CREATE TABLE DisbursementDaily (
+    DisbursementDate DATE NOT NULL,
+    ItemName VARCHAR(100) NOT NULL,
+    Quantity BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (DisbursementDate, ItemName)
+);
@@ -0,0 +1,11 @@
+-- Heartbeat for read-replica lag. While NGO_DB_REPLICAS is set, the app
+-- writes the current Unix time here on the primary about once a second; a
+-- replica's copy of the row tells how far behind it is (see
+-- db_config.ReadRouter). Single row, kept at HeartbeatID = 1.
+
+CREATE TABLE ReplicaHeartbeat (
+    HeartbeatID TINYINT NOT NULL PRIMARY KEY,
+    BeatAt DOUBLE NOT NULL
+);
+
+INSERT INTO ReplicaHeartbeat (HeartbeatID, BeatAt) VALUES (1, 0);
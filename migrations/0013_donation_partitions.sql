@@ -0,0 +1,37 @@
+-- Yearly range partitions for Donation and a compressed archive for closed
+-- years (see partitions.py).
+--  * MySQL requires every unique key of a partitioned table to include the
+--    partitioning column, so DonationDate joins the primary key and the
+--    idempotency key. Ingestion replays a journal row with its original date,
+--    so (IdempotencyKey, DonationDate) still rejects a replayed donation.
+--  * None of the app's write paths leave DonationDate empty; rows entered by
+--    hand without one are dated 1970-01-01 and move to the archive on its
+--    first run. Run `python rollups.py rebuild` afterwards if any were.
+--  * Donation starts as a single catch-all partition. `python partitions.py
+--    ensure` splits it into one partition per year, through the years ahead.
+--  * DonationArchive holds the years `python partitions.py archive` has moved
+--    out of Donation; only requests for older history read it.
+
+UPDATE Donation SET DonationDate = '1970-01-01' WHERE DonationDate IS NULL;
+
+ALTER TABLE Donation
+    MODIFY DonationDate DATE NOT NULL,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (DonationID, DonationDate),
+    DROP INDEX uq_donation_idempotency,
+    ADD UNIQUE INDEX uq_donation_idempotency (IdempotencyKey, DonationDate);
+
+ALTER TABLE Donation PARTITION BY RANGE COLUMNS (DonationDate) (
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+CREATE TABLE DonationArchive (
+    DonationID INT NOT NULL PRIMARY KEY,
+    DonorName VARCHAR(100),
+    ResourceType VARCHAR(50),
+    Quantity INT,
+    DonationDate DATE NOT NULL,
+    IdempotencyKey VARCHAR(64) NULL,
+    INDEX idx_donationarchive_date (DonationDate),
+    INDEX idx_donationarchive_resource_date (ResourceType, DonationDate)
+) ROW_FORMAT=COMPRESSED KEY_BLOCK_SIZE=8;
@@ -0,0 +1,6 @@
+-- Index idempotency keys in DonationArchive. A journal segment replayed
+-- after its donations were archived (ingest.py) must find their keys there
+-- too, or they would be inserted into Donation a second time. Not unique:
+-- archiving copies rows by DonationID and must never skip one.
+
+CREATE INDEX idx_donationarchive_idempotency ON DonationArchive (IdempotencyKey);
@@ -0,0 +1,259 @@
+"""Yearly Donation partitions and the archive for closed years.
+
+On MySQL, Donation is range-partitioned by DonationDate (migration 0013):
+one partition per year, named ``pYYYY``, plus a catch-all ``p_future``. A
+query with a date range reads only the partitions that range overlaps, and
+``ensure`` keeps yearly partitions created ahead of the calendar so new
+donations never pile up in ``p_future``.
+
+``archive`` moves every year older than the last ``NGO_HOT_YEARS`` into the
+compressed DonationArchive table: the year's partition is swapped out into an
+empty staging table, copied from there, and then dropped, which frees its
+pages at once instead of deleting row by row.
+The rollups already count archived donations, so dashboard and history totals
+do not change; only raw-row reads (the Donation History table, donor search,
+exports) have to ask for the archive, and they do so only when the user wants
+older history.
+
+The SQLite stand-in has no partitions; there ``ensure`` does nothing and
+``archive`` moves rows by date range.
+
+Usage:
+    python partitions.py status
+    python partitions.py ensure [--years-ahead 2]    # e.g. monthly from cron
+    python partitions.py archive [--hot-years 3]     # e.g. every January
+"""
+import argparse
+import os
+from datetime import date
+
+YEARS_AHEAD = int(os.environ.get("NGO_PARTITION_YEARS_AHEAD", "2"))
+HOT_YEARS = int(os.environ.get("NGO_HOT_YEARS", "3"))
+
+ARCHIVE_COLUMNS = "DonationID, DonorName, ResourceType, Quantity, DonationDate, IdempotencyKey"
+STAGING_TABLE = "DonationArchiveStaging"
+
+
+def _is_sqlite(conn):
+    return getattr(conn, "dialect", "mysql") == "sqlite"
+
+
+def list_partitions(cursor):
+    """Return Donation's ``(name, less_than, approximate_rows)`` in order; MySQL only."""
+    cursor.execute("""
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Donation'
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """)
+    rows = cursor.fetchall()
+    if not rows or rows[0][0] is None:
+        raise RuntimeError("Donation is not partitioned; run `python migrate.py up` first")
+    return [(name, description.strip("'"), int(table_rows or 0)) for name, description, table_rows in rows]
+
+
+def _partition_years(partitions):
+    return [int(name[1:]) for name, _, _ in partitions if name[1:].isdigit()]
+
+
+def ensure_partitions(conn, years_ahead=YEARS_AHEAD, today=None):
+    """Split ``p_future`` so every year through ``today + years_ahead`` has a partition.
+
+    The first run starts from the oldest donation's year, but no earlier than
+    the last year :func:`archive_closed_years` would archive: the oldest
+    partition also holds anything earlier, so years of old data cost one
+    partition rather than one each. Returns the names of the partitions created.
+    """
+    if _is_sqlite(conn):
+        return []
+    today = today or date.today()
+    cursor = conn.cursor()
+    try:
+        years = _partition_years(list_partitions(cursor))
+        if years:
+            first = max(years) + 1
+        else:
+            cursor.execute("SELECT MIN(DonationDate) FROM Donation")
+            oldest = cursor.fetchone()[0]
+            first = max(oldest.year, archive_cutoff(today=today).year - 1) if oldest else today.year
+        new_years = range(first, today.year + years_ahead + 1)
+        if not new_years:
+            return []
+        # Only rows already sitting in p_future are rewritten, so after the
+        # first run this touches an empty partition
+        definitions = [f"PARTITION p{year} VALUES LESS THAN ('{year + 1}-01-01')" for year in new_years]
+        cursor.execute(f"""
+            ALTER TABLE Donation REORGANIZE PARTITION p_future INTO (
+                {", ".join(definitions)},
+                PARTITION p_future VALUES LESS THAN (MAXVALUE)
+            )
+        """)
+        return [f"p{year}" for year in new_years]
+    finally:
+        cursor.close()
+
+
+def archive_cutoff(hot_years=HOT_YEARS, today=None):
+    """First day kept in Donation: January 1st of the oldest hot year."""
+    today = today or date.today()
+    return date(today.year - max(hot_years, 1) + 1, 1, 1)
+
+
+def _copy_checked(conn, cursor, table, partition=None):
+    """Copy ``table`` (or one partition of it) into DonationArchive, checking every row arrived.
+
+    Returns the number of rows copied.
+    """
+    source = f"{table} PARTITION ({partition})" if partition else table
+    cursor.execute(f"INSERT IGNORE INTO DonationArchive ({ARCHIVE_COLUMNS}) SELECT {ARCHIVE_COLUMNS} FROM {source}")
+    conn.commit()
+    # No aliases: under LOCK TABLES a table may only be named as it was locked
+    cursor.execute(f"""
+        SELECT COUNT(*) FROM {source}
+        LEFT JOIN DonationArchive ON DonationArchive.DonationID = {table}.DonationID
+        WHERE DonationArchive.DonationID IS NULL
+    """)
+    missing = cursor.fetchone()[0]
+    if missing:
+        raise RuntimeError(f"{missing} rows of {partition or table} did not reach DonationArchive; "
+                           f"leaving them in place")
+    cursor.execute(f"SELECT COUNT(*) FROM {source}")
+    return int(cursor.fetchone()[0])
+
+
+def _drop_staging(conn, cursor, log):
+    # Left behind by a run that stopped after swapping a partition out: its
+    # rows are in neither Donation nor the archive until copied
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (STAGING_TABLE,))
+    if not cursor.fetchone()[0]:
+        return 0
+    rows = _copy_checked(conn, cursor, STAGING_TABLE)
+    cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+    if rows:
+        log(f"🗄️ {rows} donations from an interrupted run archived")
+    return rows
+
+
+def _archive_partition(conn, cursor, name, log):
+    """Swap partition ``name`` out, copy it to the archive and drop it; returns the rows moved.
+
+    Swapping with an empty table is a metadata change, so the partition's
+    rows leave Donation at once and are copied without holding up writers;
+    until the copy finishes, reads that include the archive miss that year.
+    Only the final check and drop lock the tables, so a donation back-dated
+    into the year after the swap is archived rather than dropped with it.
+    """
+    # Created afresh each time so it always matches Donation's current columns
+    cursor.execute(f"CREATE TABLE {STAGING_TABLE} LIKE Donation")
+    cursor.execute(f"ALTER TABLE {STAGING_TABLE} REMOVE PARTITIONING")
+    cursor.execute(f"ALTER TABLE Donation EXCHANGE PARTITION {name} WITH TABLE {STAGING_TABLE}")
+    moved = _drop_staging(conn, cursor, lambda line: None)
+    cursor.execute("LOCK TABLES Donation WRITE, DonationArchive WRITE")
+    try:
+        moved += _copy_checked(conn, cursor, "Donation", name)
+        cursor.execute(f"ALTER TABLE Donation DROP PARTITION {name}")
+    finally:
+        cursor.execute("UNLOCK TABLES")
+    log(f"🗄️ {name}: {moved} donations archived, partition dropped")
+    return moved
+
+
+def _move_rows_before(conn, cursor, cutoff):
+    # Copy and delete in one transaction: the rows are never in both tables
+    # (or neither) as far as other readers can tell
+    cursor.execute(f"""
+        INSERT IGNORE INTO DonationArchive ({ARCHIVE_COLUMNS})
+        SELECT {ARCHIVE_COLUMNS} FROM Donation WHERE DonationDate < %s
+    """, (cutoff,))
+    cursor.execute("""
+        DELETE FROM Donation
+        WHERE DonationDate < %s AND EXISTS (
+            SELECT 1 FROM DonationArchive a
+            WHERE a.DonationID = Donation.DonationID AND a.DonationDate = Donation.DonationDate
+        )
+    """, (cutoff,))
+    moved = cursor.rowcount
+    conn.commit()
+    return moved
+
+
+def archive_closed_years(conn, hot_years=HOT_YEARS, today=None, log=print):
+    """Move donations dated before :func:`archive_cutoff` into DonationArchive.
+
+    Safe to rerun: rows already archived are skipped by their primary key, a
+    partition is dropped only once all of its rows are in the archive, and a
+    run interrupted after swapping a partition out is finished first.
+    Returns the number of donations moved.
+    """
+    cutoff = archive_cutoff(hot_years, today)
+    moved = 0
+    cursor = conn.cursor()
+    try:
+        if not _is_sqlite(conn):
+            moved += _drop_staging(conn, cursor, log)
+            for name, less_than, _ in list_partitions(cursor):
+                if name == "p_future" or date.fromisoformat(less_than) > cutoff:
+                    continue
+                moved += _archive_partition(conn, cursor, name, log)
+        # Anything older still in Donation: every row on SQLite, and on MySQL
+        # donations back-dated into the oldest remaining partition
+        rows = _move_rows_before(conn, cursor, cutoff)
+        if rows:
+            log(f"🗄️ {rows} donations before {cutoff} archived")
+        return moved + rows
+    finally:
+        cursor.close()
+
+
+def _range(cursor, table):
+    # ORDER BY ... LIMIT keeps the column's type on SQLite, where MIN()/MAX() return text
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    count = int(cursor.fetchone()[0])
+    if not count:
+        return count, None, None
+    cursor.execute(f"SELECT DonationDate FROM {table} ORDER BY DonationDate LIMIT 1")
+    oldest = cursor.fetchone()[0]
+    cursor.execute(f"SELECT DonationDate FROM {table} ORDER BY DonationDate DESC LIMIT 1")
+    return count, oldest, cursor.fetchone()[0]
+
+
+def status(conn, log=print):
+    cursor = conn.cursor()
+    try:
+        for table in ("Donation", "DonationArchive"):
+            count, oldest, newest = _range(cursor, table)
+            log(f"{table}: {count} rows" + (f", {oldest} to {newest}" if count else ""))
+            if table == "Donation" and not _is_sqlite(conn):
+                for name, less_than, rows in list_partitions(cursor):
+                    log(f"    {name:<9} < {less_than:<10}  ~{rows} rows")
+    finally:
+        cursor.close()
+
+
+if __name__ == "__main__":
+    from db_config import pooled_connection
+
+    parser = argparse.ArgumentParser(description="Maintain Donation's yearly partitions and archive.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="show partitions and what is hot or archived")
+    ensure = commands.add_parser("ensure", help="create partitions for the coming years")
+    ensure.add_argument("--years-ahead", type=int, default=YEARS_AHEAD)
+    archive = commands.add_parser("archive", help="move closed years into DonationArchive")
+    archive.add_argument("--hot-years", type=int, default=HOT_YEARS)
+    args = parser.parse_args()
+
+    with pooled_connection() as conn:
+        if args.command == "status":
+            status(conn)
+        elif args.command == "ensure":
+            created = ensure_partitions(conn, args.years_ahead)
+            if _is_sqlite(conn):
+                print("ℹ️ SQLite has no partitions; nothing to do")
+            else:
+                print(f"✅ Created {', '.join(created)}" if created else "✅ Partitions already in place")
+        else:
+            moved = archive_closed_years(conn, args.hot_years)
+            print(f"✅ {moved} donations before {archive_cutoff(args.hot_years)} are now in DonationArchive")
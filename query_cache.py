@@ -0,0 +1,152 @@
+"""Process-wide query-result cache with per-table invalidation.
+
+Entries are keyed by query plus parameters and remember the version of every
+table they were read from. Write paths call ``invalidate(*tables)`` after
+committing, which bumps those tables' version counters; any entry built from
+an older version is treated as a miss on its next lookup. Entries also expire
+after a TTL, and the least recently used ones are evicted once the cache is
+full.
+
+A write whose effect on a cached result is known exactly can call
+``patch(tables, update)`` instead: the tables' versions are bumped as usual,
+but each current entry is handed to ``update`` and kept at the new version
+with the value it returns, so a one-row change does not cost a reload.
+
+Other components can ``subscribe(callback)`` to hear which tables each
+invalidation or patch touched; the read router uses it to keep reads that
+follow a write off replicas that have not caught up yet.
+
+Cached values are shared between sessions, so callers must not mutate them.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_MAX_ENTRIES = int(os.environ.get("NGO_QUERY_CACHE_SIZE", "512"))
+CACHE_TTL = float(os.environ.get("NGO_QUERY_CACHE_TTL", "300"))
+
+
+class QueryCache:
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._expired = 0
+        self._evictions = 0
+        self._patched = 0
+        self._listeners = []
+
+    def _snapshot(self, tables):
+        return tuple(self._versions.get(table, 0) for table in tables)
+
+    def get_or_load(self, key, tables, loader):
+        """Return the cached value for ``key`` or call ``loader()`` and cache it.
+
+        ``tables`` names every table the value depends on.
+        """
+        tables = tuple(tables)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            snapshot = self._snapshot(tables)
+            if entry is not None:
+                expires, entry_tables, entry_snapshot, value = entry
+                if entry_tables == tables and entry_snapshot == snapshot and expires > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                if expires <= now:
+                    self._expired += 1
+                else:
+                    self._stale += 1
+                del self._entries[key]
+            self._misses += 1
+
+        # Load outside the lock; the snapshot taken above means a write that
+        # lands while we are loading leaves this entry already stale.
+        value = loader()
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, tables, snapshot, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return value
+
+    def subscribe(self, callback):
+        """Call ``callback(tables)`` on every invalidation or patch, before versions move."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def _notify(self, tables):
+        for callback in list(self._listeners):
+            callback(tables)
+
+    def invalidate(self, *tables):
+        # Listeners hear first, so a load at the new version already honours them
+        self._notify(tables)
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def patch(self, tables, update):
+        """Bump ``tables`` like ``invalidate()``, rewriting current entries instead of dropping them.
+
+        ``update(key, value)`` is called for every entry that depends on one
+        of ``tables`` and is still current. It returns the replacement value,
+        which must be a new object, or ``None`` to let the entry go stale.
+        """
+        changed = set(tables)
+        self._notify(tuple(changed))
+        with self._lock:
+            current = [(key, entry) for key, entry in self._entries.items()
+                       if changed.intersection(entry[1]) and entry[2] == self._snapshot(entry[1])]
+            for table in changed:
+                self._versions[table] = self._versions.get(table, 0) + 1
+            for key, (expires, entry_tables, _, value) in current:
+                value = update(key, value)
+                if value is not None:
+                    self._entries[key] = (expires, entry_tables, self._snapshot(entry_tables), value)
+                    self._patched += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "stale": self._stale,
+                "expired": self._expired,
+                "evictions": self._evictions,
+                "patched": self._patched,
+                "table_versions": dict(self._versions),
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_query_cache():
+    """Return the process-wide query cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = QueryCache()
+    return _cache
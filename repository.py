@@ -0,0 +1,667 @@
+"""Data access for volunteers, donations, inventory and events.
+
+The pages call these functions instead of building SQL inline. Every function
+takes a pooled connection, so the same code runs against MySQL or the SQLite
+stand-in (see ``sqlite_backend.py``); the backend is chosen per connection.
+
+Hot reads go through :func:`fetch_all`, which executes them on a prepared
+statement kept in a per-connection cache. On MySQL that is a server-side
+prepared cursor, so a query the app repeats on every rerun is parsed once per
+connection instead of once per call. SQLite has no server, so there the cache
+simply reuses cursors and lets the driver's own statement cache skip the parse.
+Writes use ordinary cursors: they are rare and each runs in its own transaction.
+"""
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import date
+
+from inventory import add_inventory_deltas, remove_inventory, set_reorder_level
+from rollups import (apply_daily_deltas, apply_disbursement_deltas, apply_donation_delta, apply_donation_deltas,
+                     apply_volunteer_delta, read_daily_by_resource, read_daily_series, read_daily_totals)
+from skill_search import sync_volunteer_skills
+
+# Distinct statements kept prepared per connection; the least recently used is closed
+STATEMENT_CACHE_SIZE = int(os.environ.get("NGO_STATEMENT_CACHE_SIZE", "64"))
+
+VOLUNTEER_PAGE_SIZE = 50
+PICKER_PAGE_SIZE = 20
+DONATION_PAGE_SIZE = 100
+PARTICIPATION_BATCH_SIZE = 500
+
+# Tables each write path touches, for query-cache invalidation
+VOLUNTEER_TABLES = ("Volunteer", "VolunteerSkill", "DashboardSummary")
+# Deleting a volunteer also drops their event assignments
+VOLUNTEER_DELETE_TABLES = VOLUNTEER_TABLES + ("Participation",)
+DONATION_TABLES = ("Donation", "Inventory", "StockAlert", "DashboardSummary", "ResourceTotals",
+                   "DonationDaily", "DonationDailyDonor")
+INVENTORY_TABLES = ("Inventory", "StockAlert")
+DISBURSEMENT_TABLES = INVENTORY_TABLES + ("DisbursementDaily",)
+EVENT_TABLES = ("Event", "Participation")
+
+
+class MySQLBackend:
+    name = "mysql"
+
+    def prepare(self, conn):
+        return conn.cursor(prepared=True)
+
+
+class SQLiteBackend:
+    name = "sqlite"
+
+    def prepare(self, conn):
+        return conn.cursor()
+
+
+BACKENDS = {backend.name: backend for backend in (MySQLBackend(), SQLiteBackend())}
+
+
+def backend_for(conn):
+    return BACKENDS[getattr(conn, "dialect", "mysql")]
+
+
+class StatementCache:
+    """Prepared cursors for one connection, keyed by SQL text (LRU)."""
+
+    def __init__(self, conn, size=STATEMENT_CACHE_SIZE):
+        self.backend = backend_for(conn)
+        self.size = size
+        # A reconnect gets a new server session, which drops every prepared statement
+        self.session = getattr(conn, "connection_id", None)
+        self._cursors = OrderedDict()
+        self.prepares = 0
+        self.executions = 0
+
+    def cursor(self, conn, sql):
+        session = getattr(conn, "connection_id", None)
+        if session != self.session:
+            self.clear()
+            self.session = session
+        cursor = self._cursors.get(sql)
+        if cursor is None:
+            cursor = self.backend.prepare(conn)
+            self._cursors[sql] = cursor
+            self.prepares += 1
+            if len(self._cursors) > self.size:
+                _, evicted = self._cursors.popitem(last=False)
+                _close(evicted)
+        else:
+            self._cursors.move_to_end(sql)
+        self.executions += 1
+        return cursor
+
+    def clear(self):
+        while self._cursors:
+            _, cursor = self._cursors.popitem()
+            _close(cursor)
+
+
+def _close(cursor):
+    try:
+        cursor.close()
+    except Exception:
+        pass
+
+
+# Connections are only ever used by one thread at a time (the pool guarantees
+# it), but the map itself is shared, so creating an entry takes a lock
+_statement_caches = weakref.WeakKeyDictionary()
+_statement_caches_lock = threading.Lock()
+
+
+def statement_cache(conn):
+    cache = _statement_caches.get(conn)
+    if cache is None:
+        with _statement_caches_lock:
+            cache = _statement_caches.get(conn)
+            if cache is None:
+                cache = _statement_caches[conn] = StatementCache(conn)
+    return cache
+
+
+def fetch_all(conn, sql, params=()):
+    """Run a read on the connection's prepared statement for ``sql``."""
+    cursor = statement_cache(conn).cursor(conn, sql)
+    cursor.execute(sql, tuple(params))
+    return cursor.fetchall()
+
+
+def fetch_frame(conn, sql, params=(), columns=None, categorical=()):
+    """Like :func:`fetch_all`, but build a compact DataFrame chunk by chunk."""
+    # frames brings in pandas; importing it on the first frame query keeps it
+    # out of processes and pages that only write or read scalars
+    from frames import frame_from_cursor
+
+    cursor = statement_cache(conn).cursor(conn, sql)
+    cursor.execute(sql, tuple(params))
+    return frame_from_cursor(cursor, columns=columns, categorical=categorical)
+
+
+def fetch_one(conn, sql, params=()):
+    rows = fetch_all(conn, sql, params)
+    return rows[0] if rows else None
+
+
+def like_pattern(term):
+    # Escape LIKE wildcards so the search box matches text literally
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _seek(where, clause):
+    return f"{where} AND {clause}" if where else f"WHERE {clause}"
+
+
+# Volunteers
+
+def volunteer_filter_clause(availability_filter, search_term):
+    conditions, params = [], []
+    if availability_filter == "Available Only":
+        conditions.append("Availability = 1")
+    elif availability_filter == "Unavailable Only":
+        conditions.append("Availability = 0")
+    if search_term:
+        pattern = like_pattern(search_term)
+        conditions.append("(Name LIKE %s OR Skills LIKE %s)")
+        params += [pattern, pattern]
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+def count_volunteers(conn, availability_filter, search_term):
+    where, params = volunteer_filter_clause(availability_filter, search_term)
+    return int(fetch_one(conn, f"SELECT COUNT(*) FROM Volunteer {where}", params)[0])
+
+
+def fetch_volunteer_page(conn, primary_key_col, availability_filter, search_term, after=None,
+                         page_size=VOLUNTEER_PAGE_SIZE):
+    """Fetch one page of volunteers ordered by (Name, id).
+
+    ``after`` is the (Name, id) key of the last row on the previous page; the
+    query seeks straight past it instead of skipping rows with OFFSET, so every
+    page costs the same no matter how deep it is. Returns ``(frame, has_next)``.
+    """
+    where, params = volunteer_filter_clause(availability_filter, search_term)
+    if after is not None:
+        where = _seek(where, f"(Name > %s OR (Name = %s AND {primary_key_col} > %s))")
+        params += [after[0], after[0], after[1]]
+    frame = fetch_frame(conn, f"SELECT * FROM Volunteer {where} ORDER BY Name, {primary_key_col} LIMIT %s",
+                        params + [page_size + 1])
+    return frame.iloc[:page_size], len(frame) > page_size
+
+
+def volunteer_lookup(conn, primary_key_col, search_term, after=None, page_size=PICKER_PAGE_SIZE):
+    """One page of ``(id, Name, Email, Availability)`` for the volunteer pickers.
+
+    Matches name or email and pages on ``(Name, id)`` like the directory.
+    Returns ``(frame, has_next)``.
+    """
+    where, params = "", []
+    if search_term:
+        pattern = like_pattern(search_term)
+        where, params = "WHERE (Name LIKE %s OR Email LIKE %s)", [pattern, pattern]
+    if after is not None:
+        where = _seek(where, f"(Name > %s OR (Name = %s AND {primary_key_col} > %s))")
+        params += [after[0], after[0], after[1]]
+    frame = fetch_frame(
+        conn,
+        f"SELECT {primary_key_col}, Name, Email, Availability FROM Volunteer {where} "
+        f"ORDER BY Name, {primary_key_col} LIMIT %s",
+        params + [page_size + 1]
+    )
+    return frame.iloc[:page_size], len(frame) > page_size
+
+
+def add_volunteer(conn, name, email, phone, skills, available):
+    """Register a volunteer with their skill tokens and rollup delta; returns the new id."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            INSERT INTO Volunteer (Name, Email, Phone, Skills, Availability)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (name, email, phone, skills, available))
+        volunteer_id = cursor.lastrowid
+        sync_volunteer_skills(cursor, volunteer_id, skills)
+        apply_volunteer_delta(cursor, 1, 1 if available else 0)
+        conn.commit()
+        return volunteer_id
+    finally:
+        cursor.close()
+
+
+def delete_volunteer(conn, primary_key_col, volunteer_id):
+    """Delete a volunteer, their event assignments and their rollup delta in one transaction."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT Availability FROM Volunteer WHERE {primary_key_col} = %s FOR UPDATE",
+                       (volunteer_id,))
+        existing = cursor.fetchone()
+        # Participation's foreign key has no ON DELETE CASCADE, so assignments go first
+        cursor.execute("DELETE FROM Participation WHERE VolunteerID = %s", (volunteer_id,))
+        cursor.execute(f"DELETE FROM Volunteer WHERE {primary_key_col} = %s", (volunteer_id,))
+        if existing:
+            apply_volunteer_delta(cursor, -1, -1 if existing[0] == 1 else 0)
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def set_volunteer_availability(conn, primary_key_col, volunteer_id, available):
+    """Set one volunteer's availability; returns the previous value, or None if there is no such volunteer."""
+    new_availability = 1 if available else 0
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT Availability FROM Volunteer WHERE {primary_key_col} = %s FOR UPDATE",
+                       (volunteer_id,))
+        existing = cursor.fetchone()
+        cursor.execute(f"UPDATE Volunteer SET Availability = %s WHERE {primary_key_col} = %s",
+                       (new_availability, volunteer_id))
+        if existing:
+            was_available = 1 if existing[0] == 1 else 0
+            apply_volunteer_delta(cursor, 0, new_availability - was_available)
+        conn.commit()
+        return (1 if existing[0] == 1 else 0) if existing else None
+    finally:
+        cursor.close()
+
+
+def availability_patch(primary_key_col, volunteer_id, available, was_available):
+    """Query-cache patch for one availability change (see ``QueryCache.patch``).
+
+    Pages and counts that do not filter on availability keep their rows and
+    only the changed cell is rewritten, and the two availability counts
+    without a search move by one. Pages filtered on availability are
+    reloaded: the volunteer joins or leaves them and every later page boundary
+    shifts. So are filtered counts with a search, which may not include the
+    volunteer, and anything else built from the volunteer tables.
+    """
+    available = 1 if available else 0
+    delta = available - was_available
+
+    def patch_frame(frame):
+        rows = frame[primary_key_col].to_numpy() == volunteer_id
+        if not rows.any():
+            return frame
+        frame = frame.copy()
+        frame.loc[rows, "Availability"] = available
+        return frame
+
+    def update(key, value):
+        name = key[0]
+        if name == "summary":
+            total, available_count, donations, quantity = value
+            return total, available_count + delta, donations, quantity
+        if name == "fetch_volunteer_page" and key[1] == primary_key_col and (key[2] == "All" or not delta):
+            frame, has_next = value
+            return patch_frame(frame), has_next
+        if name == "volunteer_lookup" and key[1] == primary_key_col:
+            frame, has_next = value
+            return patch_frame(frame), has_next
+        if name == "count_volunteers" and (key[1] == "All" or not delta):
+            return value
+        if name == "count_volunteers" and not key[2]:
+            return value + delta if key[1] == "Available Only" else value - delta
+        return None
+
+    return update
+
+
+# Donations
+
+def donation_filter_clause(start_date, end_date, resource_type, donor_search):
+    conditions, params = [], []
+    if start_date is not None:
+        conditions.append("DonationDate >= %s")
+        params.append(start_date)
+    if end_date is not None:
+        conditions.append("DonationDate <= %s")
+        params.append(end_date)
+    if resource_type is not None:
+        conditions.append("ResourceType = %s")
+        params.append(resource_type)
+    if donor_search:
+        conditions.append("DonorName LIKE %s")
+        params.append(like_pattern(donor_search))
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+def archive_boundary(conn):
+    """First date Donation still holds in full, or None before anything is archived.
+
+    ``partitions.py archive`` moves whole years, so everything before January
+    1st of the year after the newest archived donation is in DonationArchive.
+    """
+    # ORDER BY ... LIMIT rather than MAX() keeps the column's type on SQLite
+    row = fetch_one(conn, "SELECT DonationDate FROM DonationArchive ORDER BY DonationDate DESC LIMIT 1")
+    return date(row[0].year + 1, 1, 1) if row else None
+
+
+def donation_source(where, params, include_archive, columns="DonorName, ResourceType, Quantity, DonationDate"):
+    """``FROM`` target and parameters for raw donation reads.
+
+    Just Donation unless the archive was asked for; then both tables, each
+    filtered on its own so either can use its date index.
+    """
+    if not include_archive:
+        return f"Donation {where}", list(params)
+    return (f"(SELECT {columns} FROM Donation {where} "
+            f"UNION ALL SELECT {columns} FROM DonationArchive {where}) AS d", list(params) * 2)
+
+
+def recent_donations(conn, limit=5):
+    return fetch_all(conn, """
+        SELECT DonorName, ResourceType, Quantity, DonationDate FROM Donation
+        ORDER BY DonationDate DESC LIMIT %s
+    """, (limit,))
+
+
+def donated_resource_types(conn):
+    return [row[0] for row in fetch_all(
+        conn, "SELECT ResourceType FROM ResourceTotals WHERE DonationCount > 0 ORDER BY ResourceType"
+    )]
+
+
+def donation_aggregates(conn, start_date, end_date, resource_type, donor_search, include_archive=False):
+    """Return ``(totals, by_resource, by_date)`` for the Donation History filters.
+
+    Without a donor search everything comes from the DonationDaily rollup, so
+    the cost follows the date range rather than the size of Donation. Donor
+    names are not part of the rollup, so a donor search aggregates the matching
+    raw rows in SQL instead, reading DonationArchive only with ``include_archive``.
+    """
+    if not donor_search:
+        cursor = conn.cursor()
+        try:
+            args = (start_date, end_date, resource_type)
+            return (read_daily_totals(cursor, *args), read_daily_by_resource(cursor, *args),
+                    read_daily_series(cursor, *args))
+        finally:
+            cursor.close()
+
+    source, params = donation_source(*donation_filter_clause(start_date, end_date, resource_type, donor_search),
+                                     include_archive)
+    totals = fetch_one(conn, f"""
+        SELECT COUNT(*), COALESCE(SUM(Quantity), 0), COUNT(DISTINCT DonorName), COUNT(DISTINCT ResourceType)
+        FROM {source}
+    """, params)
+    by_resource = fetch_all(conn, f"""
+        SELECT ResourceType, SUM(Quantity) FROM {source}
+        GROUP BY ResourceType ORDER BY ResourceType
+    """, params)
+    by_date = fetch_all(conn, f"""
+        SELECT DonationDate, SUM(Quantity) FROM {source}
+        GROUP BY DonationDate ORDER BY DonationDate
+    """, params)
+    return tuple(int(value) for value in totals), by_resource, by_date
+
+
+def fetch_donation_page(conn, start_date, end_date, resource_type, donor_search, after=None,
+                        include_archive=False, page_size=DONATION_PAGE_SIZE):
+    """Fetch one page of raw donations, newest first.
+
+    Same keyset scheme as the volunteer directory, seeking backwards past the
+    ``(DonationDate, DonationID)`` of the last row shown. With ``include_archive``
+    the page is merged from the newest rows of Donation and of DonationArchive.
+    Returns ``(frame, has_next)``.
+    """
+    where, params = donation_filter_clause(start_date, end_date, resource_type, donor_search)
+    if after is not None:
+        # The plain upper bound on DonationDate lets MySQL skip the partitions
+        # newer than the page, which it cannot infer from the OR alone
+        where = _seek(where, "DonationDate <= %s AND (DonationDate < %s OR DonationID < %s)")
+        params += [after[0], after[0], after[1]]
+    columns = "DonationID, DonorName, ResourceType, Quantity, DonationDate"
+    sql = f"SELECT {columns} FROM Donation {where} ORDER BY DonationDate DESC, DonationID DESC LIMIT %s"
+    params += [page_size + 1]
+    if include_archive:
+        # Each side stops after a page's worth of rows, so the archive costs
+        # one index range read rather than a scan
+        sql = (f"SELECT * FROM ({sql}) AS hot UNION ALL "
+               f"SELECT * FROM ({sql.replace('FROM Donation', 'FROM DonationArchive')}) AS archived "
+               f"ORDER BY DonationDate DESC, DonationID DESC LIMIT %s")
+        params = params * 2 + [page_size + 1]
+    frame = fetch_frame(conn, sql, params, categorical=["ResourceType"])
+    return frame.iloc[:page_size], len(frame) > page_size
+
+
+def add_donation(conn, donor_name, resource_type, quantity, donation_date=None):
+    """Record a donation, its inventory upsert and rollup deltas in one transaction."""
+    donation_date = donation_date or date.today()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            INSERT INTO Donation (DonorName, ResourceType, Quantity, DonationDate)
+            VALUES (%s, %s, %s, %s)
+        """, (donor_name, resource_type, quantity, donation_date))
+        donation_id = cursor.lastrowid
+        add_inventory_deltas(cursor, {resource_type: quantity})
+        apply_donation_delta(cursor, resource_type, 1, quantity)
+        apply_daily_deltas(cursor, [(donation_date, resource_type, donor_name, quantity)])
+        conn.commit()
+        return donation_id
+    finally:
+        cursor.close()
+
+
+def add_queued_donations(conn, donations):
+    """Apply ``(key, donor, resource, quantity, date)`` rows from the ingestion journal.
+
+    One transaction for the whole batch: a multi-row Donation insert, one
+    inventory upsert and one rollup delta per resource type. Rows whose
+    idempotency key is already in Donation or DonationArchive (a batch
+    replayed after a crash) are skipped. Returns ``(inserted, duplicates)``.
+    """
+    if not donations:
+        return 0, 0
+    batch = {}
+    for key, donor_name, resource_type, quantity, donation_date in donations:
+        batch.setdefault(key, (donor_name, resource_type, int(quantity), donation_date))
+    cursor = conn.cursor()
+    try:
+        # The archive too: an old segment may be replayed after its year was archived
+        keys = ", ".join(["%s"] * len(batch))
+        cursor.execute(f"""
+            SELECT IdempotencyKey FROM Donation WHERE IdempotencyKey IN ({keys})
+            UNION ALL
+            SELECT IdempotencyKey FROM DonationArchive WHERE IdempotencyKey IN ({keys})
+        """, list(batch) * 2)
+        for (key,) in cursor.fetchall():
+            batch.pop(key, None)
+        if batch:
+            cursor.executemany("""
+                INSERT INTO Donation (DonorName, ResourceType, Quantity, DonationDate, IdempotencyKey)
+                VALUES (%s, %s, %s, %s, %s)
+            """, [row + (key,) for key, row in batch.items()])
+            totals = {}
+            for _, resource_type, quantity, _ in batch.values():
+                count, total = totals.get(resource_type, (0, 0))
+                totals[resource_type] = (count + 1, total + quantity)
+            add_inventory_deltas(cursor, {resource_type: total for resource_type, (_, total) in totals.items()})
+            apply_donation_deltas(cursor, totals)
+            apply_daily_deltas(cursor, [(donation_date, resource_type, donor_name, quantity)
+                                        for donor_name, resource_type, quantity, donation_date in batch.values()])
+        conn.commit()
+        return len(batch), len(donations) - len(batch)
+    finally:
+        cursor.close()
+
+
+# Inventory
+
+def list_inventory(conn):
+    return fetch_frame(conn, """
+        SELECT ItemID, ItemName, QuantityAvailable, ReorderLevel FROM Inventory ORDER BY ItemName
+    """)
+
+
+def low_stock_items(conn):
+    # Reads only the low items through idx_inventory_low_stock
+    return fetch_frame(conn, """
+        SELECT ItemID, ItemName, QuantityAvailable, ReorderLevel FROM Inventory
+        WHERE IsLowStock = 1 ORDER BY ItemName
+    """)
+
+
+def stock_alerts(conn, limit=50):
+    """The most recent threshold crossings, newest first."""
+    return fetch_frame(conn, """
+        SELECT AlertID, ItemName, AlertType, QuantityAvailable, ReorderLevel, CreatedAt
+        FROM StockAlert ORDER BY AlertID DESC LIMIT %s
+    """, (limit,), categorical=["AlertType"])
+
+
+def latest_stock_alert_id(conn):
+    return int(fetch_one(conn, "SELECT COALESCE(MAX(AlertID), 0) FROM StockAlert")[0])
+
+
+def stock_alerts_after(conn, alert_id, limit=20):
+    return fetch_all(conn, """
+        SELECT AlertID, ItemName, AlertType, QuantityAvailable, ReorderLevel
+        FROM StockAlert WHERE AlertID > %s ORDER BY AlertID LIMIT %s
+    """, (alert_id, limit))
+
+
+def disburse_item(conn, item_name, quantity):
+    """Take stock out for distribution; raises ``InsufficientStock`` if there is not enough."""
+    disburse_items(conn, {item_name: quantity})
+
+
+def disburse_items(conn, quantities):
+    """Disburse ``{item_name: quantity}`` in one transaction, all or nothing.
+
+    Items are updated in name order, like :func:`add_inventory_deltas`, so
+    concurrent batches cannot deadlock on each other's rows.
+    """
+    cursor = conn.cursor()
+    try:
+        for item_name, quantity in sorted(quantities.items()):
+            remove_inventory(cursor, item_name, quantity)
+        apply_disbursement_deltas(cursor, quantities)
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def restock_items(conn, quantities):
+    """Add ``{item_name: quantity}`` to stock outside of a donation, creating missing items."""
+    cursor = conn.cursor()
+    try:
+        add_inventory_deltas(cursor, quantities)
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def update_reorder_level(conn, item_name, level):
+    cursor = conn.cursor()
+    try:
+        set_reorder_level(cursor, item_name, level)
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+# Events
+
+def list_events(conn, start_date=None, end_date=None):
+    """Return ``(EventID, EventName, EventDate, Description, RequiredSkills, VolunteersNeeded,
+    Volunteers)`` rows by date, ``Volunteers`` being the number assigned so far."""
+    conditions, params = [], []
+    if start_date is not None:
+        conditions.append("e.EventDate >= %s")
+        params.append(start_date)
+    if end_date is not None:
+        conditions.append("e.EventDate <= %s")
+        params.append(end_date)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return fetch_all(conn, f"""
+        SELECT e.EventID, e.EventName, e.EventDate, e.Description, e.RequiredSkills, e.VolunteersNeeded,
+               COUNT(p.VolunteerID)
+        FROM Event e
+        LEFT JOIN Participation p ON p.EventID = e.EventID
+        {where}
+        GROUP BY e.EventID, e.EventName, e.EventDate, e.Description, e.RequiredSkills, e.VolunteersNeeded
+        ORDER BY e.EventDate, e.EventID
+    """, params)
+
+
+def event_volunteers(conn, event_id):
+    return fetch_all(conn, """
+        SELECT v.VolunteerID, v.Name, v.Email
+        FROM Participation p
+        JOIN Volunteer v ON v.VolunteerID = p.VolunteerID
+        WHERE p.EventID = %s
+        ORDER BY v.Name, v.VolunteerID
+    """, (event_id,))
+
+
+def volunteer_details(conn, volunteer_ids):
+    """Name, email and skills for a handful of volunteers, e.g. match candidates."""
+    import pandas as pd
+    from frames import frame_from_cursor
+
+    if not volunteer_ids:
+        return pd.DataFrame(columns=["VolunteerID", "Name", "Email", "Skills"])
+    placeholders = ", ".join(["%s"] * len(volunteer_ids))
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT VolunteerID, Name, Email, Skills FROM Volunteer WHERE VolunteerID IN ({placeholders})",
+                       [int(volunteer_id) for volunteer_id in volunteer_ids])
+        return frame_from_cursor(cursor, columns=["VolunteerID", "Name", "Email", "Skills"])
+    finally:
+        cursor.close()
+
+
+def add_event(conn, name, event_date, description=None, required_skills=None, volunteers_needed=1):
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            INSERT INTO Event (EventName, EventDate, Description, RequiredSkills, VolunteersNeeded)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (name, event_date, description, required_skills, volunteers_needed))
+        event_id = cursor.lastrowid
+        conn.commit()
+        return event_id
+    finally:
+        cursor.close()
+
+
+def add_participants(conn, assignments):
+    """Insert ``(EventID, VolunteerID)`` pairs in one transaction; returns how many were new.
+
+    Rows go in as multi-row ``INSERT IGNORE`` statements, so pairs that are
+    already assigned (say, by another session a moment earlier) are skipped by
+    the unique key instead of failing the batch.
+    """
+    rows = [(int(event_id), int(volunteer_id)) for event_id, volunteer_id in assignments]
+    if not rows:
+        return 0
+    inserted = 0
+    cursor = conn.cursor()
+    try:
+        for start in range(0, len(rows), PARTICIPATION_BATCH_SIZE):
+            batch = rows[start:start + PARTICIPATION_BATCH_SIZE]
+            cursor.execute(f"""
+                INSERT IGNORE INTO Participation (EventID, VolunteerID)
+                VALUES {", ".join(["(%s, %s)"] * len(batch))}
+            """, [value for row in batch for value in row])
+            inserted += cursor.rowcount
+        conn.commit()
+        return inserted
+    finally:
+        cursor.close()
+
+
+def statement_stats():
+    """Totals across live connections: cached statements, prepares and executions."""
+    with _statement_caches_lock:
+        caches = list(_statement_caches.values())
+    return {
+        "connections": len(caches),
+        "cached": sum(len(cache._cursors) for cache in caches),
+        "prepares": sum(cache.prepares for cache in caches),
+        "executions": sum(cache.executions for cache in caches),
+    }
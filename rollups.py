@@ -0,0 +1,345 @@
+"""Incrementally maintained dashboard aggregates.
+
+``DashboardSummary`` holds a single row of headline counts and
+``ResourceTotals`` one row per resource type (migration 0004);
+``DonationDaily`` holds one row per (date, resource type), with
+``DonationDailyDonor`` tracking who gave on each day (migration 0006);
+``DisbursementDaily`` holds one row per (date, item) disbursed (migration
+0011) and, having no base table, is neither checked nor rebuilt. Donations
+moved to DonationArchive (``partitions.py``) stay counted, so check and
+rebuild read both tables.
+Every write path applies its delta with the helpers below *before*
+committing, so the rollups always move in the same transaction as the base
+tables. The dashboard reads a constant number of rows and the Donation
+History page reads a number proportional to the selected date range.
+
+Usage:
+    python rollups.py check     # report drift against the base tables
+    python rollups.py rebuild   # recompute the rollups and report what changed
+"""
+import sys
+from datetime import date
+
+SUMMARY_ID = 1
+
+
+def apply_volunteer_delta(cursor, total_delta=0, available_delta=0):
+    if total_delta or available_delta:
+        cursor.execute("""
+            UPDATE DashboardSummary
+            SET TotalVolunteers = TotalVolunteers + %s,
+                AvailableVolunteers = AvailableVolunteers + %s
+            WHERE SummaryID = %s
+        """, (total_delta, available_delta, SUMMARY_ID))
+
+
+def apply_donation_delta(cursor, resource_type, count_delta, quantity_delta):
+    apply_donation_deltas(cursor, {resource_type: (count_delta, quantity_delta)})
+
+
+def apply_donation_deltas(cursor, deltas):
+    """Apply ``{resource_type: (count_delta, quantity_delta)}`` in two statements.
+
+    Batch writers pre-aggregate their rows so the summary row is touched once
+    per batch rather than once per donation.
+    """
+    if not deltas:
+        return
+    cursor.execute("""
+        UPDATE DashboardSummary
+        SET TotalDonations = TotalDonations + %s,
+            TotalQuantity = TotalQuantity + %s
+        WHERE SummaryID = %s
+    """, (sum(count for count, _ in deltas.values()),
+          sum(quantity for _, quantity in deltas.values()), SUMMARY_ID))
+    cursor.executemany("""
+        INSERT INTO ResourceTotals (ResourceType, DonationCount, TotalQuantity)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            DonationCount = DonationCount + VALUES(DonationCount),
+            TotalQuantity = TotalQuantity + VALUES(TotalQuantity)
+    """, [(resource, int(count), int(quantity)) for resource, (count, quantity) in deltas.items()])
+
+
+def apply_daily_deltas(cursor, donations):
+    """Fold ``(date, resource_type, donor_name, quantity)`` rows into DonationDaily.
+
+    Costs three statements however many donations are passed in: donor
+    membership is recorded with INSERT IGNORE, counts are upserted, and
+    UniqueDonors is recounted from DonationDailyDonor for the touched days only.
+    """
+    totals = {}
+    donors = set()
+    for donation_date, resource_type, donor_name, quantity in donations:
+        count, total = totals.get((donation_date, resource_type), (0, 0))
+        totals[(donation_date, resource_type)] = (count + 1, total + int(quantity))
+        if donor_name:
+            donors.add((donation_date, resource_type, donor_name))
+    if not totals:
+        return
+
+    keys = sorted(totals)
+    if donors:
+        cursor.executemany("""
+            INSERT IGNORE INTO DonationDailyDonor (DonationDate, ResourceType, DonorName)
+            VALUES (%s, %s, %s)
+        """, sorted(donors))
+    cursor.executemany("""
+        INSERT INTO DonationDaily (DonationDate, ResourceType, DonationCount, Quantity, UniqueDonors)
+        VALUES (%s, %s, %s, %s, 0)
+        ON DUPLICATE KEY UPDATE
+            DonationCount = DonationCount + VALUES(DonationCount),
+            Quantity = Quantity + VALUES(Quantity)
+    """, [key + totals[key] for key in keys])
+    cursor.execute(f"""
+        UPDATE DonationDaily
+        SET UniqueDonors = (
+            SELECT COUNT(*) FROM DonationDailyDonor x
+            WHERE x.DonationDate = DonationDaily.DonationDate AND x.ResourceType = DonationDaily.ResourceType
+        )
+        WHERE (DonationDate, ResourceType) IN ({", ".join(["(%s, %s)"] * len(keys))})
+    """, [value for key in keys for value in key])
+
+
+def apply_disbursement_deltas(cursor, quantities, disbursement_date=None):
+    """Add ``{item_name: quantity}`` to the day's DisbursementDaily rows in one statement."""
+    if not quantities:
+        return
+    disbursement_date = disbursement_date or date.today()
+    cursor.executemany("""
+        INSERT INTO DisbursementDaily (DisbursementDate, ItemName, Quantity)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE Quantity = Quantity + VALUES(Quantity)
+    """, [(disbursement_date, item_name, int(quantity)) for item_name, quantity in sorted(quantities.items())])
+
+
+def _daily_filter(start_date, end_date, resource_type):
+    conditions, params = [], []
+    if start_date is not None:
+        conditions.append("DonationDate >= %s")
+        params.append(start_date)
+    if end_date is not None:
+        conditions.append("DonationDate <= %s")
+        params.append(end_date)
+    if resource_type is not None:
+        conditions.append("ResourceType = %s")
+        params.append(resource_type)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+def read_daily_totals(cursor, start_date=None, end_date=None, resource_type=None):
+    """Return ``(donations, quantity, unique_donors, resource_types)`` for a range."""
+    where, params = _daily_filter(start_date, end_date, resource_type)
+    cursor.execute(f"""
+        SELECT COALESCE(SUM(DonationCount), 0), COALESCE(SUM(Quantity), 0), COUNT(DISTINCT ResourceType)
+        FROM DonationDaily {where}
+    """, params)
+    donations, quantity, resource_types = cursor.fetchone()
+    # Donors repeat across days, so distinct donors need the membership table
+    cursor.execute(f"SELECT COUNT(DISTINCT DonorName) FROM DonationDailyDonor {where}", params)
+    unique_donors = cursor.fetchone()[0]
+    return int(donations), int(quantity), int(unique_donors), int(resource_types)
+
+
+def read_daily_by_resource(cursor, start_date=None, end_date=None, resource_type=None):
+    where, params = _daily_filter(start_date, end_date, resource_type)
+    cursor.execute(f"""
+        SELECT ResourceType, SUM(Quantity)
+        FROM DonationDaily {where}
+        GROUP BY ResourceType
+        ORDER BY ResourceType
+    """, params)
+    return cursor.fetchall()
+
+
+def read_daily_series(cursor, start_date=None, end_date=None, resource_type=None):
+    where, params = _daily_filter(start_date, end_date, resource_type)
+    cursor.execute(f"""
+        SELECT DonationDate, SUM(Quantity)
+        FROM DonationDaily {where}
+        GROUP BY DonationDate
+        ORDER BY DonationDate
+    """, params)
+    return cursor.fetchall()
+
+
+def read_summary(cursor):
+    """Return ``(total_volunteers, available, total_donations, total_quantity)``."""
+    cursor.execute("""
+        SELECT TotalVolunteers, AvailableVolunteers, TotalDonations, TotalQuantity
+        FROM DashboardSummary WHERE SummaryID = %s
+    """, (SUMMARY_ID,))
+    row = cursor.fetchone()
+    return tuple(int(value) for value in row) if row else (0, 0, 0, 0)
+
+
+def read_top_resources(cursor, limit=5):
+    cursor.execute("""
+        SELECT ResourceType, TotalQuantity
+        FROM ResourceTotals
+        WHERE DonationCount > 0
+        ORDER BY TotalQuantity DESC
+        LIMIT %s
+    """, (limit,))
+    return cursor.fetchall()
+
+
+# Archived donations still count towards every rollup (migration 0013)
+_ALL_DONATIONS = """
+    (SELECT DonorName, ResourceType, Quantity, DonationDate FROM Donation
+     UNION ALL SELECT DonorName, ResourceType, Quantity, DonationDate FROM DonationArchive) AS donations
+"""
+
+
+def _compute_from_base(cursor):
+    cursor.execute("SELECT COUNT(*), SUM(CASE WHEN Availability = 1 THEN 1 ELSE 0 END) FROM Volunteer")
+    volunteers, available = cursor.fetchone()
+    cursor.execute(f"SELECT COUNT(*), SUM(Quantity) FROM {_ALL_DONATIONS}")
+    donations, quantity = cursor.fetchone()
+    summary = (int(volunteers or 0), int(available or 0), int(donations or 0), int(quantity or 0))
+    cursor.execute(f"SELECT ResourceType, COUNT(*), SUM(Quantity) FROM {_ALL_DONATIONS} GROUP BY ResourceType")
+    resources = {row[0]: (int(row[1]), int(row[2] or 0)) for row in cursor.fetchall()}
+    return summary, resources
+
+
+def _read_stored(cursor):
+    cursor.execute("SELECT ResourceType, DonationCount, TotalQuantity FROM ResourceTotals")
+    resources = {row[0]: (int(row[1]), int(row[2])) for row in cursor.fetchall()
+                 if row[1] or row[2]}
+    return read_summary(cursor), resources
+
+
+def check_drift(conn):
+    """Compare the rollups with the base tables.
+
+    Returns a list of human-readable differences; empty means no drift.
+    """
+    cursor = conn.cursor()
+    try:
+        expected_summary, expected_resources = _compute_from_base(cursor)
+        stored_summary, stored_resources = _read_stored(cursor)
+    finally:
+        cursor.close()
+
+    drift = []
+    labels = ("TotalVolunteers", "AvailableVolunteers", "TotalDonations", "TotalQuantity")
+    for label, stored, expected in zip(labels, stored_summary, expected_summary):
+        if stored != expected:
+            drift.append(f"DashboardSummary.{label}: stored {stored}, actual {expected}")
+    for resource in sorted(set(expected_resources) | set(stored_resources), key=str):
+        stored = stored_resources.get(resource, (0, 0))
+        expected = expected_resources.get(resource, (0, 0))
+        if stored != expected:
+            drift.append(f"ResourceTotals[{resource}]: stored (count, quantity) {stored}, actual {expected}")
+    drift.extend(_check_daily_drift(conn))
+    return drift
+
+
+_DAILY_FROM_BASE = f"""
+    SELECT DonationDate, ResourceType, COUNT(*) AS DonationCount,
+           COALESCE(SUM(Quantity), 0) AS Quantity, COUNT(DISTINCT DonorName) AS UniqueDonors
+    FROM {_ALL_DONATIONS}
+    WHERE DonationDate IS NOT NULL AND ResourceType IS NOT NULL
+    GROUP BY DonationDate, ResourceType
+"""
+
+
+def _check_daily_drift(conn, sample=10):
+    # Compared server-side: history can span far more days than we want to ship
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"""
+            SELECT b.DonationDate, b.ResourceType,
+                   COALESCE(d.DonationCount, 0), COALESCE(d.Quantity, 0), COALESCE(d.UniqueDonors, 0),
+                   b.DonationCount, b.Quantity, b.UniqueDonors
+            FROM ({_DAILY_FROM_BASE}) b
+            LEFT JOIN DonationDaily d
+                ON d.DonationDate = b.DonationDate AND d.ResourceType = b.ResourceType
+            WHERE d.DonationDate IS NULL OR d.DonationCount <> b.DonationCount
+               OR d.Quantity <> b.Quantity OR d.UniqueDonors <> b.UniqueDonors
+            UNION ALL
+            SELECT d.DonationDate, d.ResourceType, d.DonationCount, d.Quantity, d.UniqueDonors, 0, 0, 0
+            FROM DonationDaily d
+            LEFT JOIN ({_DAILY_FROM_BASE}) b
+                ON b.DonationDate = d.DonationDate AND b.ResourceType = d.ResourceType
+            WHERE b.DonationDate IS NULL AND (d.DonationCount <> 0 OR d.Quantity <> 0)
+        """)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    drift = [f"DonationDaily[{row[0]}, {row[1]}]: stored (count, quantity, donors) "
+             f"{tuple(int(v) for v in row[2:5])}, actual {tuple(int(v) for v in row[5:8])}"
+             for row in rows[:sample]]
+    if len(rows) > sample:
+        drift.append(f"DonationDaily: {len(rows) - sample} more drifted days not shown")
+    return drift
+
+
+def rebuild(conn):
+    """Recompute all rollups from the base tables in one transaction.
+
+    Every write path updates the DashboardSummary row before it commits, so
+    locking that row first holds writers off until the rollups are replaced:
+    a write already in flight is counted once it commits, and one that starts
+    later applies its delta on top of the rebuilt values. Returns the drift
+    that was corrected.
+    """
+    cursor = conn.cursor()
+    try:
+        # A no-op UPDATE rather than SELECT ... FOR UPDATE: it takes the row
+        # lock on MySQL and the write lock on SQLite, which has no row locks
+        cursor.execute("UPDATE DashboardSummary SET SummaryID = SummaryID WHERE SummaryID = %s", (SUMMARY_ID,))
+        drift = check_drift(conn)
+        summary, resources = _compute_from_base(cursor)
+        cursor.execute("DELETE FROM DashboardSummary")
+        cursor.execute("""
+            INSERT INTO DashboardSummary
+                (SummaryID, TotalVolunteers, AvailableVolunteers, TotalDonations, TotalQuantity)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (SUMMARY_ID,) + summary)
+        cursor.execute("DELETE FROM ResourceTotals")
+        if resources:
+            cursor.executemany(
+                "INSERT INTO ResourceTotals (ResourceType, DonationCount, TotalQuantity) VALUES (%s, %s, %s)",
+                [(resource, count, quantity) for resource, (count, quantity) in resources.items()]
+            )
+        cursor.execute("DELETE FROM DonationDailyDonor")
+        cursor.execute(f"""
+            INSERT INTO DonationDailyDonor (DonationDate, ResourceType, DonorName)
+            SELECT DISTINCT DonationDate, ResourceType, DonorName
+            FROM {_ALL_DONATIONS}
+            WHERE DonationDate IS NOT NULL AND ResourceType IS NOT NULL AND DonorName IS NOT NULL
+        """)
+        cursor.execute("DELETE FROM DonationDaily")
+        cursor.execute(f"""
+            INSERT INTO DonationDaily (DonationDate, ResourceType, DonationCount, Quantity, UniqueDonors)
+            {_DAILY_FROM_BASE}
+        """)
+        conn.commit()
+    finally:
+        cursor.close()
+    return drift
+
+
+if __name__ == "__main__":
+    from db_config import pooled_connection
+
+    if len(sys.argv) != 2 or sys.argv[1] not in ("check", "rebuild"):
+        print(__doc__)
+        sys.exit(1)
+
+    with pooled_connection() as conn:
+        if sys.argv[1] == "check":
+            drift = check_drift(conn)
+        else:
+            drift = rebuild(conn)
+    for line in drift:
+        print(f"⚠️ {line}")
+    if sys.argv[1] == "rebuild":
+        print(f"✅ Rollups rebuilt ({len(drift)} drifted values corrected)")
+    elif drift:
+        sys.exit(2)
+    else:
+        print("✅ Rollups match the base tables")
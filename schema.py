@@ -0,0 +1,78 @@
+"""Cached schema introspection.
+
+Table layouts only change when migrations run, so each table is described
+once per process and kept until ``clear_schema_cache()`` is called
+(``migrate.upgrade`` does this after applying anything).
+"""
+import threading
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ColumnInfo:
+    name: str
+    data_type: str
+    nullable: bool
+    key: str
+
+    @property
+    def is_primary_key(self):
+        return self.key == "PRI"
+
+
+_tables = {}
+_lock = threading.Lock()
+
+
+def _load_columns(table):
+    from db_config import pooled_connection
+
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            if getattr(conn, "dialect", "mysql") == "sqlite":
+                cursor.execute(f"PRAGMA table_info({table})")
+                rows = [(name, data_type.lower(), "NO" if notnull or pk else "YES", "PRI" if pk else "")
+                        for _, name, data_type, notnull, _, pk in cursor.fetchall()]
+            else:
+                cursor.execute("""
+                    SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_KEY
+                    FROM information_schema.COLUMNS
+                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+                    ORDER BY ORDINAL_POSITION
+                """, (table,))
+                rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    if not rows:
+        raise LookupError(f"Table {table!r} does not exist")
+    return tuple(ColumnInfo(name, data_type, nullable == "YES", key)
+                 for name, data_type, nullable, key in rows)
+
+
+def describe_table(table):
+    """Return the table's columns as ``ColumnInfo`` tuples, in table order."""
+    columns = _tables.get(table)
+    if columns is None:
+        columns = _load_columns(table)
+        with _lock:
+            _tables[table] = columns
+    return columns
+
+
+def table_columns(table):
+    return [column.name for column in describe_table(table)]
+
+
+def primary_key(table):
+    """Return the name of the table's (first) primary key column."""
+    columns = describe_table(table)
+    for column in columns:
+        if column.is_primary_key:
+            return column.name
+    return columns[0].name
+
+
+def clear_schema_cache():
+    with _lock:
+        _tables.clear()
@@ -0,0 +1,151 @@
+"""Indexed skill search for volunteers.
+
+Free-text ``Volunteer.Skills`` values are split into normalized word tokens and
+stored in the ``VolunteerSkill`` side table (migration 0003), whose primary key
+``(Token, VolunteerID)`` turns every skill lookup into an index range scan.
+
+Queries use ``AND`` / ``OR`` (``OR`` binds loosest), e.g.
+``Teaching AND Medical OR First Aid``. Results are ranked by how many of the
+query's tokens a volunteer matches.
+
+Usage:
+    python skill_search.py rebuild          # backfill the index from Volunteer
+    python skill_search.py "Teaching AND Medical"
+"""
+import re
+import sys
+
+TOKEN_MAX_LENGTH = 50
+STOP_WORDS = {"a", "an", "and", "or", "the", "of", "in", "with", "for", "to", "e", "g", "etc"}
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+_OR_RE = re.compile(r"\s+OR\s+|\s*[|,;]\s*", re.IGNORECASE)
+_AND_RE = re.compile(r"\s+AND\s+|\s*&\s*", re.IGNORECASE)
+
+
+def tokenize_skills(text):
+    """Return the sorted set of normalized tokens for a skills string."""
+    if not text:
+        return []
+    words = _WORD_RE.findall(text.lower())
+    return sorted({word[:TOKEN_MAX_LENGTH] for word in words if word not in STOP_WORDS})
+
+
+def parse_query(query):
+    """Parse a skill query into OR-ed groups of AND-ed tokens.
+
+    ``"Teaching AND Medical OR IT"`` becomes ``[["medical", "teaching"], ["it"]]``.
+    A multi-word term such as ``"Event Management"`` requires all of its words.
+    """
+    groups = []
+    for alternative in _OR_RE.split(query or ""):
+        tokens = set()
+        for term in _AND_RE.split(alternative):
+            tokens.update(tokenize_skills(term))
+        if tokens and sorted(tokens) not in groups:
+            groups.append(sorted(tokens))
+    return groups
+
+
+def sync_volunteer_skills(cursor, volunteer_id, skills):
+    """Rewrite the index rows for one volunteer.
+
+    Call inside the same transaction as the Volunteer INSERT/UPDATE so the
+    index can never drift from the base table.
+    """
+    cursor.execute("DELETE FROM VolunteerSkill WHERE VolunteerID = %s", (volunteer_id,))
+    tokens = tokenize_skills(skills)
+    if tokens:
+        cursor.executemany(
+            "INSERT INTO VolunteerSkill (Token, VolunteerID) VALUES (%s, %s)",
+            [(token, volunteer_id) for token in tokens]
+        )
+
+
+def search_volunteers(cursor, query, limit=50, available_only=False):
+    """Return volunteers matching a skill query, best matches first.
+
+    Each row is ``(VolunteerID, Name, Email, Skills, Availability, score)``
+    where ``score`` is the number of distinct query tokens the volunteer has.
+    """
+    groups = parse_query(query)
+    if not groups:
+        return []
+
+    all_tokens = sorted({token for group in groups for token in group})
+    group_columns, having, params = [], [], []
+    for i, group in enumerate(groups):
+        placeholders = ", ".join(["%s"] * len(group))
+        group_columns.append(f"SUM(CASE WHEN Token IN ({placeholders}) THEN 1 ELSE 0 END) AS g{i}")
+        having.append(f"g{i} = {len(group)}")
+        params += group
+    params += all_tokens
+
+    availability = "WHERE v.Availability = 1" if available_only else ""
+    cursor.execute(f"""
+        SELECT v.VolunteerID, v.Name, v.Email, v.Skills, v.Availability, m.score
+        FROM (
+            SELECT VolunteerID, COUNT(*) AS score, {", ".join(group_columns)}
+            FROM VolunteerSkill
+            WHERE Token IN ({", ".join(["%s"] * len(all_tokens))})
+            GROUP BY VolunteerID
+            HAVING {" OR ".join(having)}
+        ) m
+        JOIN Volunteer v ON v.VolunteerID = m.VolunteerID
+        {availability}
+        ORDER BY m.score DESC, v.Name
+        LIMIT %s
+    """, params + [limit])
+    return cursor.fetchall()
+
+
+def rebuild_skill_index(conn, batch_size=5000):
+    """Recompute the whole VolunteerSkill table from Volunteer.Skills.
+
+    Returns the number of volunteers indexed.
+    """
+    read_cursor = conn.cursor()
+    write_cursor = conn.cursor()
+    try:
+        write_cursor.execute("DELETE FROM VolunteerSkill")
+        indexed = 0
+        last_id = 0
+        while True:
+            read_cursor.execute(
+                "SELECT VolunteerID, Skills FROM Volunteer WHERE VolunteerID > %s "
+                "ORDER BY VolunteerID LIMIT %s",
+                (last_id, batch_size)
+            )
+            rows = read_cursor.fetchall()
+            if not rows:
+                break
+            entries = [(token, volunteer_id) for volunteer_id, skills in rows
+                       for token in tokenize_skills(skills)]
+            if entries:
+                write_cursor.executemany(
+                    "INSERT INTO VolunteerSkill (Token, VolunteerID) VALUES (%s, %s)", entries
+                )
+            indexed += len(rows)
+            last_id = rows[-1][0]
+        conn.commit()
+        return indexed
+    finally:
+        read_cursor.close()
+        write_cursor.close()
+
+
+if __name__ == "__main__":
+    from db_config import pooled_connection
+
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    with pooled_connection() as conn:
+        if sys.argv[1] == "rebuild":
+            print(f"✅ Indexed skills for {rebuild_skill_index(conn)} volunteers")
+        else:
+            cursor = conn.cursor()
+            for volunteer_id, name, email, skills, _, score in search_volunteers(cursor, " ".join(sys.argv[1:])):
+                print(f"{score:>3}  {name} <{email}>  {skills}")
+            cursor.close()
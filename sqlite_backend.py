@@ -0,0 +1,136 @@
+"""SQLite stand-in for the MySQL database.
+
+``connect_sqlite()`` returns a connection whose cursors accept the MySQL
+flavoured SQL used throughout the app: ``%s`` placeholders, backslash-escaped
+``LIKE`` patterns, ``INSERT IGNORE``, ``ON DUPLICATE KEY UPDATE ... VALUES(col)``
+and ``SELECT ... FOR UPDATE``. It lets the benchmarks and local experiments run
+without a MySQL server; it is not meant to serve production traffic.
+"""
+import os
+import re
+import sqlite3
+from datetime import date, datetime
+from functools import lru_cache
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sqlite_schema.sql")
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+
+_LIKE_RE = re.compile(r"\bLIKE\s+\?", re.IGNORECASE)
+_UPSERT_RE = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.IGNORECASE)
+_VALUES_FN_RE = re.compile(r"\bVALUES\((\w+)\)", re.IGNORECASE)
+_FOR_UPDATE_RE = re.compile(r"\s+FOR\s+UPDATE\s*$", re.IGNORECASE)
+_INSERT_IGNORE_RE = re.compile(r"^\s*INSERT\s+IGNORE\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def translate(sql):
+    """Rewrite one MySQL-flavoured statement into SQLite syntax."""
+    sql = sql.replace("%s", "?")
+    sql = _LIKE_RE.sub(r"LIKE ? ESCAPE '\\'", sql)
+    sql = _INSERT_IGNORE_RE.sub("INSERT OR IGNORE", sql)
+    sql = _FOR_UPDATE_RE.sub("", sql)
+    match = _UPSERT_RE.search(sql)
+    if match:
+        head, tail = sql[:match.start()], sql[match.end():]
+        sql = head + "ON CONFLICT DO UPDATE SET" + _VALUES_FN_RE.sub(r"excluded.\1", tail)
+    return sql
+
+
+class SQLiteCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(translate(sql), tuple(params))
+
+    def executemany(self, sql, seq_params):
+        self._cursor.executemany(translate(sql), [tuple(params) for params in seq_params])
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size=None):
+        return self._cursor.fetchmany(size or self._cursor.arraysize)
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def with_rows(self):
+        return self._cursor.description is not None
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    dialect = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False,
+                                     detect_types=sqlite3.PARSE_DECLTYPES)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.create_function("CURDATE", 0, lambda: date.today().isoformat())
+        self._conn.create_function("NOW", 0, lambda: datetime.now().isoformat(" ", "seconds"))
+
+    def cursor(self):
+        return SQLiteCursor(self._conn.cursor())
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+def connect_sqlite(path):
+    return SQLiteConnection(path)
+
+
+def copy_database(source, dest):
+    """Copy the database at ``source`` to ``dest`` with SQLite's online backup.
+
+    Used to stand up and refresh read replicas of the stand-in backend; readers
+    of ``dest`` keep their connections and see the copy once it completes.
+    """
+    src = sqlite3.connect(source)
+    try:
+        dst = sqlite3.connect(dest)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+
+def create_schema(conn):
+    """Create the stand-in schema on a fresh (or existing) SQLite database."""
+    with open(SCHEMA_FILE, encoding="utf-8") as f:
+        conn._conn.executescript(f.read())
+    conn.commit()
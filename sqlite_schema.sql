@@ -0,0 +1,141 @@
+-- SQLite stand-in for the MySQL schema built by migrations/0001-0014.
+-- Keep in step with new migrations; used by sqlite_backend.create_schema().
+PRAGMA foreign_keys = ON;
+
+CREATE TABLE IF NOT EXISTS Volunteer (
+    VolunteerID INTEGER PRIMARY KEY,
+    Name VARCHAR(100),
+    Email VARCHAR(100) UNIQUE,
+    Phone VARCHAR(15),
+    Skills TEXT,
+    Availability BOOLEAN
+);
+
+CREATE TABLE IF NOT EXISTS Donation (
+    DonationID INTEGER PRIMARY KEY,
+    DonorName VARCHAR(100),
+    ResourceType VARCHAR(50),
+    Quantity INT,
+    DonationDate DATE,
+    IdempotencyKey VARCHAR(64)
+);
+
+CREATE TABLE IF NOT EXISTS Inventory (
+    ItemID INTEGER PRIMARY KEY,
+    ItemName VARCHAR(100) UNIQUE,
+    QuantityAvailable INT,
+    ReorderLevel INT NOT NULL DEFAULT 10,
+    IsLowStock BOOLEAN NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_inventory_low_stock ON Inventory (IsLowStock, ItemName);
+
+CREATE TABLE IF NOT EXISTS StockAlert (
+    AlertID INTEGER PRIMARY KEY,
+    ItemID INT NOT NULL,
+    ItemName VARCHAR(100) NOT NULL,
+    AlertType VARCHAR(10) NOT NULL,
+    QuantityAvailable INT NOT NULL,
+    ReorderLevel INT NOT NULL,
+    CreatedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_stockalert_item ON StockAlert (ItemID, AlertID);
+
+CREATE TABLE IF NOT EXISTS ChildProfile (
+    ChildID INTEGER PRIMARY KEY,
+    Age INT,
+    Gender VARCHAR(10),
+    SupportType VARCHAR(100),
+    Comments TEXT
+);
+
+CREATE TABLE IF NOT EXISTS Event (
+    EventID INTEGER PRIMARY KEY,
+    EventName VARCHAR(100),
+    EventDate DATE,
+    Description TEXT,
+    RequiredSkills VARCHAR(255),
+    VolunteersNeeded INT NOT NULL DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS Participation (
+    ParticipationID INTEGER PRIMARY KEY,
+    EventID INT REFERENCES Event(EventID),
+    VolunteerID INT REFERENCES Volunteer(VolunteerID)
+);
+
+CREATE TABLE IF NOT EXISTS VolunteerSkill (
+    Token VARCHAR(50) NOT NULL,
+    VolunteerID INT NOT NULL REFERENCES Volunteer(VolunteerID) ON DELETE CASCADE,
+    PRIMARY KEY (Token, VolunteerID)
+);
+CREATE INDEX IF NOT EXISTS idx_volunteerskill_volunteer ON VolunteerSkill (VolunteerID);
+
+CREATE TABLE IF NOT EXISTS DashboardSummary (
+    SummaryID TINYINT PRIMARY KEY,
+    TotalVolunteers INT NOT NULL DEFAULT 0,
+    AvailableVolunteers INT NOT NULL DEFAULT 0,
+    TotalDonations INT NOT NULL DEFAULT 0,
+    TotalQuantity BIGINT NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO DashboardSummary (SummaryID) VALUES (1);
+
+CREATE TABLE IF NOT EXISTS ResourceTotals (
+    ResourceType VARCHAR(50) PRIMARY KEY,
+    DonationCount INT NOT NULL DEFAULT 0,
+    TotalQuantity BIGINT NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_resourcetotals_quantity ON ResourceTotals (TotalQuantity);
+
+CREATE TABLE IF NOT EXISTS DonationDaily (
+    DonationDate DATE NOT NULL,
+    ResourceType VARCHAR(50) NOT NULL,
+    DonationCount INT NOT NULL DEFAULT 0,
+    Quantity BIGINT NOT NULL DEFAULT 0,
+    UniqueDonors INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (DonationDate, ResourceType)
+);
+CREATE INDEX IF NOT EXISTS idx_donationdaily_resource_date ON DonationDaily (ResourceType, DonationDate);
+
+CREATE TABLE IF NOT EXISTS DonationDailyDonor (
+    DonationDate DATE NOT NULL,
+    ResourceType VARCHAR(50) NOT NULL,
+    DonorName VARCHAR(100) NOT NULL,
+    PRIMARY KEY (DonationDate, ResourceType, DonorName)
+);
+CREATE INDEX IF NOT EXISTS idx_donationdailydonor_donor ON DonationDailyDonor (DonorName, DonationDate);
+
+CREATE TABLE IF NOT EXISTS DisbursementDaily (
+    DisbursementDate DATE NOT NULL,
+    ItemName VARCHAR(100) NOT NULL,
+    Quantity BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (DisbursementDate, ItemName)
+);
+
+CREATE INDEX IF NOT EXISTS idx_donation_date ON Donation (DonationDate);
+CREATE INDEX IF NOT EXISTS idx_donation_resource_date ON Donation (ResourceType, DonationDate);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_donation_idempotency ON Donation (IdempotencyKey);
+CREATE INDEX IF NOT EXISTS idx_volunteer_name ON Volunteer (Name);
+CREATE INDEX IF NOT EXISTS idx_volunteer_availability_name ON Volunteer (Availability, Name);
+CREATE INDEX IF NOT EXISTS idx_event_date ON Event (EventDate);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_participation_event_volunteer ON Participation (EventID, VolunteerID);
+CREATE INDEX IF NOT EXISTS idx_participation_volunteer_event ON Participation (VolunteerID, EventID);
+
+CREATE TABLE IF NOT EXISTS ReplicaHeartbeat (
+    HeartbeatID INTEGER NOT NULL PRIMARY KEY,
+    BeatAt REAL NOT NULL
+);
+
+INSERT OR IGNORE INTO ReplicaHeartbeat (HeartbeatID, BeatAt) VALUES (1, 0);
+
+-- Donation is not partitioned here; partitions.py archives by date range instead
+CREATE TABLE IF NOT EXISTS DonationArchive (
+    DonationID INTEGER NOT NULL PRIMARY KEY,
+    DonorName VARCHAR(100),
+    ResourceType VARCHAR(50),
+    Quantity INT,
+    DonationDate DATE NOT NULL,
+    IdempotencyKey VARCHAR(64)
+);
+CREATE INDEX IF NOT EXISTS idx_donationarchive_date ON DonationArchive (DonationDate);
+CREATE INDEX IF NOT EXISTS idx_donationarchive_resource_date ON DonationArchive (ResourceType, DonationDate);
+CREATE INDEX IF NOT EXISTS idx_donationarchive_idempotency ON DonationArchive (IdempotencyKey);
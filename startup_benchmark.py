@@ -0,0 +1,123 @@
+"""Cold-start and rerun timing for each page.
+
+Every page is opened in a fresh interpreter with Streamlit's ``AppTest``: the
+first run pays for importing whatever the page needs, as the first visitor
+after a deploy or restart does, and the reruns that follow show what each
+interaction costs once everything is loaded. The probe also records which of
+pandas, NumPy and Plotly the page caused to be imported; the form pages should
+load none of them.
+
+Only the standard library is imported here, so the probe's own imports do not
+count towards the page's. Point it at a database generated with ``datagen.py``
+or ``benchmark.py --generate``.
+
+Usage:
+    python startup_benchmark.py --sqlite-path bench.sqlite3 --output startup.json
+    python startup_benchmark.py --page views/add_donation.py --iterations 50
+    python startup_benchmark.py --compare startup.json
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+# Page scripts, relative to app.py, in menu order
+PAGES = ["views/dashboard.py", "views/add_volunteer.py", "views/add_donation.py", "views/view_volunteers.py",
+         "views/view_donations.py", "views/analytics.py", "views/inventory.py", "views/events.py",
+         "views/bulk_import.py", "views/admin.py"]
+HEAVY_MODULES = ("pandas", "numpy", "plotly.express")
+
+
+def probe(page, iterations):
+    """First run and rerun times for ``page`` in this interpreter; call it in a fresh one."""
+    from streamlit.testing.v1 import AppTest, app_test, local_script_runner
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    # A server compiles each script once and keeps the bytecode; AppTest would
+    # recompile (and re-run magic on) every script on every run
+    script_cache = app_test.ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+    at = AppTest.from_file(APP_FILE, default_timeout=300)
+    # Before the first run a page is found by its file name, so this opens it directly
+    at.switch_page(page)
+    start = time.perf_counter()
+    at.run()
+    first_run = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].value}")
+    reruns = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        at.run()
+        reruns.append((time.perf_counter() - start) * 1000)
+    return {
+        "first_run_ms": round(first_run * 1000, 1),
+        "rerun_p50_ms": round(statistics.median(reruns), 2),
+        "rerun_p95_ms": round(statistics.quantiles(reruns, n=20)[-1], 2) if len(reruns) > 1 else round(reruns[0], 2),
+        "imported": [module for module in HEAVY_MODULES if module in sys.modules],
+    }
+
+
+def run(pages, iterations, env, log=print):
+    """Probe each page in its own interpreter."""
+    results = {}
+    for page in pages:
+        command = [sys.executable, os.path.abspath(__file__), "--probe", page, "--iterations", str(iterations)]
+        output = subprocess.run(command, capture_output=True, text=True, check=True, env=env).stdout
+        results[page] = result = json.loads(output.strip().splitlines()[-1])
+        log(f"{page:<26} first run {result['first_run_ms']:>8.1f} ms  rerun p50 {result['rerun_p50_ms']:>7.1f} ms  "
+            f"p95 {result['rerun_p95_ms']:>7.1f} ms  imports {', '.join(result['imported']) or '-'}")
+    return results
+
+
+def compare(results, baseline):
+    print(f"\n{'page':<26} {'first run':>18} {'rerun p50':>18}")
+    for page, result in results.items():
+        old = baseline.get("pages", {}).get(page)
+        if not old:
+            continue
+        print(f"{page:<26} {old['first_run_ms']:>7.0f} → {result['first_run_ms']:>6.0f} ms "
+              f"{old['rerun_p50_ms']:>7.1f} → {result['rerun_p50_ms']:>6.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time each page's first run and reruns in a fresh process.")
+    parser.add_argument("--backend", choices=["mysql", "sqlite"], default="sqlite")
+    parser.add_argument("--sqlite-path", default="bench.sqlite3")
+    parser.add_argument("--iterations", type=int, default=20, help="reruns per page")
+    parser.add_argument("--page", action="append", help="only probe these page scripts")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against a previous JSON result")
+    parser.add_argument("--probe", metavar="PAGE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(probe(args.probe, args.iterations)))
+        sys.exit(0)
+
+    # The app reads its backend from the environment when the probe imports it
+    env = dict(os.environ, NGO_DB_BACKEND=args.backend, NGO_SQLITE_PATH=args.sqlite_path)
+    results = run(args.page or PAGES, args.iterations, env)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "backend": args.backend,
+            "iterations": args.iterations,
+            "python": sys.version.split()[0],
+        },
+        "pages": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Results written to {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f))
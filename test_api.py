@@ -0,0 +1,76 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+import api
+
+
+@pytest.fixture
+def client(db):
+    server = api.make_server("127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    yield conn
+    conn.close()
+    server.shutdown()
+    server.server_close()
+
+
+def _call(conn, method, path, body=None):
+    conn.request(method, path, body=None if body is None else json.dumps(body),
+                 headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_donations_round_trip_in_pages(client):
+    records = [{"donor": f"Donor {day}", "resource": "Books", "quantity": day, "date": f"2024-03-{day:02d}"}
+               for day in range(1, 6)]
+    assert _call(client, "POST", "/donations", {"records": records}) == (201, {"inserted": 5, "rejected": []})
+
+    donors, path = [], "/donations?limit=2"
+    while path:
+        status, page = _call(client, "GET", path)
+        assert status == 200
+        donors += [item["DonorName"] for item in page["items"]]
+        path = page["next"] and "/donations?limit=2&after_date={after_date}&after_id={after_id}".format(**page["next"])
+    assert donors == [f"Donor {day}" for day in range(5, 0, -1)]
+
+
+def test_disbursement_is_all_or_nothing(client):
+    stock = [{"item": "Books", "quantity": 5}, {"item": "Clothing", "quantity": 2}]
+    assert _call(client, "POST", "/inventory", stock) == (201, {"items": 2, "quantity": 7})
+
+    status, payload = _call(client, "POST", "/inventory/disbursements",
+                            [{"item": "Books", "quantity": 4}, {"item": "Clothing", "quantity": 3}])
+    assert status == 409 and "Clothing" in payload["error"]
+    _, inventory = _call(client, "GET", "/inventory")
+    assert {item["ItemName"]: item["QuantityAvailable"] for item in inventory["items"]} == {"Books": 5, "Clothing": 2}
+
+
+@pytest.mark.parametrize("body, status", [
+    ([], 400),
+    ("text", 400),
+    ([{"item": "Books", "quantity": 0}], 422),
+    ([{"quantity": 2}], 422),
+])
+def test_invalid_stock_records_are_rejected(client, body, status):
+    assert _call(client, "POST", "/inventory", body)[0] == status
+
+
+def test_unknown_route_and_bad_parameters(client):
+    assert _call(client, "GET", "/nowhere")[0] == 404
+    assert _call(client, "GET", "/volunteers?availability=Sometimes")[0] == 400
+    assert _call(client, "GET", "/donations?start=yesterday")[0] == 400
+
+
+def test_oversized_body_closes_the_connection(client, monkeypatch):
+    monkeypatch.setattr(api, "MAX_BODY_BYTES", 10)
+    client.request("POST", "/donations", body=json.dumps([{"donor": "Asha"}]))
+    response = client.getresponse()
+    response.read()
+
+    assert response.status == 413
+    assert response.getheader("Connection") == "close"
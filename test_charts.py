@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from charts import OTHER_LABEL, lttb, time_series, top_categories
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(1000)
+    y = np.sin(x / 50.0)
+    y[437] = 25.0
+
+    kept = lttb(x, y, 50)
+
+    assert len(kept) == 50
+    assert kept[0] == 0 and kept[-1] == 999
+    assert np.all(np.diff(kept) > 0)
+    assert 437 in kept
+
+
+def test_lttb_returns_short_series_unchanged():
+    assert list(lttb([1, 2, 3], [4, 5, 6], 10)) == [0, 1, 2]
+
+
+def test_time_series_buckets_long_ranges():
+    start = date(2020, 1, 1)
+    rows = [(start + timedelta(days=day), 1) for day in range(3 * 365)]
+
+    frame, bucket = time_series(rows, max_points=200)
+
+    assert bucket == "week"
+    assert len(frame) <= 200
+    # Weekly totals: every full week sums seven daily donations
+    assert frame["Quantity"].max() == 7
+    assert frame["Date"].iloc[0] == pd.Timestamp(2019, 12, 30)
+
+
+def test_top_categories_folds_the_rest_into_other():
+    frame = pd.DataFrame({"Donor": list("abcdef"), "Quantity": [5, 1, 9, 3, 9, 2]})
+
+    top = top_categories(frame, "Donor", "Quantity", limit=3)
+
+    assert list(top["Donor"]) == ["c", "e", OTHER_LABEL]
+    assert list(top["Quantity"]) == [9, 9, 11]
@@ -0,0 +1,130 @@
+import threading
+import time
+
+import pytest
+
+import repository
+from db_config import ConnectionPool, PoolTimeout, ReadRouter, Replica, get_pool
+from sqlite_backend import connect_sqlite, copy_database
+
+
+class FakeConnection:
+    def __init__(self):
+        self.in_transaction = False
+        self.rollbacks = 0
+        self.closed = False
+        self.pings = 0
+        self.alive = True
+
+    def ping(self, reconnect=False):
+        self.pings += 1
+        if not self.alive:
+            raise OSError("server has gone away")
+
+    def reconnect(self, attempts=1, delay=0):
+        raise OSError("still gone")
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_connections_are_created_lazily_and_reused():
+    pool = ConnectionPool(factory=FakeConnection, size=2, timeout=0.1)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as again:
+        assert again is first
+    assert pool.metrics()["open"] == 1
+
+
+def test_checkout_times_out_when_every_connection_is_in_use():
+    pool = ConnectionPool(factory=FakeConnection, size=1, timeout=0.05)
+    with pool.connection():
+        with pytest.raises(PoolTimeout):
+            pool.acquire()
+    assert pool.metrics()["timeouts"] == 1
+
+
+def test_waiting_checkout_gets_the_released_connection():
+    pool = ConnectionPool(factory=FakeConnection, size=1, timeout=5)
+    conn = pool.acquire()
+    threading.Timer(0.05, pool.release, (conn,)).start()
+    assert pool.acquire() is conn
+
+
+def test_release_rolls_back_an_open_transaction():
+    pool = ConnectionPool(factory=FakeConnection, size=1, timeout=0.1)
+    with pool.connection() as conn:
+        conn.in_transaction = True
+    assert conn.rollbacks == 1
+    with pool.connection() as conn:
+        pass
+    assert conn.rollbacks == 1
+
+
+def test_dead_idle_connection_is_replaced_on_checkout():
+    pool = ConnectionPool(factory=FakeConnection, size=1, timeout=0.1, ping_after=0)
+    with pool.connection() as conn:
+        conn.alive = False
+    with pool.connection() as fresh:
+        assert fresh is not conn
+    assert conn.closed
+    assert pool.metrics()["reconnects"] == 1
+
+
+@pytest.fixture
+def router(db, tmp_path):
+    """A router over the test database and one SQLite replica copied from it."""
+    replica_path = str(tmp_path / "replica.sqlite3")
+    copy_database(db.path, replica_path)
+    replica = Replica(replica_path, ConnectionPool(factory=lambda: connect_sqlite(replica_path)))
+    return ReadRouter(get_pool(), [replica], max_lag=5, heartbeat=0)
+
+
+def _refresh(router, db):
+    router.write_heartbeat()
+    copy_database(db.path, router.replicas[0].target)
+
+
+def _volunteers_seen(router, tables=("Volunteer",), max_lag=None):
+    with router.connection(tables, max_lag) as conn:
+        return repository.fetch_one(conn, "SELECT COUNT(*) FROM Volunteer")[0]
+
+
+def test_reads_use_a_fresh_replica_and_fall_back_when_it_lags(router, db):
+    # No heartbeat has reached the replica yet: its lag is unknown
+    assert router.choose(["Volunteer"]) is None
+    _refresh(router, db)
+    repository.add_volunteer(db, "Asha Rao", "asha@example.org", "555", "Teaching", True)
+
+    assert router.choose(["Volunteer"]) is router.replicas[0]
+    assert router.choose(["Volunteer"], max_lag=0) is None
+    router.replicas[0].beat = time.time() - 60
+    router.replicas[0].checked_at = time.time() + 60
+    assert router.choose(["Volunteer"]) is None
+    assert _volunteers_seen(router) == 1
+
+
+def test_recent_write_fences_its_tables_off_the_replica(router, db):
+    _refresh(router, db)
+    repository.add_volunteer(db, "Asha Rao", "asha@example.org", "555", "Teaching", True)
+    router.note_write(["Volunteer"])
+
+    assert _volunteers_seen(router) == 1
+    assert _volunteers_seen(router, tables=("Donation",)) == 0
+    _refresh(router, db)
+    assert _volunteers_seen(router) == 1
+    assert router.metrics()["primary_reads"] == 1
+
+
+def test_unreachable_replica_is_skipped(router, db):
+    _refresh(router, db)
+    router.replicas[0].pool = ConnectionPool(factory=lambda: connect_sqlite("/nonexistent/replica.sqlite3"))
+
+    assert _volunteers_seen(router) == 0
+    assert router.replicas[0].failures == 1
+    assert router.metrics()["replicas"][0]["state"] == "down"
@@ -0,0 +1,29 @@
+import csv
+import io
+from datetime import date
+
+import repository
+from export import export, export_to_tempfile
+
+
+def test_csv_export_streams_in_batches(db):
+    for day in range(1, 8):
+        repository.add_donation(db, f"Donor {day}", "Books", day, date(2024, 1, day))
+    out, progress = io.StringIO(), []
+
+    assert export(db, "donations", "csv", out, {"start_date": date(2024, 1, 2)},
+                  batch_size=2, progress=progress.append) == 6
+    assert progress == [2, 4, 6]
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows[0] == ["DonationID", "DonorName", "ResourceType", "Quantity", "DonationDate"]
+    assert [row[1] for row in rows[1:]] == [f"Donor {day}" for day in range(2, 8)]
+
+
+def test_max_rows_caps_the_export(db):
+    for i in range(5):
+        repository.add_volunteer(db, f"Volunteer {i}", f"v{i}@example.org", "555", "Teaching", True)
+
+    with export_to_tempfile(db, "volunteers", "csv", {"availability_filter": "All"}, max_rows=3) as tmp:
+        rows = list(csv.reader(io.StringIO(tmp.read().decode("utf-8"))))
+    assert rows[0][0] == "VolunteerID"
+    assert [row[1] for row in rows[1:]] == ["Volunteer 0", "Volunteer 1", "Volunteer 2"]
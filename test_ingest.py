@@ -0,0 +1,94 @@
+import json
+import os
+
+import repository
+from ingest import IngestQueue
+from rollups import check_drift
+
+
+def _donations(conn):
+    return repository.fetch_all(conn, "SELECT IdempotencyKey, DonorName, Quantity FROM Donation ORDER BY DonationID")
+
+
+def _segments(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".log"))
+
+
+def test_queue_drains_appends_into_the_database(db, tmp_path):
+    queue = IngestQueue(directory=str(tmp_path / "journal"))
+    try:
+        keys = [queue.append("Asha", "Books", quantity) for quantity in (1, 2, 3)]
+        assert queue.flush(timeout=10)
+    finally:
+        queue.close()
+
+    assert _donations(db) == [(key, "Asha", quantity) for key, quantity in zip(keys, (1, 2, 3))]
+    assert check_drift(db) == []
+
+
+def test_journal_is_replayed_after_a_crash(db, tmp_path):
+    directory = str(tmp_path / "journal")
+    # Appended but never drained, as if the process died before the worker ran
+    queue = IngestQueue(directory=directory, start_worker=False)
+    key = queue.append("Asha", "Books", 4)
+    queue.close()
+
+    queue = IngestQueue(directory=directory)
+    try:
+        assert queue.stats()["pending"] == 1
+        assert queue.flush(timeout=10)
+    finally:
+        queue.close()
+    assert _donations(db) == [(key, "Asha", 4)]
+
+
+def test_replay_after_commit_before_checkpoint_adds_nothing_twice(db, tmp_path):
+    directory = str(tmp_path / "journal")
+    queue = IngestQueue(directory=directory)
+    try:
+        queue.append("Asha", "Books", 4)
+        queue.append("Ben", "Clothing", 1)
+        assert queue.flush(timeout=10)
+    finally:
+        queue.close()
+    # Lose the checkpoint, as if the process died between the commit and writing it
+    os.remove(os.path.join(directory, "checkpoint.json"))
+
+    queue = IngestQueue(directory=directory)
+    try:
+        assert queue.flush(timeout=10)
+        stats = queue.stats()
+    finally:
+        queue.close()
+    assert (stats["ingested"], stats["duplicates"]) == (0, 2)
+    assert len(_donations(db)) == 2
+    assert check_drift(db) == []
+
+
+def test_torn_record_is_skipped_and_never_appended_after(db, tmp_path):
+    directory = str(tmp_path / "journal")
+    queue = IngestQueue(directory=directory, start_worker=False)
+    key = queue.append("Asha", "Books", 4)
+    queue.close()
+    segment = os.path.join(directory, _segments(directory)[-1])
+    with open(segment, "ab") as f:
+        f.write(b'{"key": "torn", "donor"')
+
+    queue = IngestQueue(directory=directory)
+    try:
+        later = queue.append("Ben", "Clothing", 1)
+        assert queue.flush(timeout=10)
+    finally:
+        queue.close()
+    assert [row[0] for row in _donations(db)] == [key, later]
+    # The later record went to a fresh segment; the torn one is gone once drained past
+    with open(os.path.join(directory, "checkpoint.json")) as f:
+        assert json.load(f)["segment"] == 2
+    assert _segments(directory) == ["00000002.log"]
+
+
+def test_opening_the_queue_creates_no_segment(db, tmp_path):
+    directory = str(tmp_path / "journal")
+    for _ in range(3):
+        IngestQueue(directory=directory, start_worker=False).close()
+    assert _segments(directory) == []
@@ -0,0 +1,36 @@
+import pytest
+
+import repository
+from db_config import pooled_connection
+from inventory import InsufficientStock
+
+
+def _alerts(conn):
+    return [(item, kind, quantity) for _, item, kind, quantity, _ in repository.stock_alerts_after(conn, 0)]
+
+
+def test_alert_fires_once_per_crossing(db):
+    repository.add_donation(db, "Asha", "Books", 12)
+    repository.disburse_item(db, "Books", 3)
+    repository.disburse_item(db, "Books", 2)
+    repository.add_donation(db, "Ben", "Books", 10)
+
+    assert _alerts(db) == [("Books", "low", 9), ("Books", "restocked", 17)]
+    assert repository.low_stock_items(db).empty
+
+
+def test_reorder_level_change_can_cross(db):
+    repository.add_donation(db, "Asha", "Books", 12)
+    repository.update_reorder_level(db, "Books", 20)
+
+    assert list(repository.low_stock_items(db)["ItemName"]) == ["Books"]
+    assert _alerts(db) == [("Books", "low", 12)]
+
+
+def test_disbursement_never_goes_below_zero(db):
+    repository.add_donation(db, "Asha", "Books", 2)
+
+    # As on the pages: the failed transaction is rolled back when the connection goes back to the pool
+    with pytest.raises(InsufficientStock), pooled_connection() as conn:
+        repository.disburse_item(conn, "Books", 3)
+    assert repository.fetch_one(db, "SELECT QuantityAvailable FROM Inventory")[0] == 2
@@ -0,0 +1,54 @@
+from datetime import date, timedelta
+
+import repository
+from matching import Matcher, ParticipationIndex, SkillIndex
+
+TODAY = date(2024, 6, 3)
+
+
+def _matcher(conn):
+    cursor = conn.cursor()
+    return Matcher(SkillIndex.load(cursor), ParticipationIndex.load(cursor, TODAY))
+
+
+def _volunteers(conn):
+    return {name: repository.add_volunteer(conn, name, f"{name.lower()}@example.org", "555", skills, available)
+            for name, skills, available in [("Asha", "Teaching, First Aid", True),
+                                            ("Ben", "Teaching", True),
+                                            ("Cy", "Cooking", True),
+                                            ("Dee", "Teaching, First Aid", False)]}
+
+
+def test_rank_orders_by_skill_overlap_and_skips_unavailable(db):
+    ids = _volunteers(db)
+    event_id = repository.add_event(db, "Camp", TODAY + timedelta(days=3), required_skills="First Aid, Teaching")
+
+    ranked = _matcher(db).rank("First Aid, Teaching", TODAY + timedelta(days=3), event_id)
+
+    assert list(ranked["VolunteerID"]) == [ids["Asha"], ids["Ben"]]
+    assert list(ranked["SkillsMatched"]) == [3, 1]
+
+
+def test_nearby_assignments_count_against_a_volunteer(db):
+    ids = _volunteers(db)
+    busy = repository.add_event(db, "Tutoring", TODAY + timedelta(days=1), required_skills="Teaching")
+    same_day = repository.add_event(db, "Reading", TODAY + timedelta(days=4), required_skills="Teaching")
+    repository.add_participants(db, [(busy, ids["Ben"]), (same_day, ids["Asha"])])
+    event_id = repository.add_event(db, "Class", TODAY + timedelta(days=4), required_skills="Teaching")
+
+    ranked = _matcher(db).rank("Teaching", TODAY + timedelta(days=4), event_id)
+
+    # Asha is taken that day; Ben is still offered, with his other assignment counted
+    assert list(ranked["VolunteerID"]) == [ids["Ben"]]
+    assert list(ranked["NearbyAssignments"]) == [1]
+
+
+def test_plan_does_not_book_anyone_twice_on_one_day(db):
+    ids = _volunteers(db)
+    day = TODAY + timedelta(days=2)
+    first = repository.add_event(db, "Morning class", day, required_skills="Teaching", volunteers_needed=1)
+    second = repository.add_event(db, "Evening class", day, required_skills="Teaching", volunteers_needed=2)
+
+    plan = _matcher(db).plan([(first, "Teaching", day, 1), (second, "Teaching", day, 2)])
+
+    assert sorted(plan) == sorted([(first, ids["Asha"]), (second, ids["Ben"])])
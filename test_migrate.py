@@ -0,0 +1,46 @@
+from migrate import discover_migrations, split_statements
+
+
+def test_split_statements_honours_delimiter_blocks():
+    sql = """DROP PROCEDURE IF EXISTS AddDonation;
+
+DELIMITER //
+
+CREATE PROCEDURE AddDonation(IN qty INT)
+BEGIN
+    INSERT INTO Donation (Quantity) VALUES (qty);
+    UPDATE Inventory SET Quantity = Quantity + qty;
+END //
+
+DELIMITER ;
+
+CREATE INDEX idx_x ON Donation (Quantity);
+"""
+    statements = split_statements(sql)
+
+    assert len(statements) == 3
+    assert statements[0] == "DROP PROCEDURE IF EXISTS AddDonation"
+    assert statements[1].startswith("CREATE PROCEDURE AddDonation")
+    assert statements[1].endswith("END")
+    assert "VALUES (qty);" in statements[1]
+    assert statements[2] == "CREATE INDEX idx_x ON Donation (Quantity)"
+
+
+def test_split_statements_ignores_semicolons_in_quotes_and_comments():
+    sql = """-- first; not a statement
+INSERT INTO Volunteer (Name) VALUES ('a;b'); # trailing; comment
+INSERT INTO Volunteer (Name) VALUES ('it\\'s; fine') /* inline; */;
+"""
+    assert [" ".join(statement.split()) for statement in split_statements(sql)] == [
+        "INSERT INTO Volunteer (Name) VALUES ('a;b')",
+        "INSERT INTO Volunteer (Name) VALUES ('it\\'s; fine')",
+    ]
+
+
+def test_shipped_migrations_are_numbered_in_order_and_split():
+    migrations = discover_migrations()
+    versions = [migration.version for migration in migrations]
+
+    assert versions == list(range(1, len(versions) + 1))
+    for migration in migrations:
+        assert split_statements(migration.sql)
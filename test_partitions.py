@@ -0,0 +1,63 @@
+from datetime import date
+
+import repository
+from partitions import archive_closed_years, archive_cutoff, ensure_partitions
+
+
+class FakeCursor:
+    """Answers the catalogue queries of a Donation table with only ``p_future``."""
+
+    def __init__(self, oldest):
+        self.oldest = oldest
+        self.statements = []
+        self._result = []
+
+    def execute(self, sql, params=()):
+        self.statements.append(" ".join(sql.split()))
+        if "information_schema.PARTITIONS" in sql:
+            self._result = [("p_future", "MAXVALUE", 0)]
+        elif "MIN(DonationDate)" in sql:
+            self._result = [(self.oldest,)]
+
+    def fetchall(self):
+        return self._result
+
+    def fetchone(self):
+        return self._result[0]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+
+def test_archive_cutoff_keeps_the_hot_years():
+    assert archive_cutoff(3, date(2024, 6, 1)) == date(2022, 1, 1)
+    assert archive_cutoff(0, date(2024, 6, 1)) == date(2024, 1, 1)
+
+
+def test_first_partition_run_starts_no_earlier_than_the_archive():
+    cursor = FakeCursor(oldest=date(1970, 1, 1))
+
+    created = ensure_partitions(FakeConnection(cursor), years_ahead=1, today=date(2024, 6, 1))
+
+    # 2021 also holds everything before it, ready to be archived in one swap
+    assert created == ["p2021", "p2022", "p2023", "p2024", "p2025"]
+    assert "PARTITION p2021 VALUES LESS THAN ('2022-01-01')" in cursor.statements[-1]
+
+
+def test_archiving_moves_closed_years_once(db):
+    for year in (2019, 2020, 2023, 2024):
+        repository.add_donation(db, "Asha", "Books", 1, date(year, 5, 1))
+
+    assert archive_closed_years(db, hot_years=2, today=date(2024, 6, 1), log=lambda line: None) == 2
+    assert archive_closed_years(db, hot_years=2, today=date(2024, 6, 1), log=lambda line: None) == 0
+    assert repository.archive_boundary(db) == date(2021, 1, 1)
+    assert repository.fetch_all(db, "SELECT DonationDate FROM DonationArchive ORDER BY DonationDate") == [
+        (date(2019, 5, 1),), (date(2020, 5, 1),)]
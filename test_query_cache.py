@@ -0,0 +1,72 @@
+from query_cache import QueryCache
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return [self.calls]
+
+
+def test_value_is_cached_until_a_table_it_reads_changes():
+    cache, load = QueryCache(), Loader()
+    assert cache.get_or_load(("volunteers",), ["Volunteer"], load) == [1]
+    assert cache.get_or_load(("volunteers",), ["Volunteer"], load) == [1]
+
+    cache.invalidate("Donation")
+    assert cache.get_or_load(("volunteers",), ["Volunteer"], load) == [1]
+
+    cache.invalidate("Volunteer")
+    assert cache.get_or_load(("volunteers",), ["Volunteer"], load) == [2]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stale"]) == (2, 2, 1)
+
+
+def test_write_during_load_leaves_the_entry_stale():
+    cache = QueryCache()
+
+    def load_racing_a_write():
+        cache.invalidate("Donation")
+        return "old"
+
+    assert cache.get_or_load(("donations",), ["Donation"], load_racing_a_write) == "old"
+    assert cache.get_or_load(("donations",), ["Donation"], lambda: "new") == "new"
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryCache(max_entries=2)
+    cache.get_or_load(("a",), [], lambda: "a")
+    cache.get_or_load(("b",), [], lambda: "b")
+    cache.get_or_load(("a",), [], lambda: "reloaded")
+    cache.get_or_load(("c",), [], lambda: "c")
+
+    assert cache.get_or_load(("a",), [], lambda: "reloaded") == "a"
+    assert cache.get_or_load(("b",), [], lambda: "reloaded") == "reloaded"
+    assert cache.stats()["evictions"] == 2
+
+
+def test_expired_entry_is_reloaded():
+    cache = QueryCache(ttl=0)
+    cache.get_or_load(("a",), [], lambda: "a")
+
+    assert cache.get_or_load(("a",), [], lambda: "reloaded") == "reloaded"
+    assert cache.stats()["expired"] == 1
+
+
+def test_patch_rewrites_current_entries_and_drops_the_rest():
+    cache, load = QueryCache(), Loader()
+    cache.get_or_load(("kept",), ["Volunteer"], load)
+    cache.get_or_load(("dropped",), ["Volunteer"], load)
+    cache.get_or_load(("other",), ["Donation"], load)
+    heard = []
+    cache.subscribe(heard.append)
+
+    cache.patch(["Volunteer"], lambda key, value: value + ["patched"] if key == ("kept",) else None)
+
+    assert heard == [("Volunteer",)]
+    assert cache.get_or_load(("kept",), ["Volunteer"], load) == [1, "patched"]
+    assert cache.get_or_load(("dropped",), ["Volunteer"], load) == [4]
+    assert cache.get_or_load(("other",), ["Donation"], load) == [3]
+    assert cache.stats()["patched"] == 1
@@ -0,0 +1,160 @@
+from datetime import date, timedelta
+
+import pytest
+
+import repository
+from db_config import pooled_connection
+from inventory import InsufficientStock
+from partitions import archive_closed_years
+from query_cache import QueryCache
+from rollups import read_summary
+
+
+def _scalar(conn, sql, params=()):
+    return repository.fetch_one(conn, sql, params)[0]
+
+
+def _stock(conn):
+    return dict(repository.fetch_all(conn, "SELECT ItemName, QuantityAvailable FROM Inventory ORDER BY ItemName"))
+
+
+def test_delete_volunteer_removes_their_assignments(db):
+    volunteer_id = repository.add_volunteer(db, "Asha Rao", "asha@example.org", "555", "Teaching", True)
+    other_id = repository.add_volunteer(db, "Ben Ode", "ben@example.org", "556", "Cooking", False)
+    event_id = repository.add_event(db, "Book drive", date.today())
+    repository.add_participants(db, [(event_id, volunteer_id), (event_id, other_id)])
+
+    repository.delete_volunteer(db, "VolunteerID", volunteer_id)
+
+    assert _scalar(db, "SELECT COUNT(*) FROM Volunteer WHERE VolunteerID = %s", (volunteer_id,)) == 0
+    assert repository.fetch_all(db, "SELECT VolunteerID FROM Participation") == [(other_id,)]
+    total, available, _, _ = read_summary(db.cursor())
+    assert (total, available) == (1, 0)
+
+
+def test_set_volunteer_availability_returns_previous_value(db):
+    volunteer_id = repository.add_volunteer(db, "Asha Rao", "asha@example.org", "555", "Teaching", True)
+
+    assert repository.set_volunteer_availability(db, "VolunteerID", volunteer_id, False) == 1
+    assert repository.set_volunteer_availability(db, "VolunteerID", volunteer_id + 1, True) is None
+    assert read_summary(db.cursor())[:2] == (1, 0)
+
+
+def test_availability_patch_matches_a_reload(db):
+    cache = QueryCache()
+    ids = [repository.add_volunteer(db, f"Volunteer {i}", f"v{i}@example.org", "555", "Teaching", i % 2 == 0)
+           for i in range(4)]
+    queries = [(repository.fetch_volunteer_page, "VolunteerID", "All", None),
+               (repository.fetch_volunteer_page, "VolunteerID", "Available Only", None),
+               (repository.count_volunteers, "Available Only", None),
+               (repository.count_volunteers, "Unavailable Only", "teach")]
+
+    def cached(query, *args):
+        return cache.get_or_load((query.__name__,) + args, repository.VOLUNTEER_TABLES, lambda: query(db, *args))
+
+    for query, *args in queries:
+        cached(query, *args)
+    was_available = repository.set_volunteer_availability(db, "VolunteerID", ids[0], False)
+    cache.patch(repository.VOLUNTEER_TABLES,
+                repository.availability_patch("VolunteerID", ids[0], False, was_available))
+
+    for query, *args in queries:
+        patched, fresh = cached(query, *args), query(db, *args)
+        if isinstance(fresh, tuple):
+            assert patched[0].equals(fresh[0]) and patched[1] == fresh[1]
+        else:
+            assert patched == fresh
+    assert cache.stats()["patched"] == 2
+
+def test_volunteer_pages_cover_every_row_once(db):
+    # Duplicate names make the id tie-breaker in the keyset matter
+    for i in range(7):
+        repository.add_volunteer(db, f"Volunteer {i % 3}", f"v{i}@example.org", "555", "Teaching", i % 2 == 0)
+    seen, after = [], None
+    while True:
+        frame, has_next = repository.fetch_volunteer_page(db, "VolunteerID", "All", None, after, page_size=3)
+        seen += list(zip(frame["Name"], frame["VolunteerID"]))
+        if not has_next:
+            break
+        after = seen[-1]
+    assert seen == sorted(seen)
+    assert len(set(seen)) == 7
+
+
+def test_volunteer_filters_match_their_counts(db):
+    for i in range(6):
+        repository.add_volunteer(db, f"Volunteer {i}", f"v{i}@example.org", "555",
+                                 "Teaching" if i < 2 else "Cooking", i % 2 == 0)
+    for availability, search, expected in [("All", None, 6), ("Available Only", None, 3),
+                                           ("Unavailable Only", "teach", 1), ("All", "100%", 0)]:
+        frame, _ = repository.fetch_volunteer_page(db, "VolunteerID", availability, search)
+        assert len(frame) == repository.count_volunteers(db, availability, search) == expected
+
+
+def test_restock_items_creates_missing_items(db):
+    repository.restock_items(db, {"Books": 5})
+    repository.restock_items(db, {"Books": 3, "Clothing": 2})
+    assert _stock(db) == {"Books": 8, "Clothing": 2}
+
+
+def test_disburse_items_is_all_or_nothing(db):
+    repository.restock_items(db, {"Books": 5, "Clothing": 2})
+
+    # As on the pages: the failed transaction is rolled back when the connection goes back to the pool
+    with pytest.raises(InsufficientStock), pooled_connection() as conn:
+        repository.disburse_items(conn, {"Books": 4, "Clothing": 3})
+    assert _stock(db) == {"Books": 5, "Clothing": 2}
+    assert _scalar(db, "SELECT COUNT(*) FROM DisbursementDaily") == 0
+
+    repository.disburse_items(db, {"Books": 4, "Clothing": 2})
+    assert _stock(db) == {"Books": 1, "Clothing": 0}
+    assert _scalar(db, "SELECT SUM(Quantity) FROM DisbursementDaily") == 6
+
+
+def test_add_queued_donations_skips_replayed_keys(db):
+    today = date.today()
+    batch = [("k1", "Asha", "Books", 2, today), ("k2", "Ben", "Clothing", 3, today)]
+
+    assert repository.add_queued_donations(db, batch) == (2, 0)
+    # A batch replayed after a crash, plus one new record
+    assert repository.add_queued_donations(db, batch + [("k3", "Cy", "Books", 1, today)]) == (1, 2)
+
+    assert _scalar(db, "SELECT COUNT(*) FROM Donation") == 3
+    assert _stock(db) == {"Books": 3, "Clothing": 3}
+    assert read_summary(db.cursor())[2:] == (3, 6)
+
+
+def test_add_queued_donations_skips_archived_keys(db):
+    old = date.today() - timedelta(days=5 * 366)
+    batch = [("k1", "Asha", "Books", 2, old)]
+    repository.add_queued_donations(db, batch)
+    assert archive_closed_years(db, hot_years=2, log=lambda line: None) == 1
+
+    # An old journal segment replayed after its year was archived
+    assert repository.add_queued_donations(db, batch) == (0, 1)
+    assert _scalar(db, "SELECT COUNT(*) FROM Donation") == 0
+    assert read_summary(db.cursor())[2:] == (1, 2)
+
+
+def test_donation_pages_merge_the_archive_only_when_asked(db):
+    start = date(2020, 12, 20)
+    for day in range(30):
+        for donor in ("Asha", "Ben"):
+            repository.add_donation(db, donor, "Books", 1, start + timedelta(days=day))
+    assert archive_closed_years(db, hot_years=1, today=date(2021, 6, 1), log=lambda line: None) == 24
+    assert repository.archive_boundary(db) == date(2021, 1, 1)
+
+    def walk(include_archive):
+        seen, after = [], None
+        while True:
+            frame, has_next = repository.fetch_donation_page(db, None, None, None, None, after, include_archive,
+                                                             page_size=7)
+            seen += [(row.DonationDate.date(), row.DonationID) for row in frame.itertuples()]
+            if not has_next:
+                return seen
+            after = seen[-1]
+
+    everything = walk(True)
+    assert len(everything) == 60
+    assert everything == sorted(everything, reverse=True)
+    assert walk(False) == [row for row in everything if row[0] >= date(2021, 1, 1)]
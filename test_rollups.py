@@ -0,0 +1,48 @@
+from datetime import date, timedelta
+
+import repository
+from partitions import archive_closed_years
+from rollups import check_drift, read_daily_totals, read_summary, rebuild
+
+
+def _record_activity(conn):
+    today = date.today()
+    first = repository.add_volunteer(conn, "Asha Rao", "asha@example.org", "555", "Teaching", True)
+    repository.add_volunteer(conn, "Ben Ode", "ben@example.org", "556", "Cooking", False)
+    repository.set_volunteer_availability(conn, "VolunteerID", first, False)
+    repository.delete_volunteer(conn, "VolunteerID", first)
+    for day in range(5):
+        repository.add_donation(conn, "Asha", "Books", day + 1, today - timedelta(days=day))
+        repository.add_donation(conn, "Ben", "Clothing", 2, today - timedelta(days=day))
+    repository.add_donation(conn, "Asha", "Books", 4, date(2019, 3, 1))
+
+
+def test_write_paths_keep_rollups_in_step(db):
+    _record_activity(db)
+
+    assert check_drift(db) == []
+    assert read_summary(db.cursor()) == (1, 0, 11, 29)
+
+
+def test_archiving_keeps_rollups_in_step(db):
+    _record_activity(db)
+
+    assert archive_closed_years(db, hot_years=2, log=lambda line: None) == 1
+    assert check_drift(db) == []
+    # History totals still include the archived year
+    assert read_daily_totals(db.cursor(), date(2019, 1, 1), date(2019, 12, 31), None)[:2] == (1, 4)
+
+
+def test_rebuild_corrects_drift(db):
+    _record_activity(db)
+    cursor = db.cursor()
+    cursor.execute("UPDATE DashboardSummary SET TotalDonations = TotalDonations + 5")
+    cursor.execute("DELETE FROM DonationDaily WHERE ResourceType = 'Clothing'")
+    db.commit()
+
+    drift = check_drift(db)
+    assert any(line.startswith("DashboardSummary.TotalDonations") for line in drift)
+    assert any(line.startswith("DonationDaily[") for line in drift)
+
+    assert rebuild(db) == drift
+    assert check_drift(db) == []
@@ -0,0 +1,41 @@
+from datetime import date
+
+from sqlite_backend import translate
+
+
+def test_translate_placeholders_and_like():
+    assert translate("SELECT * FROM Volunteer WHERE Name LIKE %s AND VolunteerID > %s") == \
+        "SELECT * FROM Volunteer WHERE Name LIKE ? ESCAPE '\\' AND VolunteerID > ?"
+
+
+def test_translate_insert_ignore_and_for_update():
+    assert translate("INSERT IGNORE INTO DonationDailyDonor VALUES (%s, %s, %s)") == \
+        "INSERT OR IGNORE INTO DonationDailyDonor VALUES (?, ?, ?)"
+    assert translate("SELECT QuantityAvailable FROM Inventory WHERE ItemName = %s FOR UPDATE") == \
+        "SELECT QuantityAvailable FROM Inventory WHERE ItemName = ?"
+
+
+def test_translate_upsert():
+    assert translate(
+        "INSERT INTO ResourceTotals (ResourceType, DonationCount) VALUES (%s, %s) "
+        "ON DUPLICATE KEY UPDATE DonationCount = DonationCount + VALUES(DonationCount)"
+    ) == ("INSERT INTO ResourceTotals (ResourceType, DonationCount) VALUES (?, ?) "
+          "ON CONFLICT DO UPDATE SET DonationCount = DonationCount + excluded.DonationCount")
+
+
+def test_mysql_flavoured_statements_run(db):
+    cursor = db.cursor()
+    cursor.execute("INSERT INTO Inventory (ItemName, QuantityAvailable) VALUES (%s, %s)", ("Books", 2))
+    cursor.execute("""
+        INSERT INTO Inventory (ItemName, QuantityAvailable) VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE QuantityAvailable = QuantityAvailable + VALUES(QuantityAvailable)
+    """, ("Books", 3))
+    cursor.execute("SELECT QuantityAvailable FROM Inventory WHERE ItemName LIKE %s FOR UPDATE", ("Bo%",))
+    assert cursor.fetchone() == (5,)
+    cursor.execute("SELECT COUNT(*) FROM Inventory WHERE ItemName LIKE %s", ("Bo\\%",))
+    assert cursor.fetchone() == (0,)
+
+    cursor.execute("INSERT INTO Donation (DonorName, ResourceType, Quantity, DonationDate) VALUES (%s, %s, %s, %s)",
+                   ("Asha", "Books", 1, date(2024, 2, 29)))
+    cursor.execute("SELECT DonationDate FROM Donation")
+    assert cursor.fetchone() == (date(2024, 2, 29),)
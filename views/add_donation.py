@@ -0,0 +1,61 @@
+# 💝 Add Donation
+import streamlit as st
+from common import ingest_queue, query_cache
+from db_config import get_pool
+from ingest import QueueFull
+import repository
+from repository import DONATION_TABLES
+
+st.markdown("## 💝 Log New Donation")
+
+with st.form("donation_form", clear_on_submit=True):
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        donor = st.text_input("Donor Name *", placeholder="Individual or Organization name")
+        resource = st.selectbox("Resource Type *", 
+                              ["Food Items", "Clothing", "Medical Supplies", "Books", 
+                               "Electronics", "Furniture", "Toys", "Other"])
+        if resource == "Other":
+            resource = st.text_input("Specify Resource Type", placeholder="Enter custom resource type")
+    
+    with col2:
+        quantity = st.number_input("Quantity *", min_value=1, value=1)
+        unit = st.selectbox("Unit", ["Items", "Boxes", "Bags", "Kilograms", "Liters", "Sets"])
+        notes = st.text_area("Additional Notes", 
+                            placeholder="Any special instructions or conditions")
+    
+    submit_donation = st.form_submit_button("📦 Record Donation", use_container_width=True)
+    
+    if submit_donation:
+        if donor and resource and quantity:
+            try:
+                # Journaled and acknowledged at once; the ingest worker commits it
+                # with the other queued donations. Without a queue, or when its
+                # backlog is full, the donation is written synchronously.
+                queued = False
+                if ingest_queue is not None:
+                    try:
+                        ingest_queue.append(donor, resource, quantity)
+                        queued = True
+                    except QueueFull:
+                        pass
+                if not queued:
+                    with get_pool().connection() as conn:
+                        # Donation row, inventory upsert and rollups commit together
+                        repository.add_donation(conn, donor, resource, quantity)
+                    query_cache.invalidate(*DONATION_TABLES)
+                
+                st.success(f"✅ Donation from {donor} recorded successfully!")
+                st.info(f"📦 {quantity} {unit.lower()} of {resource} added to inventory")
+                st.balloons()
+                
+            except Exception as e:
+                st.error(f"❌ Error recording donation: {str(e)}")
+        else:
+            st.warning("⚠️ Please fill in all required fields (marked with *)")
+
+if ingest_queue is not None:
+    queue_stats = ingest_queue.stats()
+    st.caption(f"📥 {queue_stats['pending']} donations waiting to be saved · "
+               f"lag {queue_stats['lag_seconds']:.1f}s")
@@ -0,0 +1,40 @@
+# 👥 Add Volunteer
+import streamlit as st
+from common import query_cache
+from db_config import get_pool
+import repository
+from repository import VOLUNTEER_TABLES
+
+st.markdown("## 👥 Register New Volunteer")
+
+with st.form("volunteer_form", clear_on_submit=True):
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        name = st.text_input("Full Name *", placeholder="Enter volunteer's full name")
+        email = st.text_input("Email Address *", placeholder="volunteer@email.com")
+        phone = st.text_input("Phone Number", placeholder="+1 (555) 123-4567")
+    
+    with col2:
+        skills = st.text_area("Skills & Expertise", 
+                            placeholder="e.g., Teaching, Medical, IT, Event Management")
+        available = st.checkbox("Currently Available for Assignments", value=True)
+        emergency_contact = st.text_input("Emergency Contact", 
+                                        placeholder="Name and phone number")
+    
+    submit_volunteer = st.form_submit_button("🎯 Register Volunteer", use_container_width=True)
+    
+    if submit_volunteer:
+        if name and email:
+            try:
+                with get_pool().connection() as conn:
+                    repository.add_volunteer(conn, name, email, phone, skills, available)
+                query_cache.invalidate(*VOLUNTEER_TABLES)
+                
+                st.success(f"✅ {name} has been successfully registered as a volunteer!")
+                st.balloons()
+                
+            except Exception as e:
+                st.error(f"❌ Error registering volunteer: {str(e)}")
+        else:
+            st.warning("⚠️ Please fill in all required fields (marked with *)")
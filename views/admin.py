@@ -0,0 +1,147 @@
+# 🛠️ Admin: cache, queue, pool, replica and query metrics
+import json
+import streamlit as st
+import pandas as pd
+from common import ingest_queue, query_cache
+from db_config import REPLICA_MAX_LAG, get_pool, get_router
+from instrumentation import get_instrumentation
+import repository
+
+st.markdown("## 🛠️ System Administration")
+
+st.markdown("### 🗄️ Query Cache")
+cache_stats = query_cache.stats()
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("Hit Rate", f"{cache_stats['hit_rate'] * 100:.1f}%")
+with col2:
+    st.metric("Hits", cache_stats['hits'])
+with col3:
+    st.metric("Misses", cache_stats['misses'])
+with col4:
+    st.metric("Entries", f"{cache_stats['entries']} / {cache_stats['max_entries']}")
+st.caption(
+    f"Invalidated: {cache_stats['stale']} · Expired: {cache_stats['expired']} · "
+    f"Evicted: {cache_stats['evictions']} · Patched: {cache_stats['patched']} · TTL: {cache_stats['ttl_seconds']:.0f}s"
+)
+if cache_stats['table_versions']:
+    st.dataframe(pd.DataFrame(sorted(cache_stats['table_versions'].items()),
+                              columns=['Table', 'Version']),
+                 use_container_width=True)
+if st.button("🧹 Clear Query Cache"):
+    query_cache.clear()
+    st.success("✅ Query cache cleared")
+
+st.markdown("### 📥 Donation Ingestion Queue")
+if ingest_queue is not None:
+    queue_stats = ingest_queue.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Pending", f"{queue_stats['pending']} / {queue_stats['max_pending']}")
+    with col2:
+        st.metric("Lag", f"{queue_stats['lag_seconds']:.2f}s")
+    with col3:
+        st.metric("Ingested", queue_stats['ingested'])
+    with col4:
+        st.metric("Batches", queue_stats['batches'])
+    st.caption(
+        f"Last batch: {queue_stats['last_batch_size']} donations in {queue_stats['last_batch_ms']:.1f} ms · "
+        f"Duplicates skipped: {queue_stats['duplicates']} · Sync: {queue_stats['sync']} · "
+        f"Checkpoint: segment {queue_stats['checkpoint'][0]}, offset {queue_stats['checkpoint'][1]}"
+    )
+    if queue_stats['last_error']:
+        st.warning(f"⚠️ Last batch failed, retrying: {queue_stats['last_error']}")
+else:
+    st.info("Donations are written synchronously (queue disabled or owned by another process).")
+
+st.markdown("### 🔌 Connection Pool")
+pool_stats = get_pool().metrics()
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("In Use", f"{pool_stats['in_use']} / {pool_stats['size']}")
+with col2:
+    st.metric("Avg Wait", f"{pool_stats['avg_wait_ms']:.1f} ms")
+with col3:
+    st.metric("Timeouts", pool_stats['timeouts'])
+with col4:
+    st.metric("Reconnects", pool_stats['reconnects'])
+st.caption(
+    f"Open: {pool_stats['open']} · Peak: {pool_stats['peak_in_use']} · "
+    f"Checkouts: {pool_stats['checkouts']} · Max wait: {pool_stats['max_wait_ms']:.1f} ms"
+)
+
+st.markdown("### 🪞 Read Replicas")
+router_stats = get_router().metrics()
+if router_stats['replicas']:
+    st.dataframe(pd.DataFrame(router_stats['replicas']).rename(columns={
+        'target': 'Replica', 'state': 'State', 'lag_seconds': 'Lag (s)', 'reads': 'Reads',
+        'failures': 'Failures', 'error': 'Last Error'
+    }), use_container_width=True)
+    st.caption(f"Primary reads: {router_stats['primary_reads']} · "
+               f"Fallbacks after a failed replica: {router_stats['fallbacks']}")
+    if router_stats['heartbeat_error']:
+        st.warning(f"⚠️ Heartbeat write failed: {router_stats['heartbeat_error']}")
+    # Kept outside the widget's own state, which is dropped on pages that do not show it
+    st.session_state.replica_max_lag = st.number_input(
+        "Max replica lag for this session (s)", min_value=0.0,
+        value=float(st.session_state.get("replica_max_lag", REPLICA_MAX_LAG)), step=1.0,
+        help="Reads from replicas further behind go to the primary; 0 reads only from the primary. "
+             "Cached results are shared, so this applies to the data this session loads.")
+else:
+    st.info("All reads go to the primary (no replicas in NGO_DB_REPLICAS).")
+
+st.markdown("### 📝 Prepared Statements")
+statement_stats = repository.statement_stats()
+reuse_rate = 1 - statement_stats['prepares'] / statement_stats['executions'] if statement_stats['executions'] else 0.0
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric("Reuse Rate", f"{reuse_rate * 100:.1f}%")
+with col2:
+    st.metric("Cached Statements", statement_stats['cached'])
+with col3:
+    st.metric("Executions", statement_stats['executions'])
+
+st.markdown("### ⏱️ Query Performance")
+instrumentation = get_instrumentation()
+page_latency = instrumentation.page_latency()
+if page_latency:
+    st.markdown("**Page latency** (end to end; DB time is the share spent in SQL)")
+    st.dataframe(pd.DataFrame(page_latency).rename(columns={
+        'page': 'Page', 'runs': 'Runs', 'p50_ms': 'p50 (ms)', 'p95_ms': 'p95 (ms)', 'max_ms': 'Max (ms)',
+        'avg_ms': 'Avg (ms)', 'avg_db_ms': 'Avg DB (ms)', 'queries_per_run': 'Queries / Run'
+    }), use_container_width=True)
+
+top_queries = instrumentation.top_queries(limit=20)
+if top_queries:
+    st.markdown("**Top queries by total time**")
+    top_df = pd.DataFrame(top_queries)
+    top_df['pages'] = top_df['pages'].str.join(", ")
+    st.dataframe(top_df.rename(columns={
+        'fingerprint': 'Query', 'calls': 'Calls', 'total_ms': 'Total (ms)', 'avg_ms': 'Avg (ms)',
+        'p50_ms': 'p50 (ms)', 'p95_ms': 'p95 (ms)', 'max_ms': 'Max (ms)', 'rows': 'Rows', 'pages': 'Pages'
+    }), use_container_width=True)
+else:
+    st.info("No queries recorded yet.")
+
+instrumentation.slow_query_ms = st.number_input("Slow query threshold (ms)", min_value=1.0,
+                                                value=float(instrumentation.slow_query_ms), step=50.0)
+slow_queries = instrumentation.slow_queries()
+with st.expander(f"🐢 Slow Queries ({len(slow_queries)})", expanded=False):
+    if slow_queries:
+        slow_df = pd.DataFrame(slow_queries)
+        slow_df['time'] = pd.to_datetime(slow_df['time'], unit='s')
+        st.dataframe(slow_df, use_container_width=True)
+    else:
+        st.info("No queries over the threshold so far.")
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.download_button("⬇️ Export JSON", json.dumps(instrumentation.snapshot(), indent=2, default=str),
+                       file_name="ngo_metrics.json", mime="application/json")
+with col2:
+    st.download_button("⬇️ Export Prometheus", instrumentation.prometheus(),
+                       file_name="ngo_metrics.prom", mime="text/plain")
+with col3:
+    if st.button("🔄 Reset Metrics"):
+        instrumentation.reset()
+        st.rerun()
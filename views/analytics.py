@@ -0,0 +1,68 @@
+# 🔬 Analytics: donor retention and stock outlook
+import streamlit as st
+import plotly.express as px
+from analytics import FORECAST_WINDOW, get_donor_analytics, get_stock_outlook
+from common import INVENTORY_LABELS
+
+INFLOW_LABELS = {'ResourceType': 'Resource Type', 'PerDay': f'Per Day ({FORECAST_WINDOW}d)',
+                 'PerDay30': 'Per Day (30d)', 'Trend': '30d vs Window'}
+FORECAST_LABELS = {**INVENTORY_LABELS, 'InPerDay': 'In / Day', 'OutPerDay': 'Out / Day', 'NetPerDay': 'Net / Day',
+                   'DaysToReorder': 'Days to Reorder', 'DaysLeft': 'Days Left', 'DepletionDate': 'Runs Out'}
+
+st.markdown("## 🔬 Donor & Stock Analytics")
+
+# Both results are computed from the daily rollups once per data version and shared by all sessions
+try:
+    donors = get_donor_analytics()
+    
+    if donors.donor_count:
+        this_month = donors.monthly.iloc[-1]
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Donors", donors.donor_count)
+        with col2:
+            st.metric("Repeat Donors", f"{donors.repeat_rate * 100:.1f}%",
+                      help="Donors who have given on more than one day")
+        with col3:
+            st.metric("Active This Month", int(this_month['ActiveDonors']))
+        with col4:
+            st.metric("New This Month", int(this_month['NewDonors']))
+        
+        st.markdown("### 👥 Retention by First-Donation Month")
+        st.caption("Share of each month's new donors who gave again the given number of months later.")
+        retention = donors.retention.set_index('Cohort').drop(columns='Donors')
+        fig = px.imshow(retention, text_auto='.0%', aspect='auto', color_continuous_scale='Blues',
+                        labels={'x': 'Months since first donation', 'y': 'Cohort', 'color': 'Retained'})
+        fig.update_layout(height=450)
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown("### 🔁 New and Returning Donors")
+        fig = px.bar(donors.monthly, x='Month', y=['NewDonors', 'ReturningDonors'],
+                     labels={'value': 'Donors', 'variable': ''})
+        fig.update_layout(height=400)
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("📦 No donations recorded yet. Donor analytics will appear here.")
+    
+    outlook = get_stock_outlook()
+    
+    st.markdown("### 📥 Inflow by Resource")
+    st.caption(f"Average quantity donated per day over the last {FORECAST_WINDOW} days and the last 30.")
+    if not outlook.inflow.empty:
+        st.dataframe(outlook.inflow.rename(columns=INFLOW_LABELS), use_container_width=True)
+    else:
+        st.info(f"No donations in the last {FORECAST_WINDOW} days.")
+    
+    st.markdown("### ⏳ Depletion Forecast")
+    st.caption(f"Stock divided by net outflow (disbursed minus donated per day, last {FORECAST_WINDOW} days). "
+               "Items that are not being drawn down have no date.")
+    forecast = outlook.forecast
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Items Running Down", int(forecast['DaysLeft'].notna().sum()))
+    with col2:
+        st.metric("Out Within 30 Days", int((forecast['DaysLeft'] < 30).sum()))
+    st.dataframe(forecast.rename(columns=FORECAST_LABELS), use_container_width=True)
+    
+except Exception as e:
+    st.error(f"❌ Error loading analytics: {str(e)}")
@@ -0,0 +1,61 @@
+# 📥 Bulk Import
+import streamlit as st
+from bulk_import import DEFAULT_CHUNK_SIZE, run_import
+from common import query_cache
+from db_config import get_pool
+from repository import DONATION_TABLES, VOLUNTEER_TABLES
+
+st.markdown("## 📥 Bulk Import")
+st.markdown("""
+<div class="info-box">
+    Upload a CSV or Excel file exported after a drive. Rows are validated and loaded in batches;
+    invalid rows are skipped and listed below with the reason.<br>
+    <b>Donations:</b> Donor, Resource Type, Quantity, Date (optional, defaults to today)<br>
+    <b>Volunteers:</b> Name, Email, Phone, Skills, Available (yes/no)
+</div>
+""", unsafe_allow_html=True)
+
+col1, col2 = st.columns(2)
+with col1:
+    import_kind = st.radio("Import", ["Donations", "Volunteers"], horizontal=True)
+with col2:
+    chunk_size = st.number_input("Rows per batch", min_value=100, max_value=50000,
+                                 value=DEFAULT_CHUNK_SIZE, step=500)
+uploaded_file = st.file_uploader("Choose a file", type=["csv", "xlsx", "xls"])
+
+if uploaded_file is not None and st.button("🚀 Start Import", use_container_width=True):
+    progress_text = st.empty()
+    
+    def show_progress(report):
+        progress_text.info(f"⏳ Batch {report.batches}: {report.inserted:,} rows imported, "
+                           f"{report.rejected_count:,} rejected ({report.elapsed:.1f}s)")
+    
+    try:
+        with get_pool().connection() as conn:
+            report = run_import(conn, import_kind.lower(), uploaded_file, uploaded_file.name,
+                                int(chunk_size), show_progress)
+    except Exception as e:
+        st.error(f"❌ Import failed: {str(e)}")
+    else:
+        if import_kind == "Donations":
+            query_cache.invalidate(*DONATION_TABLES)
+        else:
+            query_cache.invalidate(*VOLUNTEER_TABLES)
+        
+        progress_text.empty()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Rows Imported", f"{report.inserted:,}")
+        with col2:
+            st.metric("Rows Rejected", f"{report.rejected_count:,}")
+        with col3:
+            st.metric("Time", f"{report.elapsed:.1f}s")
+        
+        if report.inserted:
+            st.success(f"✅ Imported {report.inserted:,} {import_kind.lower()} in {report.batches} batches")
+        if report.rejected_count:
+            rejected_df = report.rejected_frame()
+            st.warning(f"⚠️ {report.rejected_count:,} rows were rejected")
+            st.dataframe(rejected_df, use_container_width=True)
+            st.download_button("⬇️ Download Rejected Rows", rejected_df.to_csv(index=False),
+                               file_name=f"rejected_{import_kind.lower()}.csv", mime="text/csv")
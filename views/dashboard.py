@@ -0,0 +1,84 @@
+# 🏠 Dashboard: headline figures and recent activity
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from dashboard import load_dashboard
+
+def show_panel_problem(panel, label):
+    if panel.pending:
+        st.warning(f"⏳ The {label} are taking longer than usual and will appear on the next refresh.")
+    else:
+        st.error(f"❌ Error loading {label}: {panel.error}")
+
+st.markdown("## 📊 Dashboard Overview")
+
+# All panels are fetched concurrently; slow ones are skipped this run
+panels = load_dashboard()
+
+# Metrics row
+summary = panels["summary"]
+if summary.ready:
+    total_volunteers, available_volunteers, total_donations, total_items = summary.value
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            label="👥 Total Volunteers",
+            value=total_volunteers,
+            delta=f"{available_volunteers} available"
+        )
+    
+    with col2:
+        st.metric(
+            label="💝 Total Donations",
+            value=total_donations,
+            delta="This month"
+        )
+    
+    with col3:
+        st.metric(
+            label="📦 Items Donated",
+            value=int(total_items) if total_items else 0,
+            delta="All time"
+        )
+    
+    with col4:
+        availability_rate = (available_volunteers / total_volunteers * 100) if total_volunteers > 0 else 0
+        st.metric(
+            label="📈 Availability Rate",
+            value=f"{availability_rate:.1f}%",
+            delta="Active volunteers"
+        )
+else:
+    show_panel_problem(summary, "headline figures")
+
+# Recent activity
+st.markdown("## 🕒 Recent Activity")
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.markdown("### 🆕 Latest Donations")
+    recent_donations = panels["recent_donations"]
+    if not recent_donations.ready:
+        show_panel_problem(recent_donations, "latest donations")
+    elif recent_donations.value:
+        df = pd.DataFrame(recent_donations.value, columns=['Donor', 'Resource', 'Quantity', 'Date'])
+        st.dataframe(df, use_container_width=True)
+    else:
+        st.info("No recent donations to display")
+
+with col2:
+    st.markdown("### 📊 Donation Trends")
+    trend_data = panels["top_resources"]
+    
+    if not trend_data.ready:
+        show_panel_problem(trend_data, "donation trends")
+    elif trend_data.value:
+        df_trend = pd.DataFrame(trend_data.value, columns=['Resource Type', 'Total Quantity'])
+        fig = px.pie(df_trend, values='Total Quantity', names='Resource Type', 
+                    title="Top Donated Resources")
+        fig.update_layout(height=400)
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No donation data available for trends")
@@ -0,0 +1,118 @@
+# 📅 Events: scheduling and staffing
+import streamlit as st
+import pandas as pd
+from datetime import date
+from common import cached_query, query_cache
+from db_config import get_pool
+from matching import get_matcher
+import repository
+from repository import EVENT_TABLES
+
+EVENT_COLUMNS = ['EventID', 'Event', 'Date', 'Description', 'Required Skills', 'Needed', 'Assigned']
+MATCH_LABELS = {'SkillsMatched': 'Skills Matched', 'PastEvents': 'Past Events',
+                'NearbyAssignments': 'Nearby Assignments'}
+
+st.markdown("## 📅 Events & Staffing")
+
+with st.expander("➕ Create Event", expanded=False):
+    with st.form("event_form", clear_on_submit=True):
+        col1, col2 = st.columns(2)
+        with col1:
+            event_name = st.text_input("Event Name *", placeholder="e.g., Weekend Health Camp")
+            event_date = st.date_input("Event Date *", value=date.today(), min_value=date.today())
+            volunteers_needed = st.number_input("Volunteers Needed", min_value=1, value=5)
+        with col2:
+            required_skills = st.text_input("Required Skills", placeholder="e.g., Medical, First Aid")
+            event_description = st.text_area("Description")
+        if st.form_submit_button("📅 Create Event", use_container_width=True):
+            if event_name:
+                try:
+                    with get_pool().connection() as conn:
+                        repository.add_event(conn, event_name, event_date, event_description or None,
+                                             required_skills or None, volunteers_needed)
+                    query_cache.invalidate("Event")
+                    st.success(f"✅ {event_name} scheduled for {event_date:%d %b %Y}")
+                except Exception as e:
+                    st.error(f"❌ Error creating event: {str(e)}")
+            else:
+                st.warning("⚠️ Please give the event a name")
+
+try:
+    events = pd.DataFrame(cached_query(EVENT_TABLES, repository.list_events, date.today()),
+                          columns=EVENT_COLUMNS).fillna({'Required Skills': ''})
+    
+    if not events.empty:
+        open_slots = (events['Needed'] - events['Assigned']).clip(lower=0)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Upcoming Events", int(len(events)))
+        with col2:
+            st.metric("Open Slots", int(open_slots.sum()))
+        with col3:
+            st.metric("Fully Staffed", int((open_slots == 0).sum()))
+        
+        st.dataframe(events.drop(columns=['EventID', 'Description']), use_container_width=True)
+        
+        understaffed = events[open_slots > 0]
+        if not understaffed.empty:
+            if st.button(f"🤖 Auto-staff {len(understaffed)} understaffed events", key="auto_staff"):
+                try:
+                    # Staffed in date order, spreading the load across volunteers
+                    plan = get_matcher().plan(list(zip(understaffed['EventID'], understaffed['Required Skills'],
+                                                       understaffed['Date'], open_slots[open_slots > 0])))
+                    with get_pool().connection() as conn:
+                        assigned = repository.add_participants(conn, plan)
+                    query_cache.invalidate("Participation")
+                    st.success(f"✅ {assigned} assignments made across {len(understaffed)} events")
+                except Exception as e:
+                    st.error(f"❌ Error staffing events: {str(e)}")
+        
+        st.markdown("### 🎯 Find Volunteers")
+        event_labels = {f"{row.Date:%d %b %Y} · {row.Event}": row.Index for row in events.itertuples()}
+        event = events.loc[event_labels[st.selectbox("Event", list(event_labels))]]
+        event_id = int(event['EventID'])
+        st.markdown(f"**Required skills:** {event['Required Skills'] or 'any'} · "
+                    f"**Assigned:** {event['Assigned']} / {event['Needed']}")
+        
+        matches = get_matcher().rank(event['Required Skills'], event['Date'], event_id, limit=50)
+        if not matches.empty:
+            with get_pool().connection() as conn:
+                details = repository.volunteer_details(conn, matches['VolunteerID'].tolist())
+            candidates = matches.merge(details, on='VolunteerID').rename(columns=MATCH_LABELS)
+            st.dataframe(candidates[['VolunteerID', 'Name', 'Email', 'Skills', 'Score', 'Skills Matched',
+                                     'Past Events', 'Nearby Assignments']],
+                         use_container_width=True)
+            
+            candidate_labels = {f"{row.Name} ({row.VolunteerID})": row.VolunteerID
+                                for row in candidates.itertuples()}
+            remaining = max(0, int(event['Needed']) - int(event['Assigned']))
+            with st.form(f"assign_form_{event_id}"):
+                chosen = st.multiselect("Volunteers to assign", list(candidate_labels),
+                                        default=list(candidate_labels)[:remaining])
+                if st.form_submit_button("✅ Assign Selected"):
+                    if not chosen:
+                        st.warning("⚠️ Select at least one volunteer to assign")
+                    else:
+                        try:
+                            with get_pool().connection() as conn:
+                                assigned = repository.add_participants(
+                                    conn, [(event_id, candidate_labels[label]) for label in chosen])
+                            query_cache.invalidate("Participation")
+                            st.success(f"✅ {assigned} volunteers assigned to {event['Event']}")
+                        except Exception as e:
+                            st.error(f"❌ Error assigning volunteers: {str(e)}")
+        else:
+            st.info("No available volunteers match this event's skills.")
+        
+        with st.expander(f"👥 Assigned Volunteers ({event['Assigned']})", expanded=False):
+            assigned_rows = cached_query(EVENT_TABLES + ("Volunteer",), repository.event_volunteers, event_id)
+            if assigned_rows:
+                st.dataframe(pd.DataFrame(assigned_rows, columns=['VolunteerID', 'Name', 'Email']),
+                             use_container_width=True)
+            else:
+                st.info("Nobody assigned yet.")
+    else:
+        st.info("📅 No upcoming events. Create one above to start staffing it.")
+
+except Exception as e:
+    st.error(f"❌ Error loading events: {str(e)}")
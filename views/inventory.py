@@ -0,0 +1,93 @@
+# 📦 Inventory
+import streamlit as st
+import plotly.express as px
+from charts import top_categories
+from common import INVENTORY_LABELS, cached_query, query_cache
+from db_config import get_pool
+from inventory import InsufficientStock
+import repository
+from repository import DISBURSEMENT_TABLES, INVENTORY_TABLES
+
+ALERT_LABELS = {'low': '🔻 Low stock', 'restocked': '✅ Restocked'}
+
+st.markdown("## 📦 Inventory Management")
+
+try:
+    inventory = cached_query(["Inventory"], repository.list_inventory)
+    
+    if not inventory.empty:
+        df = inventory.rename(columns=INVENTORY_LABELS)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Items Types", int(len(df)))
+        with col2:
+            st.metric("Total Items in Stock", int(df['Quantity Available'].sum()))
+        
+        # Low stock alerts: flags are maintained on write, so this reads only the low items
+        low_stock = cached_query(["Inventory"], repository.low_stock_items)
+        with col3:
+            st.metric("Low Stock Items", int(len(low_stock)))
+        if not low_stock.empty:
+            st.warning(f"⚠️ Low Stock Alert! {len(low_stock)} items are below their reorder level")
+            st.dataframe(low_stock.drop(columns='ItemID').rename(columns=INVENTORY_LABELS),
+                         use_container_width=True)
+        
+        with st.expander("🔔 Stock Alert Feed", expanded=False):
+            alerts = cached_query(["StockAlert"], repository.stock_alerts, 50)
+            if not alerts.empty:
+                alert_df = alerts.drop(columns='AlertID').rename(columns=INVENTORY_LABELS)
+                alert_df['AlertType'] = alert_df['AlertType'].map(ALERT_LABELS)
+                st.dataframe(alert_df.rename(columns={'AlertType': 'Alert', 'CreatedAt': 'When'}),
+                             use_container_width=True)
+            else:
+                st.info("No stock alerts yet.")
+        
+        item_names = df['Item Name'].tolist()
+        col1, col2 = st.columns(2)
+        with col1:
+            with st.expander("📤 Record Disbursement", expanded=False):
+                with st.form("disbursement_form", clear_on_submit=True):
+                    disburse_item = st.selectbox("Item", item_names)
+                    disburse_quantity = st.number_input("Quantity", min_value=1, value=1)
+                    if st.form_submit_button("📤 Disburse"):
+                        try:
+                            with get_pool().connection() as conn:
+                                repository.disburse_item(conn, disburse_item, disburse_quantity)
+                            query_cache.invalidate(*DISBURSEMENT_TABLES)
+                            st.success(f"✅ {disburse_quantity} of {disburse_item} disbursed")
+                        except InsufficientStock as e:
+                            st.warning(f"⚠️ {e}")
+                        except Exception as e:
+                            st.error(f"❌ Error recording disbursement: {str(e)}")
+        with col2:
+            with st.expander("⚙️ Reorder Levels", expanded=False):
+                # Outside the form so picking an item reruns and shows that item's level
+                reorder_item = st.selectbox("Item", item_names, key="reorder_item")
+                current_level = int(df.loc[df['Item Name'] == reorder_item, 'Reorder Level'].iloc[0])
+                with st.form("reorder_form"):
+                    reorder_level = st.number_input("Alert when stock falls below", min_value=0,
+                                                    value=current_level, key=f"reorder_level_{reorder_item}")
+                    if st.form_submit_button("💾 Save Level"):
+                        try:
+                            with get_pool().connection() as conn:
+                                repository.update_reorder_level(conn, reorder_item, reorder_level)
+                            query_cache.invalidate(*INVENTORY_TABLES)
+                            st.success(f"✅ {reorder_item} will alert below {reorder_level}")
+                        except Exception as e:
+                            st.error(f"❌ Error saving reorder level: {str(e)}")
+        
+        st.markdown("### Current Inventory")
+        st.dataframe(df.drop(columns='ItemID'), use_container_width=True)
+        
+        # Inventory chart
+        fig = px.bar(top_categories(df, 'Item Name', 'Quantity Available'), x='Item Name',
+                    y='Quantity Available', title="Current Inventory Levels")
+        fig.update_layout(height=400)
+        st.plotly_chart(fig, use_container_width=True)
+        
+    else:
+        st.info("📦 No inventory items found. Items will appear here as donations are recorded.")
+        
+except Exception as e:
+    st.error(f"❌ Error loading inventory: {str(e)}")
@@ -0,0 +1,137 @@
+# 📈 View Donations
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+import plotly.express as px
+from charts import time_series, top_categories
+from common import cached_query, export_download, get_donation_stats
+import repository
+from repository import DONATION_PAGE_SIZE
+
+# Display labels for the compact frames the repository returns
+DONATION_LABELS = {'DonorName': 'Donor', 'ResourceType': 'Resource Type', 'DonationDate': 'Date'}
+
+def get_donation_aggregates(start_date, end_date, resource_type, donor_search, include_archive):
+    if not donor_search:
+        tables = ["DonationDaily", "DonationDailyDonor"]
+    else:
+        tables = ["Donation", "DonationArchive"] if include_archive else ["Donation"]
+    return cached_query(tables, repository.donation_aggregates, start_date, end_date, resource_type, donor_search,
+                        include_archive)
+
+st.markdown("## 📈 Donation History")
+
+try:
+    total_donations, _ = get_donation_stats()
+    
+    if total_donations:
+        resource_types = cached_query(["ResourceTotals"], repository.donated_resource_types)
+        
+        # Filters
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            resource_filter = st.selectbox("Filter by Resource Type", 
+                                         ["All"] + resource_types)
+        with col2:
+            donor_search = st.text_input("Search by Donor", placeholder="Type donor name...")
+        with col3:
+            date_range = st.date_input("Filter by Date Range", value=[], max_value=datetime.now().date())
+        
+        resource_type = None if resource_filter == "All" else resource_filter
+        start_date, end_date = date_range if len(date_range) == 2 else (None, None)
+        
+        # Years moved to DonationArchive are only read when asked for: by the
+        # checkbox, or by a date range that starts before them
+        archive_boundary = cached_query(["DonationArchive"], repository.archive_boundary)
+        include_archive = False
+        if archive_boundary is not None:
+            show_archive = st.checkbox(f"🗄️ Include archived history (before {archive_boundary:%d %b %Y})")
+            include_archive = show_archive or (start_date is not None and start_date < archive_boundary)
+            if not include_archive:
+                start_date = start_date or archive_boundary
+                st.caption(f"Showing donations since {archive_boundary:%d %b %Y}. "
+                           f"Pick an earlier date range or include archived history to see older years.")
+        donation_tables = ["Donation", "DonationArchive"] if include_archive else ["Donation"]
+        
+        with st.expander("⬇️ Export Donations", expanded=False):
+            export_download("donations", donation_tables, {"start_date": start_date, "end_date": end_date,
+                                                          "resource_type": resource_type, "donor_search": donor_search,
+                                                          "include_archive": include_archive})
+        
+        # Metrics and charts are answered from the DonationDaily rollup
+        (matching, total_quantity, unique_donors, resource_count), by_resource, by_date = \
+            get_donation_aggregates(start_date, end_date, resource_type, donor_search, include_archive)
+        
+        # Summary metrics
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Donations", matching)
+        with col2:
+            st.metric("Total Items", total_quantity)
+        with col3:
+            st.metric("Unique Donors", unique_donors)
+        with col4:
+            st.metric("Resource Types", resource_count)
+        
+        # Start again from the newest donations whenever the filters change
+        filter_signature = (resource_type, donor_search, start_date, end_date, include_archive)
+        if st.session_state.get("donation_filter_sig") != filter_signature:
+            st.session_state.donation_filter_sig = filter_signature
+            st.session_state.donation_page_keys = [None]
+        page_keys = st.session_state.donation_page_keys
+        
+        # Raw rows are only fetched for the visible page
+        donations, has_next = cached_query(donation_tables, repository.fetch_donation_page,
+                                           start_date, end_date, resource_type, donor_search, page_keys[-1],
+                                           include_archive)
+        first_row = (len(page_keys) - 1) * DONATION_PAGE_SIZE
+        if not donations.empty:
+            st.markdown(f"**Showing {first_row + 1}–{first_row + len(donations)} of {matching} "
+                        f"matching donations ({total_donations} total)**")
+            df = donations.drop(columns='DonationID').rename(columns=DONATION_LABELS)
+            st.dataframe(df, use_container_width=True)
+        else:
+            st.markdown(f"**No donations match these filters ({total_donations} total)**")
+        
+        nav1, nav2, nav3 = st.columns([1, 2, 1])
+        with nav1:
+            if st.button("⬅️ Newer", disabled=len(page_keys) == 1):
+                page_keys.pop()
+                st.rerun()
+        with nav2:
+            page_count = max(1, -(-matching // DONATION_PAGE_SIZE))
+            st.markdown(f"<div style='text-align: center;'>Page {len(page_keys)} of {page_count}</div>",
+                        unsafe_allow_html=True)
+        with nav3:
+            if st.button("Older ➡️", disabled=not has_next):
+                page_keys.append((donations['DonationDate'].iloc[-1].date(),
+                                  int(donations['DonationID'].iloc[-1])))
+                st.rerun()
+        
+        # Visualizations
+        if matching > 0:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                # Donations by resource type
+                resource_counts = top_categories(pd.DataFrame(by_resource, columns=['Resource Type', 'Quantity']),
+                                                 'Resource Type', 'Quantity')
+                fig1 = px.bar(resource_counts, x='Resource Type', y='Quantity',
+                             title="Donations by Resource Type")
+                fig1.update_layout(height=400)
+                st.plotly_chart(fig1, use_container_width=True)
+            
+            with col2:
+                # Donations over time
+                # Bucketed and thinned to a fixed number of points for the visible range
+                trend, bucket = time_series(by_date, start_date, end_date)
+                fig2 = px.line(trend, x='Date', y='Quantity',
+                              title="Donation Trends Over Time",
+                              labels={'Quantity': f"Quantity per {bucket}"})
+                fig2.update_layout(height=400)
+                st.plotly_chart(fig2, use_container_width=True)
+    else:
+        st.info("📦 No donations recorded yet. Start by logging some donations!")
+        
+except Exception as e:
+    st.error(f"❌ Error loading donations: {str(e)}")
@@ -0,0 +1,255 @@
+# 📊 View Volunteers: directory, skill finder and management actions
+import streamlit as st
+import pandas as pd
+from common import cached_query, cached_read, export_download, get_volunteer_stats, query_cache
+from db_config import get_pool
+import repository
+from repository import VOLUNTEER_DELETE_TABLES, VOLUNTEER_PAGE_SIZE, VOLUNTEER_TABLES
+from schema import primary_key, table_columns
+from skill_search import search_volunteers
+
+# Display labels for the compact frames the repository returns
+AVAILABILITY_LABELS = {1: '✅ Yes', 0: '❌ No'}
+
+def volunteer_picker(key, primary_key_col, label):
+    """Searchable, paged volunteer lookup; returns the chosen row or None.
+
+    Only called inside a fragment, so searching and paging rerun just that fragment.
+    """
+    search = st.text_input("Find volunteer", placeholder="Name or email...", key=f"{key}_search")
+    pages_key, choice_key = f"{key}_pages", f"{key}_choice"
+    if st.session_state.get(f"{key}_search_sig") != search:
+        st.session_state[f"{key}_search_sig"] = search
+        st.session_state[pages_key] = [None]
+        st.session_state.pop(choice_key, None)
+    pages = st.session_state[pages_key]
+    matches, has_next = cached_query(["Volunteer"], repository.volunteer_lookup, primary_key_col, search, pages[-1])
+    
+    # Labels are built column-wise rather than row by row
+    labels = (matches['Name'].astype(str) + " (" + matches['Email'].fillna('').astype(str) + ") · "
+              + matches['Availability'].map(AVAILABILITY_LABELS).astype(str)).tolist()
+    choice = st.selectbox(label, range(len(labels)), format_func=labels.__getitem__, index=None,
+                          placeholder="Select a volunteer...", key=choice_key)
+    
+    # Page changes are applied in callbacks, before the fragment reruns
+    def turn_page(after):
+        if after is None:
+            pages.pop()
+        else:
+            pages.append(after)
+        st.session_state.pop(choice_key, None)
+    
+    nav1, nav2, nav3 = st.columns([1, 2, 1])
+    with nav1:
+        st.button("⬅️", key=f"{key}_previous", disabled=len(pages) == 1, on_click=turn_page, args=(None,))
+    with nav2:
+        st.caption(f"Page {len(pages)}" + (f" · first {len(labels)} matches" if has_next else ""))
+    with nav3:
+        next_key = (matches['Name'].iloc[-1], int(matches[primary_key_col].iloc[-1])) if has_next else None
+        st.button("➡️", key=f"{key}_next", disabled=not has_next, on_click=turn_page, args=(next_key,))
+    return None if choice is None else matches.iloc[choice]
+
+@st.fragment
+def delete_volunteer_section(primary_key_col):
+    st.warning("⚠️ **Warning:** Deleting a volunteer will permanently remove all their information from the database.")
+    selected = volunteer_picker("delete_volunteer", primary_key_col, "Select volunteer to delete:")
+    if selected is None:
+        return
+    selected_id, selected_name = int(selected[primary_key_col]), selected['Name']
+    st.info(f"📋 Selected volunteer: **{selected_name}**")
+    
+    # Confirmation checkbox
+    if st.checkbox(f"I confirm that I want to delete {selected_name}"):
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("🗑️ Delete Volunteer", type="primary"):
+                try:
+                    with get_pool().connection() as conn:
+                        repository.delete_volunteer(conn, primary_key_col, selected_id)
+                    query_cache.invalidate(*VOLUNTEER_DELETE_TABLES)
+                    st.session_state.volunteer_notice = f"✅ {selected_name} has been successfully deleted!"
+                    st.session_state.pop("delete_volunteer_choice", None)
+                    st.rerun()  # The directory outside this fragment has to drop the row
+                except Exception as e:
+                    st.error(f"❌ Error deleting volunteer: {str(e)}")
+        with col2:
+            st.button("❌ Cancel", on_click=st.session_state.pop, args=("delete_volunteer_choice", None))
+
+@st.fragment
+def availability_section(primary_key_col):
+    st.info("💡 Quickly update volunteer availability status")
+    selected = volunteer_picker("update_volunteer", primary_key_col, "Select volunteer to update:")
+    if selected is None:
+        return
+    selected_id, selected_name = int(selected[primary_key_col]), selected['Name']
+    new_status = st.radio(
+        f"Update availability for {selected_name}:",
+        ["✅ Available", "❌ Not Available"],
+        index=0 if selected['Availability'] == 1 else 1
+    )
+    
+    if st.button("💾 Update Availability"):
+        available = new_status == "✅ Available"
+        try:
+            with get_pool().connection() as conn:
+                was_available = repository.set_volunteer_availability(conn, primary_key_col, selected_id, available)
+            # Rewrite the one row in the cached pages rather than reloading them;
+            # pages filtered on availability still reload (see availability_patch)
+            if was_available is None:
+                query_cache.invalidate(*VOLUNTEER_TABLES)
+            else:
+                query_cache.patch(VOLUNTEER_TABLES, repository.availability_patch(
+                    primary_key_col, selected_id, available, was_available))
+        except Exception as e:
+            st.error(f"❌ Error updating volunteer: {str(e)}")
+            return
+        if was_available is not None and was_available == int(available):
+            # Nothing outside this section changed, so the fragment rerun the
+            # click started is enough
+            st.info(f"ℹ️ {selected_name} is already marked {new_status}")
+            return
+        st.session_state.volunteer_notice = f"✅ {selected_name}'s availability updated to {new_status}"
+        # The directory and the counts above change too. Unless a filter is on
+        # availability, this rerun is answered from the patched cache
+        st.rerun()
+
+st.markdown("## 👥 Volunteer Directory")
+
+notice = st.session_state.pop("volunteer_notice", None)
+if notice:
+    st.success(notice)
+
+try:
+    # Column layout comes from the process-wide schema cache (no DESCRIBE per rerun)
+    column_names = table_columns("Volunteer")
+    primary_key_col = primary_key("Volunteer")
+    
+    total_volunteers, available_volunteers = get_volunteer_stats()
+    
+    if total_volunteers:
+        has_availability = 'Availability' in column_names
+        
+        # Filter options
+        col1, col2 = st.columns(2)
+        with col1:
+            if has_availability:
+                availability_filter = st.selectbox("Filter by Availability", 
+                                                 ["All", "Available Only", "Unavailable Only"])
+            else:
+                availability_filter = "All"
+        with col2:
+            search_term = st.text_input("Search by name or skills", placeholder="Type to search...")
+        
+        with st.expander("⬇️ Export Volunteers", expanded=False):
+            export_download("volunteers", ["Volunteer"], {"availability_filter": availability_filter,
+                                                         "search_term": search_term})
+        
+        # Start again from the first page whenever the filters change
+        filter_signature = (availability_filter, search_term)
+        if st.session_state.get("volunteer_filter_sig") != filter_signature:
+            st.session_state.volunteer_filter_sig = filter_signature
+            st.session_state.volunteer_page_keys = [None]
+        page_keys = st.session_state.volunteer_page_keys
+        
+        # Filtering, ordering and paging all happen in the database
+        volunteers, has_next = cached_query(
+            ["Volunteer"], repository.fetch_volunteer_page,
+            primary_key_col, availability_filter, search_term, page_keys[-1]
+        )
+        matching_volunteers = cached_query(["Volunteer"], repository.count_volunteers,
+                                           availability_filter, search_term)
+        
+        # The page frame is shared through the query cache, so derive columns with assign()
+        # Handle availability column mapping if it exists
+        if has_availability:
+            df = volunteers.assign(Available=volunteers['Availability'].map(AVAILABILITY_LABELS).astype('category'))
+            display_columns = [col for col in df.columns if col not in [primary_key_col, 'Availability']]
+        else:
+            df = volunteers
+            display_columns = [col for col in df.columns if col != primary_key_col]
+        
+        # tolist() gives plain Python ints, so MySQL never sees numpy scalars
+        volunteer_ids = df[primary_key_col].tolist()
+        volunteer_names = df['Name'].tolist() if 'Name' in df.columns else [f"Volunteer {id}" for id in volunteer_ids]
+        
+        first_row = (len(page_keys) - 1) * VOLUNTEER_PAGE_SIZE
+        if not df.empty:
+            st.markdown(f"**Showing {first_row + 1}–{first_row + len(df)} of {matching_volunteers} "
+                        f"matching volunteers ({total_volunteers} total)**")
+        else:
+            st.markdown(f"**No volunteers match these filters ({total_volunteers} total)**")
+        
+        # Ranked skill search backed by the VolunteerSkill token index
+        with st.expander("🎯 Skill Finder", expanded=False):
+            skill_query = st.text_input("Required skills",
+                                        placeholder="e.g. Teaching AND Medical OR First Aid",
+                                        key="skill_query")
+            skill_available_only = st.checkbox("Available volunteers only", key="skill_available_only")
+            if skill_query:
+                skill_matches = cached_read(
+                    ("skill_search", skill_query, skill_available_only),
+                    ["Volunteer", "VolunteerSkill"],
+                    lambda cursor: search_volunteers(cursor, skill_query,
+                                                     available_only=skill_available_only)
+                )
+                if skill_matches:
+                    skill_df = pd.DataFrame(skill_matches, columns=['ID', 'Name', 'Email', 'Skills',
+                                                                    'Availability', 'Matched Skills'])
+                    skill_df['Available'] = skill_df['Availability'].map(AVAILABILITY_LABELS)
+                    st.dataframe(skill_df[['Name', 'Email', 'Skills', 'Available', 'Matched Skills']],
+                                 use_container_width=True)
+                else:
+                    st.info("No volunteers have those skills.")
+        
+        # Volunteer management actions
+        st.markdown("### 🔧 Volunteer Management")
+        
+        # Each action is a fragment: picking, searching and confirming rerun only that section
+        with st.expander("🗑️ Delete Volunteer", expanded=False):
+            delete_volunteer_section(primary_key_col)
+        
+        # Update volunteer availability section (only if Availability column exists)
+        if has_availability:
+            with st.expander("✏️ Update Volunteer Availability", expanded=False):
+                availability_section(primary_key_col)
+        
+        # Display volunteers table
+        st.markdown("### 📋 Volunteer List")
+        display_df = df[display_columns] if display_columns else df
+        st.dataframe(display_df, use_container_width=True)
+        
+        # Keyset pagination: each page seeks past the last (Name, id) shown
+        nav1, nav2, nav3 = st.columns([1, 2, 1])
+        with nav1:
+            if st.button("⬅️ Previous", disabled=len(page_keys) == 1):
+                page_keys.pop()
+                st.rerun()
+        with nav2:
+            page_count = max(1, -(-matching_volunteers // VOLUNTEER_PAGE_SIZE))
+            st.markdown(f"<div style='text-align: center;'>Page {len(page_keys)} of {page_count}</div>",
+                        unsafe_allow_html=True)
+        with nav3:
+            if st.button("Next ➡️", disabled=not has_next):
+                page_keys.append((volunteer_names[-1], volunteer_ids[-1]))
+                st.rerun()
+        
+        # Volunteer statistics
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if has_availability:
+                st.metric("Available Volunteers", available_volunteers)
+            else:
+                st.metric("Total Volunteers", total_volunteers)
+        with col2:
+            if has_availability:
+                st.metric("Unavailable Volunteers", total_volunteers - available_volunteers)
+            else:
+                st.metric("Matching Records", matching_volunteers)
+        with col3:
+            st.metric("Total Volunteers", total_volunteers)
+        
+    else:
+        st.info("📝 No volunteers registered yet. Start by adding some volunteers!")
+        
+except Exception as e:
+    st.error(f"❌ Error loading volunteers: {str(e)}")